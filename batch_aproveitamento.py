@@ -0,0 +1,330 @@
+import argparse
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from db_manager import DB_PATH, get_pool
+from logic.dxf_reader import DIRETORIO_CACHE, areas_peca, geometria_dxf
+from utils.calculations import calcular_area_retangulo, calcular_multiplo_ideal, calcular_sucata
+from utils.logger import setup_logger
+from utils.packing import empacotar_misto
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+# Nome padrão do checkpoint na tabela aproveitamento_checkpoint
+CHECKPOINT_PADRAO = "aproveitamento"
+
+SELECT_PECAS = (
+    "SELECT cod_peca, comprimento, largura, comp_chapa, larg_chapa FROM pecas "
+    "WHERE cod_peca > ? ORDER BY cod_peca"
+)
+INSERT_APROVEITAMENTO = (
+    "INSERT INTO aproveitamento (cod_peca, multiplo_ideal, sobra, sucata, area_aproveitamento, area_peca_bruta, area_chapa) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Uma linha por código: cada gravação substitui os resultados anteriores da peça
+DELETE_APROVEITAMENTO = "DELETE FROM aproveitamento WHERE cod_peca = ?"
+CREATE_INDICE_APROVEITAMENTO = "CREATE INDEX IF NOT EXISTS idx_aproveitamento_cod_peca ON aproveitamento (cod_peca)"
+# O progresso é gravado na mesma transação dos resultados do lote
+CREATE_CHECKPOINT = (
+    "CREATE TABLE IF NOT EXISTS aproveitamento_checkpoint ("
+    "nome TEXT PRIMARY KEY, ultimo_cod_peca TEXT NOT NULL, gravados INTEGER NOT NULL)"
+)
+SELECT_CHECKPOINT = "SELECT ultimo_cod_peca, gravados FROM aproveitamento_checkpoint WHERE nome = ?"
+UPSERT_CHECKPOINT = "INSERT OR REPLACE INTO aproveitamento_checkpoint (nome, ultimo_cod_peca, gravados) VALUES (?, ?, ?)"
+DELETE_CHECKPOINT = "DELETE FROM aproveitamento_checkpoint WHERE nome = ?"
+
+SELECT_PECA = "SELECT cod_peca, comprimento, largura, comp_chapa, larg_chapa FROM pecas WHERE cod_peca = ?"
+SELECT_DXF = "SELECT cod_peca, caminho_dxf FROM pecas WHERE caminho_dxf IS NOT NULL AND caminho_dxf != ''"
+UPDATE_AREAS = "UPDATE pecas SET area_peca_liquida = ?, area_peca_bruta = ? WHERE cod_peca = ?"
+
+
+def medida(valor):
+    """
+    Converte uma medida do banco em float, aceitando a vírgula decimal dos textos importados ("596,41").
+    :param valor: Número ou texto.
+    :return: Valor em float.
+    :raises TypeError, ValueError: Se o valor não for uma medida.
+    """
+    if isinstance(valor, str):
+        valor = valor.strip().replace(",", ".")
+    return float(valor)
+
+
+def calcular_aproveitamento(peca):
+    """
+    Calcula o aproveitamento de uma peça na sua própria chapa.
+    :param peca: Tupla (cod_peca, comprimento, largura, comp_chapa, larg_chapa) em milímetros.
+    :return: Tupla na ordem de INSERT_APROVEITAMENTO, ou None se as medidas forem inválidas.
+    """
+    cod_peca, comprimento, largura, comp_chapa, larg_chapa = peca
+    try:
+        medidas = [medida(valor) for valor in (comprimento, largura, comp_chapa, larg_chapa)]
+    except (TypeError, ValueError):
+        return None
+    comprimento, largura, comp_chapa, larg_chapa = medidas
+    if min(medidas) <= 0:
+        return None
+    area_chapa = calcular_area_retangulo(comp_chapa, larg_chapa)
+    area_peca = calcular_area_retangulo(comprimento, largura)
+    multiplo_ideal = calcular_multiplo_ideal(area_chapa, comp_chapa, larg_chapa, comprimento, largura)
+    area_aproveitamento = multiplo_ideal * area_peca
+    sobra = calcular_sucata(area_chapa, area_aproveitamento)
+    sucata = sobra / area_chapa * 100  # Percentual da chapa que vira sucata
+    return (cod_peca, multiplo_ideal, sobra, sucata, area_aproveitamento, area_peca, area_chapa)
+
+
+def calcular_lote(pecas):
+    """
+    Calcula o aproveitamento de um lote de peças em um processo de trabalho.
+    :param pecas: Lista de tuplas (cod_peca, comprimento, largura, comp_chapa, larg_chapa).
+    :return: Tupla (resultados válidos, códigos ignorados por medidas inválidas).
+    """
+    resultados = []
+    ignoradas = []
+    for peca in pecas:
+        resultado = calcular_aproveitamento(peca)
+        if resultado is None:
+            ignoradas.append(peca[0])
+        else:
+            resultados.append(resultado)
+    return resultados, ignoradas
+
+
+def preparar_tabelas(pool):
+    """
+    Cria a tabela de checkpoint e o índice por código da tabela aproveitamento, se não existirem.
+    :param pool: Pool de conexões do banco.
+    """
+    with pool.transaction("batch_preparar") as conexao:
+        conexao.execute(CREATE_CHECKPOINT)
+        conexao.execute(CREATE_INDICE_APROVEITAMENTO)
+
+
+def ler_checkpoint(pool, nome):
+    """
+    Lê o último código processado de uma execução anterior, da tabela aproveitamento_checkpoint.
+    :param pool: Pool de conexões do banco.
+    :param nome: Nome do checkpoint.
+    :return: Dicionário do checkpoint (vazio se não existir).
+    """
+    linha = pool.fetchone(SELECT_CHECKPOINT, (nome,), label="batch_ler_checkpoint")
+    if linha is None:
+        return {}
+    return {"ultimo_cod_peca": linha[0], "gravados": linha[1]}
+
+
+def substituir_resultados(conexao, codigos, resultados):
+    """
+    Remove os resultados anteriores dos códigos e grava os novos; deve rodar dentro de uma transação.
+    :param conexao: Conexão sqlite3 com a transação aberta.
+    :param codigos: Códigos cujos resultados anteriores são descartados (inclusive os sem resultado novo).
+    :param resultados: Tuplas na ordem de INSERT_APROVEITAMENTO.
+    """
+    conexao.executemany(DELETE_APROVEITAMENTO, [(cod_peca,) for cod_peca in codigos])
+    conexao.executemany(INSERT_APROVEITAMENTO, resultados)
+
+
+def ler_lotes(pool, ultimo_codigo, tamanho_lote):
+    """
+    Lê as peças do banco em lotes, em ordem de código, a partir do último código processado.
+    :param pool: Pool de conexões do banco.
+    :param ultimo_codigo: Código a partir do qual continuar ("" para o início).
+    :param tamanho_lote: Número de peças por lote.
+    :return: Gerador de listas de peças.
+    """
+    cursor = pool.execute(SELECT_PECAS, (ultimo_codigo,), label="batch_ler_pecas")
+    try:
+        while True:
+            lote = cursor.fetchmany(tamanho_lote)
+            if not lote:
+                break
+            yield lote
+    finally:
+        cursor.close()
+
+
+def _gravar_lote(pool, checkpoint, lote, resultado, gravados, processadas, total, inicio):
+    """
+    Grava os resultados de um lote e avança o checkpoint em uma única transação, para que uma queda
+    não deixe o lote gravado sem o checkpoint (nem o contrário), e registra o progresso.
+    :return: Tupla (gravados, processadas) atualizada.
+    """
+    resultados, ignoradas = resultado
+    gravados += len(resultados)
+    with pool.transaction("batch_gravar_aproveitamento") as conexao:
+        substituir_resultados(conexao, [peca[0] for peca in lote], resultados)
+        conexao.execute(UPSERT_CHECKPOINT, (checkpoint, lote[-1][0], gravados))
+    processadas += len(lote)
+    if ignoradas:
+        logger.warning("%d peças ignoradas por medidas inválidas: %s", len(ignoradas), ", ".join(map(str, ignoradas[:10])))
+    decorrido = time.perf_counter() - inicio
+    logger.info("Progresso: %d/%d peças (%.0f peças/s)", processadas, total, processadas / max(decorrido, 1e-9))
+    return gravados, processadas
+
+
+def executar(db_path=DB_PATH, workers=None, tamanho_lote=500, checkpoint=CHECKPOINT_PADRAO, retomar=False):
+    """
+    Calcula o aproveitamento de todas as peças e grava os resultados na tabela aproveitamento,
+    substituindo os de execuções anteriores (uma linha por código).
+    :param db_path: Caminho para o arquivo do banco de dados SQLite.
+    :param workers: Número de processos de cálculo (padrão: número de CPUs).
+    :param tamanho_lote: Número de peças enviadas a cada processo por vez.
+    :param checkpoint: Nome do checkpoint, registrado no banco junto com cada lote gravado.
+    :param retomar: Se True, continua a partir do checkpoint de uma execução interrompida.
+    :return: Número de resultados gravados.
+    """
+    pool = get_pool(db_path)
+    preparar_tabelas(pool)
+    estado = ler_checkpoint(pool, checkpoint) if retomar else {}
+    ultimo_codigo = estado.get("ultimo_cod_peca", "")
+    gravados = estado.get("gravados", 0)
+    total = pool.fetchone("SELECT COUNT(*) FROM pecas WHERE cod_peca > ?", (ultimo_codigo,), label="batch_contar")[0]
+    if ultimo_codigo:
+        logger.info("Retomando após a peça %s: %d peças restantes.", ultimo_codigo, total)
+    else:
+        logger.info("Calculando aproveitamento de %d peças.", total)
+    inicio = time.perf_counter()
+    processadas = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Janela limitada de lotes em andamento, consumida em ordem para o checkpoint avançar por código
+        janela = (workers or os.cpu_count() or 1) * 2
+        pendentes = deque()
+        lotes = ler_lotes(pool, ultimo_codigo, tamanho_lote)
+        for lote in lotes:
+            pendentes.append((lote, executor.submit(calcular_lote, lote)))
+            if len(pendentes) < janela:
+                continue
+            lote, futuro = pendentes.popleft()
+            gravados, processadas = _gravar_lote(pool, checkpoint, lote, futuro.result(), gravados, processadas, total, inicio)
+        while pendentes:
+            lote, futuro = pendentes.popleft()
+            gravados, processadas = _gravar_lote(pool, checkpoint, lote, futuro.result(), gravados, processadas, total, inicio)
+    # Execução completa: a próxima começa do início
+    with pool.transaction("batch_limpar_checkpoint") as conexao:
+        conexao.execute(DELETE_CHECKPOINT, (checkpoint,))
+    logger.info("Aproveitamento concluído: %d resultados gravados em %.1f s.", gravados, time.perf_counter() - inicio)
+    return gravados
+
+
+def aninhar_misto(pedidos, db_path=DB_PATH, comp_chapa=None, larg_chapa=None, kerf=0.0, rotacao=True):
+    """
+    Encaixa peças de vários códigos em uma mesma chapa e grava o resultado na tabela aproveitamento,
+    uma linha por código (substituindo a anterior), com o múltiplo posicionado e a sobra e a sucata da chapa inteira.
+    :param pedidos: Lista de tuplas (cod_peca, quantidade).
+    :param db_path: Caminho para o arquivo do banco de dados SQLite.
+    :param comp_chapa: Comprimento da chapa em milímetros (padrão: o da primeira peça).
+    :param larg_chapa: Largura da chapa em milímetros (padrão: a da primeira peça).
+    :param kerf: Largura do corte entre peças em milímetros.
+    :param rotacao: Se True, permite girar as peças em 90°.
+    :return: Tupla (posicionamentos [(cod_peca, x, y, comprimento, largura), ...], {cod_peca: quantidade não posicionada}).
+    :raises ValueError: Se uma peça não existir, tiver medidas inválidas ou a chapa não for definida.
+    """
+    pool = get_pool(db_path)
+    pecas = []
+    for cod_peca, quantidade in pedidos:
+        linha = pool.fetchone(SELECT_PECA, (cod_peca,), label="misto_ler_peca")
+        if linha is None:
+            raise ValueError(f"Peça {cod_peca} não encontrada.")
+        _, comprimento, largura, comp_peca_chapa, larg_peca_chapa = linha
+        if comp_chapa is None and larg_chapa is None:
+            comp_chapa, larg_chapa = comp_peca_chapa, larg_peca_chapa
+        try:
+            comprimento, largura = medida(comprimento), medida(largura)
+        except (TypeError, ValueError):
+            raise ValueError(f"Medidas inválidas para a peça {cod_peca}.")
+        pecas.append((cod_peca, comprimento, largura, int(quantidade)))
+    try:
+        comp_chapa, larg_chapa = medida(comp_chapa), medida(larg_chapa)
+    except (TypeError, ValueError):
+        raise ValueError("Dimensões da chapa não definidas.")
+
+    inicio = time.perf_counter()
+    posicionamentos, nao_posicionadas = empacotar_misto(comp_chapa, larg_chapa, pecas, kerf, rotacao)
+    area_chapa = calcular_area_retangulo(comp_chapa, larg_chapa)
+    contagem = {}
+    for cod_peca, *_ in posicionamentos:
+        contagem[cod_peca] = contagem.get(cod_peca, 0) + 1
+    area_pecas = {cod_peca: calcular_area_retangulo(comprimento, largura) for cod_peca, comprimento, largura, _ in pecas}
+    area_aproveitamento = sum(contagem.get(cod_peca, 0) * area for cod_peca, area in area_pecas.items())
+    sobra = calcular_sucata(area_chapa, area_aproveitamento)
+    sucata = sobra / area_chapa * 100
+    resultados = [
+        (cod_peca, contagem.get(cod_peca, 0), sobra, sucata, contagem.get(cod_peca, 0) * area_pecas[cod_peca], area_pecas[cod_peca], area_chapa)
+        for cod_peca in dict.fromkeys(cod for cod, *_ in pecas)
+    ]
+    preparar_tabelas(pool)
+    with pool.transaction("misto_gravar_aproveitamento") as conexao:
+        substituir_resultados(conexao, [resultado[0] for resultado in resultados], resultados)
+    logger.info(
+        "Encaixe misto: %d peças de %d códigos em %.0f x %.0f mm (%.1f%% aproveitado) em %.3f s.",
+        len(posicionamentos), len(resultados), comp_chapa, larg_chapa, 100 - sucata, time.perf_counter() - inicio,
+    )
+    if nao_posicionadas:
+        logger.warning("Peças que não couberam na chapa: %s", nao_posicionadas)
+    return posicionamentos, nao_posicionadas
+
+
+def atualizar_areas_dxf(db_path=DB_PATH, diretorio_cache=DIRETORIO_CACHE):
+    """
+    Recalcula area_peca_liquida e area_peca_bruta (mm², como no restante da tabela) das peças com caminho_dxf a partir dos
+    contornos reais do desenho. Arquivos que não mudaram são lidos do cache de geometria.
+    :param db_path: Caminho para o arquivo do banco de dados SQLite.
+    :param diretorio_cache: Diretório do cache de geometria (None desativa o cache).
+    :return: Número de peças atualizadas.
+    """
+    pool = get_pool(db_path)
+    inicio = time.perf_counter()
+    atualizacoes = []
+    for cod_peca, caminho in pool.fetchall(SELECT_DXF, label="dxf_ler_caminhos"):
+        try:
+            liquida, bruta = areas_peca(geometria_dxf(caminho, diretorio=diretorio_cache))
+        except (OSError, ValueError) as e:
+            logger.warning("DXF da peça %s ignorado (%s): %s", cod_peca, caminho, e)
+            continue
+        atualizacoes.append((liquida, bruta, cod_peca))
+    pool.executemany(UPDATE_AREAS, atualizacoes, label="dxf_gravar_areas")
+    logger.info("Áreas de %d peças atualizadas a partir do DXF em %.2f s.", len(atualizacoes), time.perf_counter() - inicio)
+    return len(atualizacoes)
+
+
+def _pedido(texto):
+    """Converte um argumento "COD:QTD" em tupla (cod_peca, quantidade)."""
+    cod_peca, _, quantidade = texto.rpartition(":")
+    if not cod_peca:
+        raise argparse.ArgumentTypeError(f"Pedido inválido: {texto} (use COD:QTD).")
+    try:
+        return cod_peca, int(quantidade)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Quantidade inválida em {texto}.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcula o aproveitamento de todas as peças do catálogo.")
+    parser.add_argument("--db", default=DB_PATH, help="Arquivo do banco de dados SQLite.")
+    parser.add_argument("--workers", type=int, default=None, help="Número de processos de cálculo.")
+    parser.add_argument("--lote", type=int, default=500, help="Número de peças por lote.")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PADRAO, help="Nome do checkpoint (gravado no banco).")
+    parser.add_argument("--retomar", action="store_true", help="Continua a partir do checkpoint de uma execução interrompida.")
+    parser.add_argument("--misto", nargs="+", type=_pedido, metavar="COD:QTD",
+                        help="Encaixa as peças informadas em uma mesma chapa, em vez de calcular o catálogo inteiro.")
+    parser.add_argument("--comp-chapa", type=float, default=None, help="Comprimento da chapa do encaixe misto (mm).")
+    parser.add_argument("--larg-chapa", type=float, default=None, help="Largura da chapa do encaixe misto (mm).")
+    parser.add_argument("--kerf", type=float, default=0.0, help="Largura do corte entre peças no encaixe misto (mm).")
+    parser.add_argument("--areas-dxf", action="store_true",
+                        help="Recalcula as áreas líquida e bruta das peças a partir do caminho_dxf.")
+    args = parser.parse_args(argv)
+    setup_logger()
+    if args.areas_dxf:
+        atualizar_areas_dxf(args.db)
+    elif args.misto:
+        aninhar_misto(args.misto, args.db, args.comp_chapa, args.larg_chapa, args.kerf)
+    else:
+        executar(args.db, args.workers, args.lote, args.checkpoint, args.retomar)
+
+
+if __name__ == "__main__":
+    main()
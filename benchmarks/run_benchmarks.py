@@ -0,0 +1,309 @@
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Permite rodar sem display (python -m benchmarks.run_benchmarks)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+# Uma mediana acima de (1 + LIMITE_REGRESSAO) x a referência conta como regressão
+LIMITE_REGRESSAO = 0.2
+
+# Tamanhos usados em cada grupo: completo e rápido (--rapido, para verificar a suíte)
+TAMANHOS = {
+    "canvas": ([1_000, 10_000, 100_000], [100, 1_000]),
+    "poligono": ([10_000, 100_000, 1_000_000], [1_000, 10_000]),
+    "catalogo": ([100_000], [2_000]),
+}
+
+
+def medir(funcao, repeticoes=5, aquecimento=1, preparar=None):
+    """
+    Mede o tempo de execução de uma função.
+    :param funcao: Função sem argumentos a medir.
+    :param repeticoes: Número de execuções medidas.
+    :param aquecimento: Execuções iniciais descartadas.
+    :param preparar: Função chamada antes de cada execução, fora da medição (ex.: limpar caches).
+    :return: Dicionário com mediana, mínimo e máximo em segundos e o número de repetições.
+    """
+    tempos = []
+    for i in range(aquecimento + repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        decorrido = time.perf_counter() - inicio
+        if i >= aquecimento:
+            tempos.append(decorrido)
+    return {
+        "mediana": statistics.median(tempos),
+        "minimo": min(tempos),
+        "maximo": max(tempos),
+        "repeticoes": repeticoes,
+    }
+
+
+def bench_canvas(tamanhos, repeticoes):
+    """Canvas.distribute_circles: cálculo dos centros, criação do item na cena e primeira pintura."""
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QImage, QPainter
+    from ui.canvas import Canvas
+    from rendering.renderer import Renderer
+    from logic.object_manager import ObjectManager
+
+    app = QApplication.instance() or QApplication([])
+    resultados = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        manager = ObjectManager(os.path.join(diretorio, "objects.json"), write_behind=False)
+        canvas = Canvas(Renderer(manager))
+        canvas.resize(800, 600)
+        canvas.draw_rectangle((0, 0), 1000, 1000)
+        imagem = QImage(800, 600, QImage.Format_ARGB32_Premultiplied)
+        for n in tamanhos:
+            raio = 1000 / (2 * math.sqrt(n))  # Grade quadrada com ~n peças na chapa de 1000 x 1000
+            resultados[f"canvas.distribute_circles[{n}]"] = medir(
+                lambda: canvas.distribute_circles(raio, "grade"), repeticoes
+            )
+
+            def pintar():
+                imagem.fill(0)
+                painter = QPainter(imagem)
+                canvas.scene.render(painter)
+                painter.end()
+
+            canvas.distribute_circles(raio, "grade")
+            resultados[f"canvas.render[{n}]"] = medir(pintar, repeticoes)
+        canvas.clear_scene()
+        app.processEvents()
+    return resultados
+
+
+def bench_multiplo_ideal(repeticoes):
+    """As variantes de calcular_multiplo_ideal, sem o cache LRU dos empacotadores."""
+    from utils.calculations import calcular_area_retangulo, calcular_multiplo_ideal
+    from utils.packing import empacotar_circulos, resolver_guilhotina
+
+    def limpar():
+        resolver_guilhotina.cache_clear()
+        empacotar_circulos.cache_clear()
+
+    casos = {
+        "retangular": (3000, 1500, 37, 23, "retangular"),
+        "circular": (3000, 1500, 20, 20, "circular"),
+        "hexagonal": (3000, 1500, 20, 20, "hexagonal"),
+    }
+    resultados = {}
+    for nome, (largura, altura, peca_l, peca_a, formato) in casos.items():
+        area = calcular_area_retangulo(largura, altura)
+        resultados[f"calcular_multiplo_ideal[{nome}]"] = medir(
+            lambda: calcular_multiplo_ideal(area, largura, altura, peca_l, peca_a, formato), repeticoes, preparar=limpar
+        )
+    return resultados
+
+
+def _poligono_estrela(n, raio=500.0, seed=0):
+    """Polígono simples com n vértices em ângulos crescentes e raio variável (estrela irregular)."""
+    gerador = np.random.default_rng(seed)
+    angulos = np.linspace(0, 2 * math.pi, n, endpoint=False)
+    raios = raio * (0.6 + 0.4 * gerador.random(n))
+    return np.column_stack((raio + raios * np.cos(angulos), raio + raios * np.sin(angulos)))
+
+
+def bench_poligono(tamanhos, repeticoes):
+    """Área, validação (is_simple) e área da sobra recortada pela chapa em polígonos grandes."""
+    from logic.geometry import is_simple, polygon_area, sobra_area
+
+    resultados = {}
+    for n in tamanhos:
+        poligono = _poligono_estrela(n)
+        resultados[f"polygon_area[{n}]"] = medir(lambda: polygon_area(poligono), repeticoes)
+        if n <= 100_000:  # A varredura em Python puro domina acima disso
+            resultados[f"is_simple[{n}]"] = medir(lambda: is_simple(poligono), max(1, repeticoes // 2))
+            resultados[f"sobra_area[{n}]"] = medir(lambda: sobra_area(poligono, 800, 800), max(1, repeticoes // 2))
+    return resultados
+
+
+def gerar_banco(caminho, n, seed=0):
+    """
+    Gera um banco com a tabela pecas e n códigos no formato "51.20.05.101".
+    :return: Lista com os códigos gerados.
+    """
+    gerador = random.Random(seed)
+    codigos = [f"{gerador.randint(10, 99)}.{gerador.randint(10, 99)}.{gerador.randint(0, 99):02d}.{i:06d}" for i in range(n)]
+    conexao = sqlite3.connect(caminho)
+    try:
+        conexao.execute(
+            "CREATE TABLE pecas (cod_peca TEXT PRIMARY KEY, comprimento REAL, largura REAL, comp_chapa REAL, larg_chapa REAL)"
+        )
+        conexao.executemany(
+            "INSERT INTO pecas VALUES (?, ?, ?, 3000, 1500)",
+            ((codigo, gerador.uniform(10, 500), gerador.uniform(10, 500)) for codigo in codigos),
+        )
+        conexao.commit()
+    finally:
+        conexao.close()
+    return codigos
+
+
+def bench_catalogo(tamanhos, repeticoes):
+    """Carga do catálogo e buscas exata, por prefixo e aproximada contra um banco gerado."""
+    from catalog_cache import PartCatalog
+    from db_manager import get_pool
+
+    resultados = {}
+    gerador = random.Random(1)
+    for n in tamanhos:
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "pecas_bench.db")
+            codigos = gerar_banco(caminho, n)
+            catalogo = PartCatalog(caminho)
+            amostra = gerador.sample(codigos, min(1000, n))
+            prefixos = [codigo[:5] for codigo in amostra[:200]]
+            try:
+                resultados[f"catalogo.load[{n}]"] = medir(catalogo.load, max(1, repeticoes // 2))
+                resultados[f"catalogo.get_x1000[{n}]"] = medir(lambda: [catalogo.get(c) for c in amostra], repeticoes)
+                resultados[f"catalogo.prefix_search_x200[{n}]"] = medir(
+                    lambda: [catalogo.prefix_search(p) for p in prefixos], repeticoes
+                )
+                resultados[f"catalogo.fuzzy_search[{n}]"] = medir(
+                    lambda: catalogo.fuzzy_search("zz" + amostra[0][3:]), 1, aquecimento=0
+                )
+                pool = get_pool(caminho)
+                resultados[f"sqlite.fetchone_x1000[{n}]"] = medir(
+                    lambda: [pool.fetchone("SELECT cod_peca, comprimento, largura FROM pecas WHERE cod_peca = ?", (c,),
+                                           label="bench") for c in amostra],
+                    repeticoes,
+                )
+            finally:
+                get_pool(caminho).close_all()
+    return resultados
+
+
+GRUPOS = ("canvas", "multiplo_ideal", "poligono", "catalogo")
+
+
+def executar(grupos=GRUPOS, rapido=False, repeticoes=5):
+    """
+    Executa os grupos de benchmarks selecionados.
+    :param grupos: Nomes dos grupos (ver GRUPOS).
+    :param rapido: Se True, usa os tamanhos reduzidos.
+    :param repeticoes: Número de execuções medidas por caso.
+    :return: Dicionário com os metadados da execução e os resultados por caso.
+    """
+    indice = 1 if rapido else 0
+    resultados = {}
+    for grupo in grupos:
+        inicio = time.perf_counter()
+        if grupo == "canvas":
+            resultados.update(bench_canvas(TAMANHOS["canvas"][indice], repeticoes))
+        elif grupo == "multiplo_ideal":
+            resultados.update(bench_multiplo_ideal(repeticoes))
+        elif grupo == "poligono":
+            resultados.update(bench_poligono(TAMANHOS["poligono"][indice], repeticoes))
+        elif grupo == "catalogo":
+            resultados.update(bench_catalogo(TAMANHOS["catalogo"][indice], repeticoes))
+        else:
+            raise ValueError(f"Grupo de benchmark desconhecido: {grupo}")
+        logger.info("Benchmarks de %s concluídos em %.1f s.", grupo, time.perf_counter() - inicio)
+    return {
+        "commit": _commit_atual(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "rapido": rapido,
+        "resultados": resultados,
+    }
+
+
+def _commit_atual():
+    """Hash curto do commit atual, ou None fora de um repositório git."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(atual, referencia, limite=LIMITE_REGRESSAO):
+    """
+    Compara as medianas de duas execuções.
+    :param atual: Resultado de executar().
+    :param referencia: Resultado de uma execução anterior.
+    :param limite: Aumento relativo da mediana tolerado antes de contar como regressão.
+    :return: Tupla (comparações, regressões): listas de (caso, mediana de referência, mediana atual, razão)
+             dos casos presentes nas duas execuções, da maior razão para a menor; regressões são as acima do limite.
+    """
+    comparacoes = []
+    for caso, medida in atual["resultados"].items():
+        anterior = referencia["resultados"].get(caso)
+        if anterior is None or anterior["mediana"] <= 0:
+            continue
+        comparacoes.append((caso, anterior["mediana"], medida["mediana"], medida["mediana"] / anterior["mediana"]))
+    comparacoes.sort(key=lambda item: item[3], reverse=True)
+    regressoes = [item for item in comparacoes if item[3] > 1 + limite]
+    return comparacoes, regressoes
+
+
+def salvar(resultado, caminho=None):
+    """
+    Grava o resultado em JSON.
+    :param caminho: Arquivo de destino (padrão: resultados/<data>_<commit>.json).
+    :return: Caminho do arquivo gravado.
+    """
+    if caminho is None:
+        os.makedirs(DIRETORIO_RESULTADOS, exist_ok=True)
+        nome = f"{resultado['data'].replace(':', '')}_{resultado['commit'] or 'sem-commit'}.json"
+        caminho = os.path.join(DIRETORIO_RESULTADOS, nome)
+    with open(caminho, "w") as file:
+        json.dump(resultado, file, indent=4)
+    return caminho
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa os benchmarks de desempenho e compara com uma execução anterior.")
+    parser.add_argument("--grupos", nargs="+", choices=GRUPOS, default=list(GRUPOS), help="Grupos de benchmarks.")
+    parser.add_argument("--rapido", action="store_true", help="Usa tamanhos reduzidos.")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções medidas por caso.")
+    parser.add_argument("--saida", default=None, help="Arquivo JSON de saída (padrão: benchmarks/resultados/).")
+    parser.add_argument("--comparar", default=None, help="Arquivo JSON de uma execução anterior para comparação.")
+    parser.add_argument("--limite", type=float, default=LIMITE_REGRESSAO, help="Aumento relativo tolerado (0.2 = 20%%).")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    resultado = executar(args.grupos, args.rapido, args.repeticoes)
+    caminho = salvar(resultado, args.saida)
+    for caso, medida in resultado["resultados"].items():
+        print(f"{caso:45s} {medida['mediana'] * 1000:10.3f} ms")
+    print(f"Resultados gravados em {caminho}")
+    if args.comparar:
+        with open(args.comparar, "r") as file:
+            referencia = json.load(file)
+        comparacoes, regressoes = comparar(resultado, referencia, args.limite)
+        print(f"\nComparação com {referencia.get('commit')} ({args.comparar}):")
+        for caso, anterior, atual, razao in comparacoes:
+            marca = "  REGRESSÃO" if razao > 1 + args.limite else ""
+            print(f"{caso:45s} {anterior * 1000:10.3f} -> {atual * 1000:10.3f} ms  x{razao:.2f}{marca}")
+        if regressoes:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
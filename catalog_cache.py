@@ -0,0 +1,230 @@
+import bisect
+import difflib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from db_manager import DB_PATH, get_pool
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+# Acima desta quantidade de linhas novas é mais barato reconstruir os índices ordenados
+REBUILD_THRESHOLD = 1000
+
+
+def normalizar_codigo(codigo):
+    """
+    Normaliza um código de peça para busca: minúsculas e apenas letras e dígitos.
+    :param codigo: Código da peça (ex.: "51.20.05.101").
+    :return: Código normalizado (ex.: "512005101").
+    """
+    return re.sub(r"[^0-9a-z]", "", str(codigo).lower())
+
+
+class PartCatalog:
+    def __init__(self, db_path=DB_PATH):
+        """
+        Inicializa o catálogo de peças em memória, carregado uma vez da tabela pecas.
+        :param db_path: Caminho para o arquivo do banco de dados SQLite.
+        """
+        self.db_path = db_path
+        self.pool = get_pool(db_path)
+        self._rows = {}  # cod_peca -> (cod_peca, comprimento, largura)
+        self._codes = []  # Códigos ordenados para busca por prefixo
+        self._normalized = []  # Códigos normalizados ordenados
+        self._normalized_codes = []  # Código original correspondente a cada entrada de _normalized
+        self._by_normalized = {}  # Código normalizado -> lista de códigos originais (vários podem colidir)
+        self._signature = None
+        self.loaded = False
+        # Protege os índices: refresh pode rodar em uma thread de trabalho enquanto a interface consulta
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.RLock()  # Serializa load/refresh concorrentes
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, codigo):
+        return codigo in self._rows
+
+    def _current_signature(self):
+        """
+        Retorna a assinatura atual do banco, sem escrever nele: PRAGMA data_version da conexão do pool
+        (muda quando outra conexão confirma uma escrita) e mtime e tamanho do arquivo e do WAL (que cobrem
+        as escritas feitas pela própria conexão).
+        :return: Tupla comparável entre chamadas.
+        """
+        data_version = self.pool.fetchone("PRAGMA data_version", label="catalogo_versao")[0]
+        arquivos = []
+        for caminho in (self.db_path, self.db_path + "-wal"):
+            try:
+                estado = os.stat(caminho)
+                arquivos.append((estado.st_mtime_ns, estado.st_size))
+            except OSError:
+                arquivos.append(None)
+        return (data_version, *arquivos)
+
+    def load(self):
+        """
+        Carrega o catálogo completo da tabela pecas e reconstrói os índices.
+        :return: Número de peças carregadas.
+        """
+        with self._refresh_lock:
+            signature = self._current_signature()
+            # Os índices novos são montados fora do lock e trocados de uma vez
+            rows = self._ler_linhas()
+            codes = sorted(rows)
+            pares = sorted((normalizar_codigo(codigo), codigo) for codigo in codes)
+            with self._lock:
+                self._signature = signature
+                self._rows = rows
+                self._codes = codes
+                self._set_normalized(pares)
+                self.loaded = True
+        logger.info("Catálogo de peças carregado: %d códigos.", len(self._rows))
+        return len(self._rows)
+
+    def _ler_linhas(self):
+        """Lê a tabela pecas como dicionário cod_peca -> (cod_peca, comprimento, largura)."""
+        linhas = self.pool.fetchall("SELECT cod_peca, comprimento, largura FROM pecas", label="catalogo_carregar")
+        return {str(cod_peca): (str(cod_peca), comprimento, largura) for cod_peca, comprimento, largura in linhas}
+
+    def refresh(self):
+        """
+        Relê a tabela pecas se o banco mudou desde a última leitura e aplica só as diferenças:
+        valores alterados não mexem nos índices ordenados, códigos novos são inseridos neles e só
+        códigos removidos os reconstroem. Escritas em outras tabelas do banco mudam a assinatura,
+        mas não alteram o catálogo.
+        :return: True se o catálogo foi atualizado.
+        """
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self):
+        """Executa a verificação e a recarga; deve ser chamada com _refresh_lock adquirido."""
+        if not self.loaded:
+            self.load()
+            return True
+        signature = self._current_signature()
+        if signature == self._signature:
+            return False
+        rows = self._ler_linhas()
+        novos = [codigo for codigo in rows if codigo not in self._rows]
+        removidos = len(self._rows) + len(novos) != len(rows)
+        alterados = [codigo for codigo, linha in rows.items() if codigo in self._rows and self._rows[codigo] != linha]
+        with self._lock:
+            self._signature = signature
+            if not novos and not removidos and not alterados:
+                return False  # A escrita foi em outra tabela do banco
+            self._rows = rows
+            if removidos or len(novos) > REBUILD_THRESHOLD:
+                self._rebuild_index()
+            else:
+                for codigo in novos:
+                    self._insert_index(codigo)
+        logger.info("Catálogo de peças atualizado: %d códigos novos, %d alterados%s.",
+                    len(novos), len(alterados), ", com remoções" if removidos else "")
+        return True
+
+    def _set_normalized(self, pares):
+        """Instala os índices normalizados a partir de pares (normalizado, código) ordenados."""
+        self._normalized = [normalizado for normalizado, _ in pares]
+        self._normalized_codes = [codigo for _, codigo in pares]
+        self._by_normalized = {}
+        for normalizado, codigo in pares:
+            self._by_normalized.setdefault(normalizado, []).append(codigo)
+
+    def _rebuild_index(self):
+        """Reconstrói os índices ordenados a partir do dicionário de peças."""
+        self._codes = sorted(self._rows)
+        self._set_normalized(sorted((normalizar_codigo(codigo), codigo) for codigo in self._codes))
+
+    def _insert_index(self, codigo):
+        """Insere um código nos índices ordenados sem reconstruí-los."""
+        bisect.insort(self._codes, codigo)
+        normalizado = normalizar_codigo(codigo)
+        posicao = bisect.bisect_right(self._normalized, normalizado)
+        self._normalized.insert(posicao, normalizado)
+        self._normalized_codes.insert(posicao, codigo)
+        bisect.insort(self._by_normalized.setdefault(normalizado, []), codigo)
+
+    def get(self, codigo):
+        """
+        Retorna a peça com o código exato.
+        :param codigo: Código da peça.
+        :return: Tupla (cod_peca, comprimento, largura) ou None se não encontrada.
+        """
+        return self._rows.get(str(codigo))
+
+    def prefix_search(self, prefixo, limite=50):
+        """
+        Busca códigos que começam com o prefixo, em O(log n) sobre os índices ordenados.
+        O prefixo também é comparado na forma normalizada, então "5120" encontra "51.20.05.101".
+        :param prefixo: Início do código digitado pelo usuário.
+        :param limite: Número máximo de códigos retornados.
+        :return: Lista de códigos ordenados.
+        """
+        prefixo = str(prefixo)
+        with self._lock:
+            return self._prefix_search(prefixo, limite)
+
+    def _prefix_search(self, prefixo, limite):
+        """Busca por prefixo sobre os índices; deve ser chamada com o lock adquirido."""
+        resultado = []
+        inicio = bisect.bisect_left(self._codes, prefixo)
+        for codigo in self._codes[inicio:inicio + limite]:
+            if not codigo.startswith(prefixo):
+                break
+            resultado.append(codigo)
+        normalizado = normalizar_codigo(prefixo)
+        if normalizado and len(resultado) < limite:
+            vistos = set(resultado)
+            inicio = bisect.bisect_left(self._normalized, normalizado)
+            for posicao in range(inicio, len(self._normalized)):
+                if len(resultado) >= limite or not self._normalized[posicao].startswith(normalizado):
+                    break
+                codigo = self._normalized_codes[posicao]
+                if codigo not in vistos:
+                    resultado.append(codigo)
+                    vistos.add(codigo)
+        return resultado
+
+    def fuzzy_search(self, texto, limite=10, corte=0.6):
+        """
+        Busca códigos parecidos com o texto, para quando não há correspondência por prefixo.
+        :param texto: Código (ou parte dele) digitado pelo usuário.
+        :param limite: Número máximo de códigos retornados.
+        :param corte: Similaridade mínima entre 0 e 1.
+        :return: Lista de códigos do mais ao menos parecido.
+        """
+        resultado = self.prefix_search(texto, limite)
+        if resultado:
+            return resultado
+        normalizado = normalizar_codigo(texto)
+        if not normalizado:
+            return []
+        with self._lock:
+            # Cada forma normalizada é comparada uma vez e devolve todos os códigos que a compartilham
+            parecidos = difflib.get_close_matches(normalizado, self._by_normalized, n=limite, cutoff=corte)
+            return [codigo for parecido in parecidos for codigo in self._by_normalized[parecido]][:limite]
+
+
+_catalog = None
+
+
+def get_catalog():
+    """
+    Retorna o catálogo compartilhado do banco padrão, carregando-o na primeira chamada.
+    :return: Instância de PartCatalog ou None se o banco não puder ser lido.
+    """
+    global _catalog
+    if _catalog is None:
+        catalogo = PartCatalog()
+        try:
+            catalogo.load()
+        except sqlite3.Error as e:
+            logger.error("Erro ao carregar o catálogo de peças: %s", e)
+            return None
+        _catalog = catalogo
+    return _catalog
@@ -1,5 +1,6 @@
 import sqlite3
 import logging
+from db_manager import get_pool
 
 # Configurar logger
 logger = logging.getLogger("app_logger")
@@ -9,19 +10,20 @@ class DatabaseHandler:
     def __init__(self, db_path="banco_de_dados.db"):
         """
         Inicializa o manipulador do banco de dados.
+        As conexões são compartilhadas com db_manager através do pool do arquivo informado.
         :param db_path: Caminho para o arquivo do banco de dados SQLite.
         """
         self.db_path = db_path
+        self.pool = get_pool(db_path)
 
     def conectar_bd(self):
         """
-        Conecta ao banco de dados SQLite.
+        Retorna a conexão persistente da thread atual ao banco de dados SQLite.
+        A conexão pertence ao pool e não deve ser fechada pelo chamador.
         :return: Conexão ao banco de dados ou None em caso de erro.
         """
         try:
-            conexao = sqlite3.connect(self.db_path)
-            logger.info("Conexão ao banco de dados estabelecida com sucesso.")
-            return conexao
+            return self.pool.connection()
         except Exception as e:
             logger.error(f"Erro ao conectar ao banco de dados: {e}")
             return None
@@ -32,21 +34,16 @@ class DatabaseHandler:
         :param codigo: Código da peça a ser buscada.
         :return: Dicionário com os dados da peça ou None se não encontrado.
         """
-        conexao = self.conectar_bd()
-        if conexao:
-            try:
-                cursor = conexao.cursor()
-                cursor.execute("SELECT comprimento, largura FROM pecas WHERE cod_peca = ?", (codigo,))
-                resultado = cursor.fetchone()
-                if resultado:
-                    comprimento, largura = resultado
-                    logger.info(f"Dados encontrados para o código {codigo}: Comprimento={comprimento}, Largura={largura}")
-                    return {"comprimento": comprimento, "largura": largura}
-                else:
-                    logger.warning(f"Nenhum registro encontrado para o código: {codigo}")
-                    return None
-            except Exception as e:
-                logger.error(f"Erro ao consultar o banco de dados: {e}")
-            finally:
-                conexao.close()
-        return None
\ No newline at end of file
+        try:
+            resultado = self.pool.fetchone(
+                "SELECT comprimento, largura FROM pecas WHERE cod_peca = ?", (codigo,), label="buscar_peca_por_codigo"
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao consultar o banco de dados: {e}")
+            return None
+        if resultado:
+            comprimento, largura = resultado
+            logger.info(f"Dados encontrados para o código {codigo}: Comprimento={comprimento}, Largura={largura}")
+            return {"comprimento": comprimento, "largura": largura}
+        logger.warning(f"Nenhum registro encontrado para o código: {codigo}")
+        return None
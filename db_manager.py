@@ -1,44 +1,327 @@
 # db_manager.py
+import os
 import sqlite3
-from PyQt5.QtWidgets import QMessageBox
+import sys
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from utils.instrumentation import recorder
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+DB_PATH = "peças.db"
+
+# Pragmas aplicados a cada conexão nova do pool (bancos em disco local)
+PRAGMAS = {
+    "journal_mode": "WAL",  # Leitores não bloqueiam o escritor
+    "synchronous": "NORMAL",  # Seguro com WAL e bem mais rápido que FULL
+    "cache_size": -16000,  # ~16 MB de cache de páginas por conexão
+    "temp_store": "MEMORY",
+    "mmap_size": 64 * 1024 * 1024,
+    "busy_timeout": 5000,  # Espera até 5 s por um lock em vez de falhar na hora
+}
+
+# Pragmas para bancos em compartilhamentos de rede: o WAL depende de memória compartilhada entre os
+# processos, que os sistemas de arquivos de rede não oferecem, então volta o journal de rollback
+PRAGMAS_REDE = dict(PRAGMAS, journal_mode="DELETE", synchronous="FULL", mmap_size=0)
+
+# Sistemas de arquivos de rede (tipos em /proc/mounts)
+SISTEMAS_DE_REDE = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "afs", "9p", "fuse.sshfs"}
+
+# Migrações do esquema, na ordem em que foram criadas; PRAGMA user_version guarda quantas já foram aplicadas
+MIGRACOES = (
+    # 1: índices das colunas ordenáveis da tabela pecas, percorridos pela paginação da tabela de peças
+    (
+        "CREATE INDEX IF NOT EXISTS idx_pecas_comprimento ON pecas (comprimento, cod_peca)",
+        "CREATE INDEX IF NOT EXISTS idx_pecas_largura ON pecas (largura, cod_peca)",
+    ),
+)
+
+
+class ConnectionPool:
+    def __init__(self, db_path=DB_PATH, pragmas=None, cached_statements=256):
+        """
+        Inicializa o pool de conexões persistentes ao banco SQLite.
+        Cada thread recebe a sua própria conexão, criada uma única vez e reutilizada.
+        :param db_path: Caminho para o arquivo do banco de dados SQLite.
+        :param pragmas: Dicionário de pragmas aplicados a cada conexão (padrão: pragmas_padrao(db_path)).
+        :param cached_statements: Tamanho do cache de instruções preparadas de cada conexão.
+        """
+        self.db_path = db_path
+        self.pragmas = pragmas_padrao(db_path) if pragmas is None else pragmas
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def connection(self):
+        """
+        Retorna a conexão da thread atual, criando-a na primeira chamada.
+        :return: Conexão sqlite3 reutilizável.
+        """
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            # check_same_thread=False apenas para permitir close_all() a partir de outra thread;
+            # cada conexão continua sendo usada somente pela thread que a criou.
+            conexao = sqlite3.connect(
+                self.db_path, check_same_thread=False, cached_statements=self.cached_statements
+            )
+            for nome, valor in self.pragmas.items():
+                conexao.execute(f"PRAGMA {nome} = {valor}")
+            self._local.conexao = conexao
+            with self._lock:
+                self._connections.append(conexao)
+            logger.info("Conexão persistente aberta para %s (thread %d).", self.db_path, threading.get_ident())
+        return conexao
+
+    def _record(self, label, elapsed):
+        """Acumula o tempo de uma consulta nos contadores de latência e no registro de spans."""
+        recorder.record(f"db: {label}", "db", time.perf_counter() - elapsed, elapsed)
+        with self._lock:
+            stats = self._stats.setdefault(label, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0})
+            elapsed_ms = elapsed * 1000
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["last_ms"] = elapsed_ms
+
+    def execute(self, sql, params=(), label=None):
+        """
+        Executa uma consulta e retorna o cursor, para leitura incremental com fetchmany.
+        :param sql: Instrução SQL com parâmetros "?".
+        :param params: Parâmetros da consulta.
+        :param label: Nome usado nos contadores de latência (padrão: o próprio SQL).
+        :return: Cursor sqlite3 posicionado na primeira linha.
+        """
+        inicio = time.perf_counter()
+        try:
+            return self.connection().execute(sql, params)
+        finally:
+            self._record(label or sql, time.perf_counter() - inicio)
+
+    def fetchone(self, sql, params=(), label=None):
+        """
+        Executa uma consulta e retorna a primeira linha.
+        :param sql: Instrução SQL com parâmetros "?".
+        :param params: Parâmetros da consulta.
+        :param label: Nome usado nos contadores de latência (padrão: o próprio SQL).
+        :return: Tupla com a linha encontrada ou None.
+        """
+        inicio = time.perf_counter()
+        try:
+            return self.connection().execute(sql, params).fetchone()
+        finally:
+            self._record(label or sql, time.perf_counter() - inicio)
+
+    def fetchall(self, sql, params=(), label=None):
+        """
+        Executa uma consulta e retorna todas as linhas.
+        :param sql: Instrução SQL com parâmetros "?".
+        :param params: Parâmetros da consulta.
+        :param label: Nome usado nos contadores de latência (padrão: o próprio SQL).
+        :return: Lista de tuplas.
+        """
+        inicio = time.perf_counter()
+        try:
+            return self.connection().execute(sql, params).fetchall()
+        finally:
+            self._record(label or sql, time.perf_counter() - inicio)
+
+    def executemany(self, sql, seq_params, label=None):
+        """
+        Executa uma instrução de escrita para vários conjuntos de parâmetros em uma única transação.
+        :param sql: Instrução SQL com parâmetros "?".
+        :param seq_params: Sequência de tuplas de parâmetros.
+        :param label: Nome usado nos contadores de latência (padrão: o próprio SQL).
+        :return: Número de linhas afetadas.
+        """
+        inicio = time.perf_counter()
+        conexao = self.connection()
+        try:
+            with conexao:
+                return conexao.executemany(sql, seq_params).rowcount
+        finally:
+            self._record(label or sql, time.perf_counter() - inicio)
+
+    @contextmanager
+    def transaction(self, label):
+        """
+        Executa um bloco em uma única transação da conexão da thread atual: confirmada ao final
+        do bloco ou desfeita se ele levantar uma exceção.
+        Uso: with pool.transaction("gravar") as conexao: conexao.execute(...)
+        :param label: Nome usado nos contadores de latência para o tempo total da transação.
+        """
+        inicio = time.perf_counter()
+        conexao = self.connection()
+        try:
+            with conexao:
+                yield conexao
+        finally:
+            self._record(label, time.perf_counter() - inicio)
+
+    def stats(self):
+        """
+        Retorna os contadores de latência por consulta.
+        :return: Dicionário {label: {"count", "total_ms", "avg_ms", "max_ms", "last_ms"}}.
+        """
+        with self._lock:
+            return {
+                label: dict(stats, avg_ms=stats["total_ms"] / stats["count"])
+                for label, stats in self._stats.items()
+            }
+
+    def reset_stats(self):
+        """Zera os contadores de latência."""
+        with self._lock:
+            self._stats.clear()
+
+    def close_all(self):
+        """Fecha todas as conexões abertas pelo pool."""
+        with self._lock:
+            conexoes, self._connections = self._connections, []
+        for conexao in conexoes:
+            conexao.close()
+        self._local = threading.local()
+        logger.info("%d conexões fechadas para %s.", len(conexoes), self.db_path)
+
+
+def em_compartilhamento_de_rede(caminho):
+    """
+    Indica se o arquivo está em um compartilhamento de rede: caminho UNC, unidade de rede no Windows
+    ou ponto de montagem NFS/SMB no Linux.
+    :param caminho: Caminho do arquivo.
+    :return: True se o arquivo estiver em um sistema de arquivos de rede.
+    """
+    caminho = os.path.abspath(caminho)
+    if caminho.startswith("\\\\"):
+        return True
+    if sys.platform == "win32":
+        import ctypes  # Importado sob demanda: só existe a consulta no Windows
+        DRIVE_REMOTE = 4
+        return ctypes.windll.kernel32.GetDriveTypeW(os.path.splitdrive(caminho)[0] + "\\") == DRIVE_REMOTE
+    try:
+        with open("/proc/mounts", "r") as file:
+            montagens = [linha.split()[1:3] for linha in file]
+    except OSError:
+        return False
+    caminho = os.path.realpath(caminho)
+    tipo = None
+    maior = -1
+    for ponto, sistema in montagens:
+        ponto = ponto.replace("\\040", " ")
+        dentro = caminho == ponto or caminho.startswith(ponto.rstrip("/") + "/")
+        if dentro and len(ponto) > maior:
+            tipo, maior = sistema, len(ponto)
+    return tipo in SISTEMAS_DE_REDE
+
+
+def pragmas_padrao(db_path):
+    """
+    Escolhe os pragmas de um banco: PRAGMAS (com WAL) em disco local, PRAGMAS_REDE em compartilhamentos de rede.
+    :param db_path: Caminho para o arquivo do banco de dados SQLite.
+    :return: Dicionário de pragmas.
+    """
+    if db_path != ":memory:" and em_compartilhamento_de_rede(db_path):
+        logger.info("Banco %s em compartilhamento de rede: WAL desativado.", db_path)
+        return PRAGMAS_REDE
+    return PRAGMAS
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=DB_PATH, pragmas=None):
+    """
+    Retorna o pool compartilhado para o arquivo de banco informado.
+    :param db_path: Caminho para o arquivo do banco de dados SQLite.
+    :param pragmas: Pragmas das conexões (padrão: pragmas_padrao(db_path)); valem apenas na criação do
+                    pool do arquivo, que é compartilhado por todos os chamadores.
+    :return: Instância de ConnectionPool.
+    """
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = ConnectionPool(db_path, pragmas=pragmas)
+        elif pragmas is not None and pragmas != pool.pragmas:
+            logger.warning("Pool de %s já criado com outros pragmas; os novos foram ignorados.", db_path)
+        return pool
+
+
+def migrar_esquema(db_path=DB_PATH):
+    """
+    Aplica as migrações do esquema que o banco ainda não recebeu (chamada uma vez na inicialização da
+    aplicação, fora da thread da interface). Em um banco somente leitura, segue sem elas.
+    :param db_path: Caminho para o arquivo do banco de dados SQLite.
+    :return: Número de migrações aplicadas.
+    """
+    pool = get_pool(db_path)
+    try:
+        versao = pool.fetchone("PRAGMA user_version", label="migrar_esquema")[0]
+        for numero in range(versao, len(MIGRACOES)):
+            with pool.transaction("migrar_esquema") as conexao:
+                for sql in MIGRACOES[numero]:
+                    conexao.execute(sql)
+                conexao.execute(f"PRAGMA user_version = {numero + 1}")
+            logger.info("Migração %d do esquema aplicada em %s.", numero + 1, db_path)
+        return max(len(MIGRACOES) - versao, 0)
+    except sqlite3.Error as e:
+        logger.warning("Migrações do esquema não aplicadas em %s: %s", db_path, e)
+        return 0
+
+
+_error_listeners = []
+
+
+def registrar_ouvinte_erro(callback):
+    """
+    Registra uma função chamada a cada erro de banco, no lugar de diálogos modais.
+    O callback pode ser chamado de threads de trabalho; ouvintes de interface devem reencaminhar via sinal Qt.
+    :param callback: Função que recebe a mensagem de erro.
+    """
+    _error_listeners.append(callback)
+
+
+def remover_ouvinte_erro(callback):
+    """Remove um ouvinte registrado com registrar_ouvinte_erro."""
+    if callback in _error_listeners:
+        _error_listeners.remove(callback)
+
+
+def _reportar_erro(mensagem):
+    """Registra o erro no log e avisa os ouvintes sem bloquear quem chamou."""
+    logger.error(mensagem)
+    for callback in list(_error_listeners):
+        callback(mensagem)
+
 
 def conectar_bd():
-    """Conecta ao banco de dados SQLite."""
+    """Retorna a conexão persistente da thread atual ao banco de dados SQLite."""
     try:
-        conexao = sqlite3.connect("peças.db")
-        return conexao
+        return get_pool().connection()
     except sqlite3.Error as e:
-        QMessageBox.critical(None, "Erro", f"Erro ao conectar ao banco de dados: {e}")
+        _reportar_erro(f"Erro ao conectar ao banco de dados: {e}")
         return None
 
 def buscar_peca_por_codigo(cod_peca):
     """Busca uma peça pelo código no banco de dados."""
-    conexao = conectar_bd()
-    if not conexao:
-        return None
-
-    cursor = conexao.cursor()
     try:
-        cursor.execute("SELECT cod_peca, comprimento, largura FROM pecas WHERE cod_peca = ?", (cod_peca,))
-        dado = cursor.fetchone()
-        return dado
+        return get_pool().fetchone(
+            "SELECT cod_peca, comprimento, largura FROM pecas WHERE cod_peca = ?",
+            (cod_peca,),
+            label="buscar_peca_por_codigo",
+        )
     except sqlite3.Error as e:
-        QMessageBox.critical(None, "Erro", f"Erro ao buscar peça: {e}")
-    finally:
-        conexao.close()
+        _reportar_erro(f"Erro ao buscar peça: {e}")
+        return None
 
 def buscar_todas_pecas():
     """Busca todas as peças no banco de dados."""
-    conexao = conectar_bd()
-    if not conexao:
-        return []
-
-    cursor = conexao.cursor()
     try:
-        cursor.execute("SELECT cod_peca, comprimento, largura FROM pecas")
-        dados = cursor.fetchall()
-        return dados
+        return get_pool().fetchall("SELECT cod_peca, comprimento, largura FROM pecas", label="buscar_todas_pecas")
     except sqlite3.Error as e:
-        QMessageBox.critical(None, "Erro", f"Erro ao buscar peças: {e}")
-    finally:
-        conexao.close()
\ No newline at end of file
+        _reportar_erro(f"Erro ao buscar peças: {e}")
+        return []
@@ -0,0 +1,329 @@
+import hashlib
+import logging
+import math
+import os
+import struct
+import numpy as np
+from logic.geometry import polygon_area
+from logic.nesting import points_in_polygon
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+# Entidades convertidas em contornos; as demais são ignoradas
+ENTIDADES = ("LINE", "ARC", "CIRCLE", "LWPOLYLINE")
+# Erro máximo (flecha) ao aproximar arcos por segmentos, em milímetros
+TOLERANCIA = 0.05
+# Distância máxima entre extremidades consideradas coincidentes ao encadear entidades, em milímetros
+TOLERANCIA_ENCADEAMENTO = 1e-3
+
+# Cache binário: assinatura, versão, número de contornos e número total de pontos,
+# seguidos dos deslocamentos (int64, n + 1) e das coordenadas (float64, pontos x 2)
+DIRETORIO_CACHE = ".dxf_cache"
+MAGIC = b"PSDXFGEO"
+VERSAO = 1
+CABECALHO = struct.Struct("<8sIqq")
+
+
+def _pares(arquivo):
+    """
+    Lê os pares (código de grupo, valor) de um arquivo DXF ASCII, linha a linha.
+    :param arquivo: Arquivo de texto aberto.
+    :return: Gerador de tuplas (código inteiro, valor sem espaços).
+    """
+    while True:
+        codigo = arquivo.readline()
+        valor = arquivo.readline()
+        if not codigo or not valor:
+            return
+        try:
+            yield int(codigo), valor.strip()
+        except ValueError:
+            raise ValueError(f"Código de grupo DXF inválido: {codigo.strip()!r}")
+
+
+def ler_entidades(caminho):
+    """
+    Percorre a seção ENTITIES de um arquivo DXF sem carregá-lo inteiro na memória.
+    :param caminho: Caminho do arquivo DXF (ASCII).
+    :return: Gerador de tuplas (tipo, [(código, valor), ...]) para as entidades de ENTIDADES.
+    """
+    with open(caminho, "r", encoding="utf-8", errors="replace") as arquivo:
+        em_entidades = False
+        aguardando_nome = False
+        tipo, grupos = None, []
+        for codigo, valor in _pares(arquivo):
+            if codigo == 0:
+                if tipo in ENTIDADES:
+                    yield tipo, grupos
+                tipo, grupos = None, []
+                if valor == "SECTION":
+                    aguardando_nome = True
+                elif valor == "ENDSEC":
+                    em_entidades = False
+                elif valor == "EOF":
+                    return
+                elif em_entidades:
+                    tipo = valor
+                continue
+            if aguardando_nome and codigo == 2:
+                em_entidades = valor == "ENTITIES"
+                aguardando_nome = False
+            elif tipo in ENTIDADES:
+                grupos.append((codigo, valor))
+        if tipo in ENTIDADES:
+            yield tipo, grupos
+
+
+def _segmentos_arco(raio, angulo, tolerancia):
+    """Número de segmentos para aproximar um arco com flecha máxima `tolerancia`."""
+    if raio <= tolerancia:
+        return max(1, int(math.ceil(abs(angulo) / (math.pi / 2))))
+    passo = 2 * math.acos(1 - tolerancia / raio)
+    return max(1, int(math.ceil(abs(angulo) / passo)))
+
+
+def _arco(cx, cy, raio, inicio, angulo, tolerancia):
+    """
+    Aproxima um arco por pontos, incluindo as duas extremidades.
+    :param inicio: Ângulo inicial em radianos.
+    :param angulo: Ângulo percorrido em radianos (positivo no sentido anti-horário).
+    :return: Array (N, 2).
+    """
+    t = inicio + np.linspace(0.0, angulo, _segmentos_arco(raio, angulo, tolerancia) + 1)
+    return np.column_stack((cx + raio * np.cos(t), cy + raio * np.sin(t)))
+
+
+def _bojo(p, q, bojo, tolerancia):
+    """
+    Aproxima o trecho em arco de uma LWPOLYLINE entre os vértices p e q.
+    :param bojo: Tangente de 1/4 do ângulo do arco (negativo no sentido horário).
+    :return: Array (N, 2) com os pontos de p até q, sem repetir p.
+    """
+    angulo = 4 * math.atan(bojo)
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    corda = math.hypot(dx, dy)
+    if corda == 0:
+        return np.empty((0, 2))
+    raio = corda / (2 * math.sin(abs(angulo) / 2))
+    # Distância do ponto médio da corda ao centro, do lado indicado pelo sinal do bojo
+    distancia = corda / 2 / math.tan(angulo / 2)
+    cx = (p[0] + q[0]) / 2 - dy / corda * distancia
+    cy = (p[1] + q[1]) / 2 + dx / corda * distancia
+    inicio = math.atan2(p[1] - cy, p[0] - cx)
+    pontos = _arco(cx, cy, raio, inicio, angulo, tolerancia)
+    pontos[-1] = q
+    return pontos[1:]
+
+
+def _valores(grupos, codigo, padrao=0.0):
+    """Primeiro valor numérico do código de grupo informado."""
+    for c, valor in grupos:
+        if c == codigo:
+            return float(valor)
+    return padrao
+
+
+def _polilinha(grupos, tolerancia):
+    """
+    Converte os grupos de uma LWPOLYLINE em pontos.
+    :return: Tupla (array (N, 2), True se for fechada).
+    """
+    vertices, bojos = [], []
+    fechada = False
+    for codigo, valor in grupos:
+        if codigo == 10:
+            vertices.append([float(valor), 0.0])
+            bojos.append(0.0)
+        elif codigo == 20 and vertices:
+            vertices[-1][1] = float(valor)
+        elif codigo == 42 and bojos:
+            bojos[-1] = float(valor)
+        elif codigo == 70:
+            fechada = bool(int(valor) & 1)
+    if not vertices:
+        return np.empty((0, 2)), fechada
+    n = len(vertices)
+    pontos = [np.array(vertices[:1], dtype=np.float64)]
+    for i in range(n if fechada else n - 1):
+        p, q = vertices[i], vertices[(i + 1) % n]
+        if bojos[i]:
+            pontos.append(_bojo(p, q, bojos[i], tolerancia))
+        else:
+            pontos.append(np.array([q], dtype=np.float64))
+    pontos = np.concatenate(pontos)
+    if fechada:
+        pontos = pontos[:-1]  # O último ponto repete o primeiro
+    return pontos, fechada
+
+
+def _encadear(trechos, tolerancia):
+    """
+    Junta trechos abertos cujas extremidades coincidem em contornos fechados.
+    :param trechos: Lista de arrays (N, 2).
+    :return: Tupla (contornos fechados, número de trechos que não fecharam).
+    """
+    def chave(ponto):
+        return (round(ponto[0] / tolerancia), round(ponto[1] / tolerancia))
+
+    extremidades = {}
+    for i, trecho in enumerate(trechos):
+        extremidades.setdefault(chave(trecho[0]), []).append(i)
+        extremidades.setdefault(chave(trecho[-1]), []).append(i)
+    usados = [False] * len(trechos)
+    contornos, abertos = [], 0
+    for i in range(len(trechos)):
+        if usados[i]:
+            continue
+        usados[i] = True
+        partes = [trechos[i]]
+        inicio = chave(trechos[i][0])
+        fim = chave(trechos[i][-1])
+        while fim != inicio:
+            proximo = next((j for j in extremidades.get(fim, ()) if not usados[j]), None)
+            if proximo is None:
+                break
+            usados[proximo] = True
+            trecho = trechos[proximo]
+            if chave(trecho[0]) != fim:
+                trecho = trecho[::-1]
+            partes.append(trecho[1:])
+            fim = chave(trecho[-1])
+        pontos = np.concatenate(partes)
+        if fim == inicio and len(pontos) > 3:
+            contornos.append(pontos[:-1])  # O último ponto repete o primeiro
+        else:
+            abertos += len(partes)
+    return contornos, abertos
+
+
+def ler_dxf(caminho, tolerancia=TOLERANCIA):
+    """
+    Lê um arquivo DXF e converte as entidades LINE, ARC, CIRCLE e LWPOLYLINE em polígonos.
+    Arcos e bojos são aproximados por segmentos; linhas, arcos e polilinhas abertas são
+    encadeados pelas extremidades em contornos fechados.
+    :param caminho: Caminho do arquivo DXF (ASCII).
+    :param tolerancia: Flecha máxima dos segmentos que aproximam os arcos, em milímetros.
+    :return: Lista de arrays (N, 2) com os contornos fechados (sem repetir o primeiro ponto).
+    """
+    contornos, trechos = [], []
+    for tipo, grupos in ler_entidades(caminho):
+        if tipo == "LINE":
+            trechos.append(np.array([
+                [_valores(grupos, 10), _valores(grupos, 20)],
+                [_valores(grupos, 11), _valores(grupos, 21)],
+            ]))
+        elif tipo in ("ARC", "CIRCLE"):
+            cx, cy, raio = _valores(grupos, 10), _valores(grupos, 20), _valores(grupos, 40)
+            if raio <= 0:
+                continue
+            if tipo == "CIRCLE":
+                contornos.append(_arco(cx, cy, raio, 0.0, 2 * math.pi, tolerancia)[:-1])
+                continue
+            inicio = math.radians(_valores(grupos, 50))
+            angulo = (math.radians(_valores(grupos, 51)) - inicio) % (2 * math.pi) or 2 * math.pi
+            trechos.append(_arco(cx, cy, raio, inicio, angulo, tolerancia))
+        else:
+            pontos, fechada = _polilinha(grupos, tolerancia)
+            if fechada and len(pontos) >= 3:
+                contornos.append(pontos)
+            elif len(pontos) >= 2:
+                trechos.append(pontos)
+    encadeados, abertos = _encadear(trechos, TOLERANCIA_ENCADEAMENTO)
+    if abertos:
+        logger.warning("%d entidades de %s não formam contornos fechados e foram ignoradas.", abertos, caminho)
+    return contornos + encadeados
+
+
+def _arquivo_cache(caminho, tolerancia, diretorio):
+    """Caminho do cache para a versão atual do arquivo (caminho absoluto, mtime, tamanho e tolerância)."""
+    info = os.stat(caminho)
+    chave = f"{os.path.abspath(caminho)}|{info.st_mtime_ns}|{info.st_size}|{tolerancia!r}"
+    return os.path.join(diretorio, hashlib.sha1(chave.encode("utf-8")).hexdigest() + ".geo")
+
+
+def salvar_geometria(contornos, caminho):
+    """
+    Grava contornos no formato binário do cache, de forma atômica.
+    :param contornos: Lista de arrays (N, 2).
+    :param caminho: Caminho do arquivo de destino.
+    """
+    deslocamentos = np.zeros(len(contornos) + 1, dtype="<i8")
+    deslocamentos[1:] = np.cumsum([len(c) for c in contornos])
+    coordenadas = np.concatenate(contornos).astype("<f8") if contornos else np.empty((0, 2), dtype="<f8")
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as file:
+        file.write(CABECALHO.pack(MAGIC, VERSAO, len(contornos), len(coordenadas)))
+        file.write(deslocamentos.tobytes())
+        file.write(coordenadas.tobytes())
+    os.replace(temporario, caminho)
+
+
+def carregar_geometria(caminho):
+    """
+    Lê contornos gravados por salvar_geometria.
+    :param caminho: Caminho do arquivo de cache.
+    :return: Lista de arrays (N, 2).
+    :raises ValueError: Se o arquivo não estiver no formato esperado.
+    """
+    with open(caminho, "rb") as file:
+        dados = file.read()
+    if len(dados) < CABECALHO.size:
+        raise ValueError(f"Cache de geometria truncado: {caminho}")
+    magic, versao, n, pontos = CABECALHO.unpack_from(dados, 0)
+    if magic != MAGIC or versao != VERSAO:
+        raise ValueError(f"Cache de geometria em formato desconhecido: {caminho}")
+    if len(dados) != CABECALHO.size + (n + 1) * 8 + pontos * 16:
+        raise ValueError(f"Cache de geometria truncado: {caminho}")
+    deslocamentos = np.frombuffer(dados, dtype="<i8", count=n + 1, offset=CABECALHO.size)
+    coordenadas = np.frombuffer(dados, dtype="<f8", count=pontos * 2, offset=CABECALHO.size + (n + 1) * 8).reshape(-1, 2)
+    return [coordenadas[deslocamentos[i]:deslocamentos[i + 1]] for i in range(n)]
+
+
+def geometria_dxf(caminho, tolerancia=TOLERANCIA, diretorio=DIRETORIO_CACHE):
+    """
+    Retorna os contornos de um arquivo DXF, lendo do cache binário quando o arquivo não mudou
+    desde a última leitura (mesmo caminho, mtime e tamanho) e atualizando o cache caso contrário.
+    :param caminho: Caminho do arquivo DXF.
+    :param tolerancia: Flecha máxima dos segmentos que aproximam os arcos, em milímetros.
+    :param diretorio: Diretório do cache (None desativa o cache).
+    :return: Lista de arrays (N, 2) somente leitura.
+    """
+    if diretorio is None:
+        return ler_dxf(caminho, tolerancia)
+    arquivo_cache = _arquivo_cache(caminho, tolerancia, diretorio)
+    if os.path.exists(arquivo_cache):
+        try:
+            return carregar_geometria(arquivo_cache)
+        except (OSError, ValueError) as e:
+            logger.warning("Cache de geometria ignorado para %s: %s", caminho, e)
+    contornos = ler_dxf(caminho, tolerancia)
+    try:
+        os.makedirs(diretorio, exist_ok=True)
+        salvar_geometria(contornos, arquivo_cache)
+    except OSError as e:
+        logger.warning("Não foi possível gravar o cache de geometria de %s: %s", caminho, e)
+    for contorno in contornos:
+        contorno.setflags(write=False)
+    return contornos
+
+
+def areas_peca(contornos):
+    """
+    Calcula as áreas de uma peça a partir dos seus contornos: o maior é o contorno externo e os
+    contornos dentro dele são furos, descontados da área líquida.
+    :param contornos: Lista de arrays (N, 2) em milímetros.
+    :return: Tupla (área líquida, área bruta do retângulo envolvente) em milímetros quadrados,
+             a unidade das colunas area_peca_liquida e area_peca_bruta da tabela pecas.
+    :raises ValueError: Se não houver contornos.
+    """
+    if not contornos:
+        raise ValueError("A geometria não tem contornos fechados.")
+    areas = [polygon_area(c) for c in contornos]
+    externo = int(np.argmax(areas))
+    liquida = areas[externo]
+    for i, contorno in enumerate(contornos):
+        if i != externo and points_in_polygon(contorno[:1], contornos[externo])[0]:
+            liquida -= areas[i]
+    largura, altura = np.ptp(contornos[externo], axis=0)
+    return float(liquida), float(largura * altura)
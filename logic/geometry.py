@@ -0,0 +1,249 @@
+import numpy as np
+
+# Tolerância para comparações em milímetros
+EPS = 1e-9
+
+
+def as_array(points):
+    """
+    Converte pontos em um array compactado de coordenadas.
+    :param points: Array (N, 2), lista de tuplas (x, y) ou lista de objetos com x() e y() (ex.: QPointF).
+    :return: Array NumPy float64 (N, 2).
+    """
+    if isinstance(points, np.ndarray):
+        return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    points = list(points)
+    if points and hasattr(points[0], "x") and callable(points[0].x):
+        return np.array([(p.x(), p.y()) for p in points], dtype=np.float64).reshape(-1, 2)
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+def _sem_repetidos(coords):
+    """Remove vértices consecutivos repetidos, inclusive o fechamento explícito (último igual ao primeiro)."""
+    if len(coords) < 2:
+        return coords
+    proximo = np.roll(coords, -1, axis=0)
+    distintos = np.any(np.abs(coords - proximo) > EPS, axis=1)
+    return coords[distintos] if distintos.any() else coords[:1]
+
+
+def signed_area(coords):
+    """
+    Calcula a área com sinal pela fórmula do laço (shoelace): positiva no sentido anti-horário.
+    :param coords: Array (N, 2) com os vértices.
+    :return: Área com sinal, na unidade das coordenadas ao quadrado.
+    """
+    coords = as_array(coords)
+    if len(coords) < 3:
+        return 0.0
+    x, y = coords[:, 0], coords[:, 1]
+    # Centraliza as coordenadas para reduzir o erro de cancelamento em coordenadas grandes
+    x = x - x.mean()
+    y = y - y.mean()
+    return float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y)) / 2.0
+
+
+def polygon_area(coords):
+    """
+    Calcula a área de um polígono.
+    :param coords: Array (N, 2) com os vértices.
+    :return: Área (sem sinal), na unidade das coordenadas ao quadrado.
+    """
+    return abs(signed_area(coords))
+
+
+def polygon_centroid(coords):
+    """
+    Calcula o centroide de um polígono.
+    :param coords: Array (N, 2) com os vértices.
+    :return: Tupla (x, y); para polígonos degenerados (área nula), a média dos vértices.
+    """
+    coords = as_array(coords)
+    if len(coords) == 0:
+        raise ValueError("Polígono sem vértices.")
+    origem = coords.mean(axis=0)
+    local = coords - origem
+    x, y = local[:, 0], local[:, 1]
+    x1, y1 = np.roll(x, -1), np.roll(y, -1)
+    cruzado = x * y1 - x1 * y
+    area = cruzado.sum() / 2.0
+    if abs(area) <= EPS:
+        return float(origem[0]), float(origem[1])
+    cx = np.dot(x + x1, cruzado) / (6.0 * area)
+    cy = np.dot(y + y1, cruzado) / (6.0 * area)
+    return float(cx + origem[0]), float(cy + origem[1])
+
+
+def _orientacao(a, b, c):
+    """Sinal do produto vetorial (b - a) x (c - a): 1 anti-horário, -1 horário, 0 colinear."""
+    valor = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+    if abs(valor) <= EPS:
+        return 0
+    return 1 if valor > 0 else -1
+
+
+def _no_segmento(a, b, p):
+    """Indica se p (colinear com a-b) está dentro da caixa do segmento a-b."""
+    return (min(a[0], b[0]) - EPS <= p[0] <= max(a[0], b[0]) + EPS
+            and min(a[1], b[1]) - EPS <= p[1] <= max(a[1], b[1]) + EPS)
+
+
+def _cruzam(p1, p2, q1, q2):
+    """Indica se os segmentos fechados p1-p2 e q1-q2 têm algum ponto em comum."""
+    o1, o2 = _orientacao(p1, p2, q1), _orientacao(p1, p2, q2)
+    o3, o4 = _orientacao(q1, q2, p1), _orientacao(q1, q2, p2)
+    if o1 != o2 and o3 != o4:
+        return True
+    return ((o1 == 0 and _no_segmento(p1, p2, q1)) or (o2 == 0 and _no_segmento(p1, p2, q2))
+            or (o3 == 0 and _no_segmento(q1, q2, p1)) or (o4 == 0 and _no_segmento(q1, q2, p2)))
+
+
+def is_simple(coords):
+    """
+    Verifica se o polígono é simples (nenhuma aresta cruza ou toca outra além das vizinhas no
+    vértice comum), com o algoritmo de varredura de Shamos-Hoey. As arestas ativas ficam em uma lista
+    ordenada: a posição de cada aresta é achada com O(log k) comparações, mas inserir e remover na lista
+    custa O(k), onde k é o maior número de arestas cortadas pela linha de varredura; o pior caso é
+    O(n·k) (O(n²) em polígonos em zigue-zague), e O(n log n) quando k é pequeno, como em contornos de sobra.
+    :param coords: Array (N, 2) com os vértices.
+    :return: True se o polígono for simples.
+    """
+    coords = _sem_repetidos(as_array(coords))
+    n = len(coords)
+    if n < 3:
+        return False
+    pontos = [tuple(p) for p in coords.tolist()]
+    # Cada aresta é orientada da extremidade esquerda (menor x, depois menor y) para a direita
+    arestas = []
+    for i in range(n):
+        a, b = pontos[i], pontos[(i + 1) % n]
+        arestas.append((a, b) if a <= b else (b, a))
+
+    def conflito(i, j):
+        if (j - i) % n == 1:
+            i, j = j, i
+        if (i - j) % n == 1:
+            # Arestas vizinhas (j termina onde i começa) só podem se tocar no vértice comum:
+            # há conflito apenas se forem colineares e voltarem sobre si mesmas
+            comum, a, b = pontos[i], pontos[j], pontos[(i + 1) % n]
+            if _orientacao(comum, a, b) != 0:
+                return False
+            return (a[0] - comum[0]) * (b[0] - comum[0]) + (a[1] - comum[1]) * (b[1] - comum[1]) > 0
+        (p1, p2), (q1, q2) = arestas[i], arestas[j]
+        return _cruzam(p1, p2, q1, q2)
+
+    def chave(i, x):
+        """Posição da aresta na linha de varredura em x: altura e inclinação (arestas verticais usam a extremidade inferior)."""
+        (x1, y1), (x2, y2) = arestas[i]
+        if abs(x2 - x1) <= EPS:
+            return (y1, float("inf"))
+        inclinacao = (y2 - y1) / (x2 - x1)
+        return (y1 + inclinacao * (x - x1), inclinacao)
+
+    # Eventos: inserções antes das remoções no mesmo x, para detectar arestas que apenas se tocam
+    eventos = []
+    for i, (esquerda, direita) in enumerate(arestas):
+        eventos.append((esquerda[0], 0, esquerda[1], i))
+        eventos.append((direita[0], 1, direita[1], i))
+    eventos.sort()
+
+    ativas = []  # Arestas cortadas pela linha de varredura, ordenadas de baixo para cima
+    for x, tipo, _, i in eventos:
+        if tipo == 0:
+            # Busca binária calculando a posição das arestas ativas apenas nos pontos sondados
+            alvo = chave(i, x)
+            baixo, alto = 0, len(ativas)
+            while baixo < alto:
+                meio = (baixo + alto) // 2
+                if chave(ativas[meio], x) < alvo:
+                    baixo = meio + 1
+                else:
+                    alto = meio
+            pos = baixo
+            ativas.insert(pos, i)
+            if pos > 0 and conflito(i, ativas[pos - 1]):
+                return False
+            if pos + 1 < len(ativas) and conflito(i, ativas[pos + 1]):
+                return False
+        else:
+            pos = ativas.index(i)  # O(k), como o insert acima
+            abaixo = ativas[pos - 1] if pos > 0 else None
+            acima = ativas[pos + 1] if pos + 1 < len(ativas) else None
+            del ativas[pos]
+            if abaixo is not None and acima is not None and conflito(abaixo, acima):
+                return False
+    return True
+
+
+def clip_to_rect(coords, xmin, ymin, xmax, ymax):
+    """
+    Recorta o polígono pelo retângulo [xmin, xmax] x [ymin, ymax] (Sutherland-Hodgman),
+    processando todas as arestas de cada lado do retângulo de uma vez com NumPy.
+    :param coords: Array (N, 2) com os vértices.
+    :return: Array (M, 2) com os vértices do polígono recortado (vazio se não houver interseção).
+    """
+    saida = as_array(coords)
+    # Cada lado: (eixo, limite, True se o interior está acima do limite)
+    for eixo, limite, acima in ((0, xmin, True), (0, xmax, False), (1, ymin, True), (1, ymax, False)):
+        if len(saida) == 0:
+            break
+        atual = saida
+        seguinte = np.roll(saida, -1, axis=0)
+        distancia_atual = atual[:, eixo] - limite
+        distancia_seguinte = seguinte[:, eixo] - limite
+        if not acima:
+            distancia_atual, distancia_seguinte = -distancia_atual, -distancia_seguinte
+        dentro_atual = distancia_atual >= 0
+        dentro_seguinte = distancia_seguinte >= 0
+        cruza = dentro_atual != dentro_seguinte
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(cruza, distancia_atual / (distancia_atual - distancia_seguinte), 0.0)
+        intersecao = atual + t[:, None] * (seguinte - atual)
+        intersecao[:, eixo] = limite
+        # Para cada aresta: primeiro a interseção (se cruzar o lado), depois o vértice seguinte (se estiver dentro)
+        candidatos = np.stack((intersecao, seguinte), axis=1).reshape(-1, 2)
+        mascara = np.stack((cruza, dentro_seguinte), axis=1).reshape(-1)
+        saida = candidatos[mascara]
+    return saida
+
+
+def sobra_area(coords, largura_chapa=None, altura_chapa=None):
+    """
+    Calcula a área da sobra demarcada, recortada pela chapa quando as dimensões forem informadas.
+    :param coords: Array (N, 2) com os vértices em milímetros, relativos ao canto da chapa.
+    :param largura_chapa: Largura da chapa em milímetros (opcional).
+    :param altura_chapa: Altura da chapa em milímetros (opcional).
+    :return: Área em metros quadrados.
+    :raises ValueError: Se o polígono tiver menos de 3 vértices ou arestas que se cruzam.
+    """
+    coords = _sem_repetidos(as_array(coords))
+    if len(coords) < 3:
+        raise ValueError("Polígono inválido: são necessários pelo menos 3 pontos.")
+    if not is_simple(coords):
+        raise ValueError("Polígono inválido: as arestas se cruzam.")
+    if largura_chapa and altura_chapa:
+        coords = clip_to_rect(coords, 0.0, 0.0, largura_chapa, altura_chapa)
+    return polygon_area_m2(coords)
+
+
+def polygon_area_m2(coords):
+    """
+    Calcula a área de um polígono com vértices em milímetros.
+    :param coords: Vértices em milímetros (array (N, 2), tuplas ou QPointF).
+    :return: Área em metros quadrados.
+    """
+    return polygon_area(as_array(coords)) / 1e6  # Converte de mm² para m²
+
+
+def canvas_sobra_area(canvas, points):
+    """
+    Calcula a área da sobra de um polígono desenhado no canvas: converte os pontos da cena para
+    milímetros da chapa e recorta pela chapa atual (sem chapa, usa as coordenadas da cena).
+    :param canvas: Canvas com current_rectangle, scene_to_sheet e as dimensões originais da chapa.
+    :param points: Pontos (QPointF) na cena.
+    :return: Área em metros quadrados.
+    :raises ValueError: Se o polígono tiver menos de 3 vértices ou arestas que se cruzam.
+    """
+    if canvas.current_rectangle:
+        return sobra_area(canvas.scene_to_sheet(points), canvas.original_width, canvas.original_height)
+    return sobra_area(as_array(points))
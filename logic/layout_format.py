@@ -0,0 +1,188 @@
+import argparse
+import json
+import logging
+import mmap
+import os
+import struct
+import numpy as np
+from logic.object_store import ObjectStore, _TypeTable
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+# Assinatura e versão do formato binário de layouts
+MAGIC = b"PSLAYOUT"
+VERSAO = 2
+# Cabeçalho fixo: assinatura, versão e tamanho do cabeçalho JSON
+CABECALHO = struct.Struct("<8sII")
+ALINHAMENTO = 8
+
+
+def _alinhar(posicao: int) -> int:
+    return (posicao + ALINHAMENTO - 1) // ALINHAMENTO * ALINHAMENTO
+
+
+def is_layout_file(caminho: str) -> bool:
+    """
+    Indica se o arquivo está no formato binário de layouts (pela assinatura).
+    :param caminho: Caminho do arquivo.
+    :return: True se o arquivo começar com a assinatura do formato.
+    """
+    try:
+        with open(caminho, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def save_layout(store: ObjectStore, caminho: str):
+    """
+    Grava o armazenamento no formato binário: cabeçalho JSON com o índice das seções, seguido de
+    arrays float64/int64 de largura fixa (alinhados em 8 bytes) e, por tipo, um bloco JSON com os
+    campos não numéricos (listas de pontos, textos), que só é lido quando esses campos forem acessados.
+    :param store: Armazenamento de objetos.
+    :param caminho: Caminho do arquivo de destino.
+    """
+    secoes = []  # (nome lógico, bytes)
+    vivos = store._order_alive[:store._size]
+    secoes.append(("order", np.ascontiguousarray(store._order[:store._size][vivos], dtype="<i8").tobytes()))
+    secoes.append(("order_type", np.ascontiguousarray(store._order_type[:store._size][vivos], dtype="<i4").tobytes()))
+    tabelas = []
+    for nome, tabela in store._tables.items():
+        vivas = tabela.alive[:tabela.size]
+        linhas = np.flatnonzero(vivas)
+        info = {"type": nome, "count": int(len(linhas)), "fields": list(tabela.fields or ()), "columns": {}}
+        secoes.append((("ids", nome), np.ascontiguousarray(tabela.ids[:tabela.size][vivas], dtype="<i8").tobytes()))
+        for campo, coluna in tabela.columns.items():
+            secoes.append((("column", nome, campo), np.ascontiguousarray(coluna[:tabela.size][vivas], dtype="<f8").tobytes()))
+        formas = {}  # Forma -> índice; as linhas guardam só o índice da sua forma
+        indices = [formas.setdefault(tabela.formas[i], len(formas)) for i in linhas]
+        extras = {
+            "extras": [tabela.extras[i] for i in linhas],
+            "formas": list(formas),
+            "linhas_formas": indices,
+        }
+        secoes.append((("extras", nome), json.dumps(extras, separators=(",", ":")).encode("utf-8")))
+        tabelas.append(info)
+
+    # O cabeçalho guarda deslocamentos absolutos e seu tamanho depende deles: reserva um espaço
+    # e recalcula até o cabeçalho caber nele
+    tamanho_cabecalho = 0
+    while True:
+        posicao = _alinhar(CABECALHO.size + tamanho_cabecalho)
+        deslocamentos = []
+        for _, dados in secoes:
+            deslocamentos.append((posicao, len(dados)))
+            posicao = _alinhar(posicao + len(dados))
+        mapa = dict(zip((nome for nome, _ in secoes), deslocamentos))
+        for info in tabelas:
+            nome = info["type"]
+            info["ids"] = mapa[("ids", nome)][0]
+            info["columns"] = {campo: mapa[("column", nome, campo)][0] for campo in info["fields"]}
+            info["extras"] = list(mapa[("extras", nome)])
+        cabecalho = {
+            "next_id": store._next_id,
+            "types": list(store._type_names),
+            "count": int(vivos.sum()),
+            "order": mapa["order"][0],
+            "order_type": mapa["order_type"][0],
+            "tables": tabelas,
+        }
+        bruto = json.dumps(cabecalho, separators=(",", ":")).encode("utf-8")
+        if len(bruto) <= tamanho_cabecalho:
+            break
+        tamanho_cabecalho = _alinhar(len(bruto) + 64)
+    bruto = bruto.ljust(tamanho_cabecalho, b" ")
+
+    with open(caminho, "wb") as file:
+        file.write(CABECALHO.pack(MAGIC, VERSAO, len(bruto)))
+        file.write(bruto)
+        for (_, dados), (deslocamento, _) in zip(secoes, deslocamentos):
+            file.write(b"\0" * (deslocamento - file.tell()))
+            file.write(dados)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def load_layout(caminho: str) -> ObjectStore:
+    """
+    Abre um arquivo de layout com mmap, em tempo independente do número de objetos.
+    As colunas numéricas são arrays NumPy somente leitura sobre o arquivo mapeado; os objetos
+    só são montados como dicionários quando acessados, e os campos não numéricos de um tipo
+    só são lidos no primeiro acesso a eles. Os arrays são copiados na primeira alteração.
+    :param caminho: Caminho do arquivo.
+    :return: ObjectStore apoiado no arquivo mapeado.
+    :raises ValueError: Se o arquivo não estiver no formato esperado.
+    """
+    with open(caminho, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise ValueError(f"Arquivo de layout vazio: {caminho}")
+        mapa = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, versao, tamanho = CABECALHO.unpack_from(mapa, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Arquivo não está no formato de layout: {caminho}")
+    if versao != VERSAO:
+        raise ValueError(f"Versão de layout não suportada: {versao}")
+    cabecalho = json.loads(bytes(mapa[CABECALHO.size:CABECALHO.size + tamanho]))
+    total = cabecalho["count"]
+    order = np.frombuffer(mapa, dtype="<i8", count=total, offset=cabecalho["order"])
+    order_type = np.frombuffer(mapa, dtype="<i4", count=total, offset=cabecalho["order_type"])
+
+    def carregador(deslocamento, comprimento):
+        def carregar():
+            dados = json.loads(bytes(mapa[deslocamento:deslocamento + comprimento]))
+            formas = [tuple(tuple(par) for par in forma) for forma in dados["formas"]]
+            return dados["extras"], [formas[i] for i in dados["linhas_formas"]]
+        return carregar
+
+    tabelas = []
+    for info in cabecalho["tables"]:
+        n = info["count"]
+        ids = np.frombuffer(mapa, dtype="<i8", count=n, offset=info["ids"])
+        colunas = {
+            campo: np.frombuffer(mapa, dtype="<f8", count=n, offset=deslocamento)
+            for campo, deslocamento in info["columns"].items()
+        }
+        tabelas.append(_TypeTable.from_arrays(info["type"], info["fields"], ids, colunas, carregador(*info["extras"])))
+    logger.info("Layout %s mapeado: %d objetos em %d tipos.", caminho, total, len(tabelas))
+    return ObjectStore.from_arrays(cabecalho["types"], order, order_type, tabelas, cabecalho["next_id"])
+
+
+def json_to_layout(json_path: str, layout_path: str) -> int:
+    """
+    Converte um arquivo de objetos no formato JSON atual para o formato binário.
+    :return: Número de objetos convertidos.
+    """
+    with open(json_path, "r") as file:
+        store = ObjectStore()
+        store.extend(json.load(file))
+    save_layout(store, layout_path)
+    logger.info("%d objetos convertidos de %s para %s.", len(store), json_path, layout_path)
+    return len(store)
+
+
+def layout_to_json(layout_path: str, json_path: str) -> int:
+    """
+    Converte um arquivo de layout binário para o formato JSON atual.
+    :return: Número de objetos convertidos.
+    """
+    store = load_layout(layout_path)
+    with open(json_path, "w") as file:
+        json.dump(store.to_list(), file, indent=4)
+    logger.info("%d objetos convertidos de %s para %s.", len(store), layout_path, json_path)
+    return len(store)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converte layouts entre o formato JSON e o formato binário.")
+    parser.add_argument("origem", help="Arquivo de origem (.json ou .layout).")
+    parser.add_argument("destino", help="Arquivo de destino.")
+    args = parser.parse_args(argv)
+    if is_layout_file(args.origem):
+        layout_to_json(args.origem, args.destino)
+    else:
+        json_to_layout(args.origem, args.destino)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import math
+import numpy as np
+from utils.packing import empacotar_circulos
+
+# Layouts suportados pelo motor de distribuição ("otimizado" escolhe o melhor arranjo com kerf e margem)
+LAYOUTS = ("grade", "hexagonal", "otimizado")
+
+
+def grid_centers(width, height, radius):
+    """
+    Calcula os centros de círculos dispostos em grade quadrada dentro de um retângulo.
+    :param width: Largura do retângulo em milímetros.
+    :param height: Altura do retângulo em milímetros.
+    :param radius: Raio dos círculos em milímetros.
+    :return: Array NumPy (N, 2) com as coordenadas (x, y) dos centros, relativas ao canto do retângulo.
+    """
+    spacing = radius * 2
+    if radius <= 0 or width < spacing or height < spacing:
+        return np.empty((0, 2), dtype=np.float64)
+    cols = int(width // spacing)
+    rows = int(height // spacing)
+    xs = np.arange(cols, dtype=np.float64) * spacing + radius
+    ys = np.arange(rows, dtype=np.float64) * spacing + radius
+    # Ordem linha a linha, igual ao laço original (for row / for col)
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    return np.column_stack((grid_x.ravel(), grid_y.ravel()))
+
+
+def hex_centers(width, height, radius):
+    """
+    Calcula os centros de círculos em disposição hexagonal (linhas alternadas deslocadas).
+    :param width: Largura do retângulo em milímetros.
+    :param height: Altura do retângulo em milímetros.
+    :param radius: Raio dos círculos em milímetros.
+    :return: Array NumPy (N, 2) com as coordenadas (x, y) dos centros, relativas ao canto do retângulo.
+    """
+    spacing = radius * 2
+    if radius <= 0 or width < spacing or height < spacing:
+        return np.empty((0, 2), dtype=np.float64)
+    row_pitch = spacing * math.sqrt(3) / 2
+    rows = int((height - spacing) // row_pitch) + 1
+    ys = np.arange(rows, dtype=np.float64) * row_pitch + radius
+    # Linhas ímpares são deslocadas de meio diâmetro e podem ter uma coluna a menos
+    offsets = (np.arange(rows) % 2) * radius
+    cols_max = int(width // spacing)
+    xs = np.arange(cols_max, dtype=np.float64) * spacing + radius
+    grid_x = xs[np.newaxis, :] + offsets[:, np.newaxis]
+    grid_y = np.broadcast_to(ys[:, np.newaxis], grid_x.shape)
+    inside = grid_x + radius <= width
+    return np.column_stack((grid_x[inside], grid_y[inside]))
+
+
+def compute_centers(width, height, radius, layout="grade", kerf=0.0, margin=0.0):
+    """
+    Calcula os centros de distribuição de círculos para o layout escolhido.
+    :param width: Largura do retângulo em milímetros.
+    :param height: Altura do retângulo em milímetros.
+    :param radius: Raio dos círculos em milímetros.
+    :param layout: Disposição dos círculos ("grade", "hexagonal" ou "otimizado").
+    :param kerf: Distância entre peças em milímetros (apenas no layout "otimizado").
+    :param margin: Distância até as bordas em milímetros (apenas no layout "otimizado").
+    :return: Array NumPy (N, 2) com as coordenadas (x, y) dos centros.
+    """
+    if layout == "grade":
+        return grid_centers(width, height, radius)
+    elif layout == "hexagonal":
+        return hex_centers(width, height, radius)
+    elif layout == "otimizado":
+        return empacotar_circulos(width, height, radius, kerf, margin)[1]
+    else:
+        raise ValueError("Layout não suportado. Escolha entre 'grade', 'hexagonal' ou 'otimizado'.")
+
+
+# Pontos por bloco nas operações vetorizadas: blocos estreitos em y podam mais arestas
+BLOCO_PONTOS = 512
+
+
+def _blocos(points, edges_a, edges_b, margem):
+    """
+    Percorre os pontos em blocos de y próximos, podando as arestas cuja faixa em y (ampliada pela
+    margem) não alcança a faixa de y do bloco.
+    :return: Gerador de tuplas (índices dos pontos, início das arestas, fim das arestas).
+    """
+    ordem = np.argsort(points[:, 1], kind="stable")
+    ymin_aresta = np.minimum(edges_a[:, 1], edges_b[:, 1]) - margem
+    ymax_aresta = np.maximum(edges_a[:, 1], edges_b[:, 1]) + margem
+    for inicio in range(0, len(points), BLOCO_PONTOS):
+        indices = ordem[inicio:inicio + BLOCO_PONTOS]
+        y = points[indices, 1]
+        alcance = (ymax_aresta >= y[0]) & (ymin_aresta <= y[-1])
+        yield indices, edges_a[alcance], edges_b[alcance]
+
+
+def points_in_polygon(points, polygon):
+    """
+    Testa quais pontos estão dentro de um polígono (regra par-ímpar), de forma vetorizada.
+    Pontos fora da caixa envolvente do polígono são descartados sem teste.
+    :param points: Array (M, 2) com os pontos.
+    :param polygon: Array (N, 2) com os vértices do polígono.
+    :return: Array booleano (M,).
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    polygon = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    dentro = np.zeros(len(points), dtype=bool)
+    if len(polygon) < 3 or len(points) == 0:
+        return dentro
+    na_caixa = np.all((points >= polygon.min(axis=0)) & (points <= polygon.max(axis=0)), axis=1)
+    candidatos = points[na_caixa]
+    a, b = polygon, np.roll(polygon, -1, axis=0)
+    resultado = np.zeros(len(candidatos), dtype=bool)
+    for indices, ea, eb in _blocos(candidatos, a, b, 0.0):
+        px, py = candidatos[indices, 0][:, None], candidatos[indices, 1][:, None]
+        cruza_y = (ea[:, 1] > py) != (eb[:, 1] > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_cruzamento = ea[:, 0] + (py - ea[:, 1]) * (eb[:, 0] - ea[:, 0]) / (eb[:, 1] - ea[:, 1])
+        resultado[indices] = np.count_nonzero(cruza_y & (px < x_cruzamento), axis=1) % 2 == 1
+    dentro[na_caixa] = resultado
+    return dentro
+
+
+def distance_to_edges(points, polygon, limite=np.inf):
+    """
+    Calcula a menor distância de cada ponto até as arestas do polígono, de forma vetorizada.
+    :param points: Array (M, 2) com os pontos.
+    :param polygon: Array (N, 2) com os vértices do polígono.
+    :param limite: Distâncias acima deste valor não interessam; as arestas mais distantes são podadas
+                   e o resultado para os pontos sem arestas próximas é `limite`.
+    :return: Array (M,) com as distâncias.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    polygon = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    distancias = np.full(len(points), limite, dtype=np.float64)
+    if len(polygon) < 2 or len(points) == 0:
+        return distancias
+    a, b = polygon, np.roll(polygon, -1, axis=0)
+    margem = limite if np.isfinite(limite) else np.inf
+    for indices, ea, eb in _blocos(points, a, b, margem):
+        if len(ea) == 0:
+            continue
+        p = points[indices][:, None, :]
+        ab = eb - ea
+        comprimento2 = np.einsum("ij,ij->i", ab, ab)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.einsum("mij,ij->mi", p - ea, ab) / comprimento2
+        t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+        mais_proximo = ea + t[..., None] * ab
+        d2 = np.einsum("mij,mij->mi", p - mais_proximo, p - mais_proximo)
+        distancias[indices] = np.minimum(distancias[indices], np.sqrt(d2.min(axis=1)))
+    return distancias
+
+
+def polygon_centers(polygon, radius, layout="hexagonal", phases=3):
+    """
+    Calcula os centros de círculos que cabem inteiros dentro de um polígono qualquer (ex.: uma sobra).
+    Os candidatos vêm da grade do layout sobre a caixa envolvente do polígono, em `phases` x `phases`
+    deslocamentos da grade; todos são avaliados em um único lote (ponto no polígono e distância às
+    arestas) e vence o deslocamento com mais círculos.
+    :param polygon: Array (N, 2) com os vértices do polígono em milímetros.
+    :param radius: Raio dos círculos em milímetros.
+    :param layout: Disposição dos círculos ("grade" ou "hexagonal").
+    :param phases: Número de deslocamentos da grade testados em cada eixo.
+    :return: Array NumPy (K, 2) com os centros, nas mesmas coordenadas do polígono.
+    """
+    polygon = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    if len(polygon) < 3 or radius <= 0:
+        return np.empty((0, 2), dtype=np.float64)
+    origem = polygon.min(axis=0)
+    largura, altura = polygon.max(axis=0) - origem
+    passo_x = radius * 2
+    passo_y = passo_x * (math.sqrt(3) / 2 if layout == "hexagonal" else 1.0)
+    candidatos, fases = [], []
+    for i in range(phases):
+        for j in range(phases):
+            dx, dy = passo_x * i / phases, passo_y * j / phases
+            centros = compute_centers(largura - dx, altura - dy, radius, layout)
+            candidatos.append(centros + origem + (dx, dy))
+            fases.append(np.full(len(centros), i * phases + j))
+    candidatos = np.concatenate(candidatos)
+    fases = np.concatenate(fases)
+    if len(candidatos) == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    validos = points_in_polygon(candidatos, polygon)
+    validos[validos] = distance_to_edges(candidatos[validos], polygon, limite=radius) >= radius - 1e-9
+    contagem = np.bincount(fases[validos], minlength=phases * phases)
+    melhor = int(np.argmax(contagem))
+    return candidatos[validos & (fases == melhor)]
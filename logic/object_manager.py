@@ -1,80 +1,349 @@
+import atexit
 import json
 import logging
+import threading
+import weakref
 from typing import List, Dict, Any
 import os
+from logic.object_store import ObjectStore, ObjectsView
+from logic.layout_format import is_layout_file, load_layout, save_layout
 
 # Configurar logger
 logger = logging.getLogger("app_logger")
 
 
+def _flush_ao_sair(referencia):
+    """Grava as alterações pendentes de um ObjectManager ainda vivo no encerramento do processo."""
+    manager = referencia()
+    if manager is not None:
+        manager.flush()
+
+
 class ObjectManager:
-    def __init__(self):
+    def __init__(self, config_file: str = "objects.json", write_behind: bool = True, flush_interval: float = 2.0,
+                 load: bool = True):
         """
         Inicializa o gerenciador de objetos.
+        :param config_file: Arquivo para persistir os dados; com extensão ".layout", usa o formato
+                            binário mapeado em memória (logic.layout_format) em vez de JSON.
+        :param write_behind: Se True, as alterações vão para um journal e o arquivo é regravado
+                             em segundo plano; se False, cada alteração regrava o arquivo na hora.
+        :param flush_interval: Segundos de espera, após uma alteração, antes de regravar o arquivo.
+        :param load: Se False, os objetos salvos não são lidos agora; a carga fica para
+                     apply_saved_objects(read_saved_objects()), que pode ler o arquivo em segundo plano.
         """
-        self.objects: List[Dict[str, Any]] = []  # Lista para armazenar objetos com metadados
-        self.config_file = "objects.json"  # Arquivo para persistir os dados
-        self.load_saved_objects()  # Carrega os objetos salvos
+        self.store = ObjectStore()  # Armazenamento colunar com IDs estáveis e índice por tipo
+        self.config_file = config_file  # Arquivo para persistir os dados
+        self.journal_file = config_file + ".journal"  # Alterações ainda não consolidadas no arquivo
+        self.journal_consolidando = self.journal_file + ".old"  # Journal posto de lado durante a gravação
+        self.binary = config_file.endswith(".layout")  # Formato binário de layouts
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        self._listeners = []  # Funções chamadas a cada alteração: callback(evento, ids)
+        self.loaded = False  # Até a carga, o arquivo não é regravado (as alterações ficam no journal)
+        self._concluir_gravacao_interrompida()
+        if load:
+            self.load_saved_objects()  # Carrega os objetos salvos
+        atexit.register(_flush_ao_sair, weakref.ref(self))
         logger.info("ObjectManager inicializado com sucesso.")
 
-    def load_saved_objects(self):
+    @property
+    def objects(self) -> ObjectsView:
+        """
+        Visão dos objetos como lista de dicionários {"type": ..., "data": {...}}, em ordem de inserção.
         """
-        Carrega os objetos salvos do arquivo de configuração.
+        return ObjectsView(self.store)
+
+    def add_listener(self, callback):
+        """
+        Registra uma função chamada a cada alteração dos objetos, na thread que fez a alteração.
+        :param callback: Função callback(evento, ids), onde evento é "add", "update", "remove",
+                         "clear" ou "reload" e ids é a lista de IDs afetados (vazia em "clear" e "reload").
         """
-        if os.path.exists(self.config_file):
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Remove uma função registrada com add_listener."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notificar(self, evento: str, ids: List[int]):
+        """Avisa os ouvintes de uma alteração; erros em um ouvinte não afetam os demais."""
+        for callback in list(self._listeners):
             try:
-                with open(self.config_file, "r") as file:
-                    self.objects = json.load(file)
-                    logger.info(f"{len(self.objects)} objetos carregados do arquivo.")
+                callback(evento, ids)
             except Exception as e:
-                logger.error(f"Erro ao carregar objetos salvos: {e}")
+                logger.error("Erro ao notificar alteração de objetos (%s): %s", evento, e)
 
-    def save_objects(self):
+    def load_saved_objects(self):
+        """
+        Carrega os objetos salvos do arquivo de configuração e reaplica o journal pendente.
         """
-        Salva os objetos atuais no arquivo de configuração.
+        self.apply_saved_objects(self.read_saved_objects())
+
+    def read_saved_objects(self):
+        """
+        Lê os objetos salvos sem alterar o gerenciador; pode rodar em uma thread de trabalho.
+        :return: ObjectStore com os objetos do arquivo, ou None se o arquivo não existir ou não puder ser lido.
         """
+        if not os.path.exists(self.config_file):
+            return None
         try:
-            with open(self.config_file, "w") as file:
-                json.dump(self.objects, file, indent=4)
-                logger.info(f"{len(self.objects)} objetos salvos no arquivo.")
+            if is_layout_file(self.config_file):
+                # Mapeia o arquivo: os objetos só são montados quando acessados
+                store = load_layout(self.config_file)
+            else:
+                with open(self.config_file, "r") as file:
+                    # IDs a partir de 1, como no formato binário: recarregar o mesmo arquivo
+                    # reproduz os mesmos IDs, e o renderizador só redesenha o que mudou
+                    store = ObjectStore()
+                    store.extend(json.load(file))
+            logger.info("%d objetos carregados do arquivo.", len(store))
+            return store
         except Exception as e:
-            logger.error(f"Erro ao salvar objetos: {e}")
+            logger.error("Erro ao carregar objetos salvos: %s", e)
+            return None
 
-    def add_object(self, obj_type: str, data: Dict[str, Any]):
+    def apply_saved_objects(self, store):
+        """
+        Passa a usar os objetos lidos por read_saved_objects, reaplica o journal pendente e avisa os ouvintes.
+        Alterações feitas antes da carga estão no journal e são reaplicadas sobre os objetos lidos.
+        :param store: ObjectStore lido, ou None se não havia arquivo.
+        """
+        with self._lock:
+            if store is not None:
+                self.store = store
+            elif not self.loaded:
+                self.store = ObjectStore()  # As alterações anteriores à carga voltam pelo journal
+            aplicadas = self._replay_journal()
+            self.loaded = True
+            if aplicadas:
+                logger.info("%d alterações recuperadas do journal.", aplicadas)
+                self.save_objects()  # Consolida o journal recuperado no arquivo
+        self._notificar("reload", [])
+
+    def _concluir_gravacao_interrompida(self):
+        """
+        Resolve uma gravação interrompida entre pôr o journal de lado e removê-lo (ver save_objects).
+        Se o arquivo temporário ainda existe, a substituição não aconteceu: ele já contém as alterações
+        do journal e é instalado agora. Em ambos os casos o journal posto de lado já está no arquivo e é
+        descartado, sem ser reaplicado.
+        """
+        if not os.path.exists(self.journal_consolidando):
+            return
+        temporario = self.config_file + ".tmp"
+        try:
+            if os.path.exists(temporario):
+                os.replace(temporario, self.config_file)
+                logger.warning("Gravação interrompida de %s concluída na inicialização.", self.config_file)
+            os.remove(self.journal_consolidando)
+        except OSError as e:
+            logger.error("Erro ao concluir a gravação interrompida de objetos: %s", e)
+
+    def _replay_journal(self) -> int:
+        """
+        Reaplica as alterações registradas no journal depois da última gravação do arquivo.
+        Uma última linha incompleta (gravação interrompida) é descartada.
+        :return: Número de alterações aplicadas.
+        """
+        if not os.path.exists(self.journal_file):
+            return 0
+        aplicadas = 0
+        try:
+            with open(self.journal_file, "r") as file:
+                for linha in file:
+                    try:
+                        entrada = json.loads(linha)
+                    except ValueError:
+                        logger.warning("Entrada incompleta ignorada no journal %s.", self.journal_file)
+                        break
+                    self._aplicar(entrada)
+                    aplicadas += 1
+        except Exception as e:
+            logger.error("Erro ao ler o journal de objetos: %s", e)
+        return aplicadas
+
+    def _aplicar(self, entrada: Dict[str, Any]):
+        """
+        Aplica uma entrada do journal à lista de objetos.
+        :param entrada: Dicionário {"op": "add" | "update" | "remove" | "clear", ...}.
+        """
+        if entrada["op"] == "add":
+            self.store.extend(entrada["objects"])
+        elif entrada["op"] == "update":
+            if 0 <= entrada["index"] < len(self.store):
+                self.store.update(self.store.id_at(entrada["index"]), entrada["data"])
+        elif entrada["op"] == "remove":
+            if 0 <= entrada["index"] < len(self.store):
+                self.store.remove_at(entrada["index"])
+        elif entrada["op"] == "clear":
+            self.store.clear()
+
+    def _registrar(self, entrada: Dict[str, Any]):
+        """
+        Registra uma alteração: anexa ao journal e agenda a regravação do arquivo (write-behind),
+        ou regrava o arquivo imediatamente quando o write-behind está desligado e os objetos já foram carregados.
+        :param entrada: Entrada do journal descrevendo a alteração.
+        """
+        if not self.write_behind and self.loaded:
+            self.save_objects()
+            return
+        try:
+            with open(self.journal_file, "a") as file:
+                file.write(json.dumps(entrada, separators=(",", ":")) + "\n")
+        except Exception as e:
+            logger.error("Erro ao gravar o journal de objetos: %s", e)
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """
+        Grava as alterações pendentes no arquivo, se houver, e cancela a gravação agendada.
+        Chamado pelo temporizador, no encerramento da aplicação ou manualmente.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._dirty and self.loaded:
+                self.save_objects()
+
+    def save_objects(self):
+        """
+        Salva os objetos atuais no arquivo de configuração de forma atômica (arquivo temporário + rename)
+        e descarta o journal, cujas alterações passam a estar no arquivo.
+        O journal é posto de lado antes da substituição e removido depois dela: uma queda no meio nunca
+        deixa um journal ativo sobre um arquivo que já contém as suas alterações (reaplicá-lo duplicaria
+        as adições e aplicaria as remoções por índice nos objetos errados).
+        """
+        with self._lock:
+            temporario = self.config_file + ".tmp"
+            try:
+                if self.binary:
+                    save_layout(self.store, temporario)
+                    self.store.materializar()  # Solta o arquivo mapeado antes de substituí-lo
+                else:
+                    with open(temporario, "w") as file:
+                        json.dump(self.store.to_list(), file, separators=(",", ":"))
+                        file.flush()
+                        os.fsync(file.fileno())
+                if os.path.exists(self.journal_file):
+                    os.replace(self.journal_file, self.journal_consolidando)
+                os.replace(temporario, self.config_file)
+                if os.path.exists(self.journal_consolidando):
+                    os.remove(self.journal_consolidando)
+                self._dirty = False
+                logger.info("%d objetos salvos no arquivo.", len(self.store))
+            except Exception as e:
+                logger.error("Erro ao salvar objetos: %s", e)
+
+    def add_object(self, obj_type: str, data: Dict[str, Any]) -> int:
         """
         Adiciona um novo objeto à lista.
         :param obj_type: Tipo do objeto (ex.: "rectangle", "circle", "polygon").
         :param data: Dados do objeto (ex.: dimensões, coordenadas).
+        :return: ID estável do objeto.
         """
         obj = {"type": obj_type, "data": data}
-        self.objects.append(obj)
-        self.save_objects()
-        logger.info(f"Objeto adicionado: tipo={obj_type}, dados={data}")
+        with self._lock:
+            obj_id = self.store.add(obj_type, data)
+            self._registrar({"op": "add", "objects": [obj]})
+        logger.debug("Objeto adicionado: id=%d, tipo=%s, dados=%s", obj_id, obj_type, data)
+        self._notificar("add", [obj_id])
+        return obj_id
+
+    def add_objects(self, obj_type: str, datas: List[Dict[str, Any]]) -> List[int]:
+        """
+        Adiciona vários objetos do mesmo tipo com uma única entrada no journal (ex.: peças aninhadas).
+        :param obj_type: Tipo dos objetos.
+        :param datas: Lista com os dados de cada objeto.
+        :return: Lista com os IDs estáveis dos objetos.
+        """
+        novos = [{"type": obj_type, "data": data} for data in datas]
+        if not novos:
+            return []
+        with self._lock:
+            ids = self.store.extend(novos)
+            self._registrar({"op": "add", "objects": novos})
+        logger.info("%d objetos adicionados: tipo=%s", len(novos), obj_type)
+        self._notificar("add", ids)
+        return ids
+
+    def update_object(self, obj_id: int, data: Dict[str, Any]):
+        """
+        Substitui os dados de um objeto, mantendo o ID e o tipo.
+        :param obj_id: ID do objeto.
+        :param data: Novos dados do objeto.
+        """
+        with self._lock:
+            if obj_id not in self.store:
+                logger.error("ID inválido para atualização: %s", obj_id)
+                return
+            index = self.store.index_of(obj_id)  # Posição na ordem, para o journal
+            self.store.update(obj_id, data)
+            self._registrar({"op": "update", "index": index, "data": data})
+        logger.debug("Objeto atualizado: id=%d, dados=%s", obj_id, data)
+        self._notificar("update", [obj_id])
 
     def remove_object(self, index: int):
         """
         Remove um objeto da lista pelo índice.
         :param index: Índice do objeto a ser removido.
         """
-        if 0 <= index < len(self.objects):
-            removed_obj = self.objects.pop(index)
-            self.save_objects()
-            logger.info(f"Objeto removido: {removed_obj}")
-        else:
-            logger.error(f"Índice inválido para remoção: {index}")
+        with self._lock:
+            if not 0 <= index < len(self.store):
+                logger.error("Índice inválido para remoção: %s", index)
+                return
+            obj_id = self.store.id_at(index)
+            removed_obj = self.store.remove(obj_id)
+            self._registrar({"op": "remove", "index": index})
+            logger.debug("Objeto removido: %s", removed_obj)
+        self._notificar("remove", [obj_id])
+
+    def remove_object_by_id(self, obj_id: int):
+        """
+        Remove um objeto pelo ID estável; o ID e a posição na ordem são localizados em O(log n).
+        :param obj_id: ID do objeto a ser removido.
+        """
+        with self._lock:
+            if obj_id not in self.store:
+                logger.error("ID inválido para remoção: %s", obj_id)
+                return
+            index = self.store.index_of(obj_id)  # Posição na ordem, para o journal
+            removed_obj = self.store.remove(obj_id)
+            self._registrar({"op": "remove", "index": index})
+            logger.debug("Objeto removido: %s", removed_obj)
+        self._notificar("remove", [obj_id])
+
+    def get_object(self, obj_id: int) -> Dict[str, Any]:
+        """
+        Retorna um objeto pelo ID estável.
+        :param obj_id: ID do objeto.
+        :return: Dicionário {"type": ..., "data": {...}}.
+        """
+        return self.store.get(obj_id)
 
     def clear_objects(self):
         """
         Limpa todos os objetos da lista.
         """
-        self.objects.clear()
-        self.save_objects()
+        with self._lock:
+            self.store.clear()
+            self._registrar({"op": "clear"})
         logger.info("Todos os objetos foram removidos.")
+        self._notificar("clear", [])
 
-    def get_objects(self) -> List[Dict[str, Any]]:
+    def get_objects(self) -> ObjectsView:
         """
         Retorna a lista de objetos.
-        :return: Lista de objetos.
+        :return: Visão dos objetos como lista de dicionários.
         """
         return self.objects
 
@@ -83,7 +352,7 @@ class ObjectManager:
         Retorna o número total de objetos.
         :return: Contagem de objetos.
         """
-        return len(self.objects)
+        return len(self.store)
 
     def get_object_by_type(self, obj_type: str) -> List[Dict[str, Any]]:
         """
@@ -91,13 +360,19 @@ class ObjectManager:
         :param obj_type: Tipo de objeto a ser filtrado.
         :return: Lista de objetos do tipo especificado.
         """
-        return [obj for obj in self.objects if obj["type"] == obj_type]
+        return [self.store.get(int(obj_id)) for obj_id in self.store.ids(obj_type)]
+
+    def get_columns(self, obj_type: str) -> Dict[str, Any]:
+        """
+        Retorna as colunas numéricas dos objetos de um tipo (ex.: "x", "y", "radius") como arrays NumPy.
+        :param obj_type: Tipo de objeto.
+        :return: Dicionário {"id": ids, campo: valores, ...}.
+        """
+        return self.store.columns(obj_type)
 
     def render_objects(self, renderer):
         """
         Renderiza todos os objetos usando o renderizador fornecido.
         :param renderer: Instância do renderizador.
         """
-        for obj in self.objects:
-            renderer.render(obj)
-            logger.info(f"Renderizando objeto: {obj}")
\ No newline at end of file
+        renderer.render()
@@ -0,0 +1,524 @@
+from collections.abc import Sequence
+from numbers import Integral, Real
+from typing import Any, Dict, Iterable, List
+import numpy as np
+
+# Capacidade inicial dos buffers; dobra a cada crescimento
+CAPACIDADE_INICIAL = 64
+# A compactação roda quando há ao menos este número de lápides e elas passam de 25% das linhas
+COMPACTAR_MINIMO = 256
+# Maior inteiro representado sem perda em float64; inteiros maiores ficam nos extras
+MAIOR_INTEIRO_EXATO = 2 ** 53
+
+
+def _numerico(valor) -> bool:
+    """Indica se o valor pode ir para uma coluna float64 sem perda (bool fica de fora)."""
+    if isinstance(valor, bool) or not isinstance(valor, Real):
+        return False
+    return not isinstance(valor, Integral) or abs(valor) <= MAIOR_INTEIRO_EXATO
+
+
+def _crescer(array: np.ndarray, capacidade: int) -> np.ndarray:
+    """Retorna uma cópia do array com a nova capacidade, preservando o conteúdo."""
+    novo = np.empty(capacidade, dtype=array.dtype)
+    novo[:len(array)] = array
+    return novo
+
+
+def _nova_capacidade(atual: int, necessario: int) -> int:
+    """Dobra a capacidade atual até comportar `necessario` elementos."""
+    capacidade = max(atual, CAPACIDADE_INICIAL)
+    while capacidade < necessario:
+        capacidade *= 2
+    return capacidade
+
+
+class _Lapides:
+    def __init__(self, vivos: np.ndarray, capacidade: int):
+        """
+        Árvore de Fenwick com as lápides da ordem global: conta as posições removidas antes de uma
+        posição e localiza a posição do n-ésimo objeto vivo, ambos em O(log n).
+        :param vivos: Marcação de vivos das posições já ocupadas.
+        :param capacidade: Número de posições cobertas pela árvore.
+        """
+        self.n = capacidade
+        self.arvore = [0] * (capacidade + 1)
+        for pos in np.flatnonzero(~vivos):
+            self.arvore[pos + 1] = 1
+        for i in range(1, capacidade + 1):  # Construção em O(n)
+            pai = i + (i & -i)
+            if pai <= capacidade:
+                self.arvore[pai] += self.arvore[i]
+
+    def marcar(self, pos: int):
+        """Registra a lápide da posição `pos`."""
+        i = pos + 1
+        while i <= self.n:
+            self.arvore[i] += 1
+            i += i & -i
+
+    def antes(self, pos: int) -> int:
+        """Número de lápides nas posições [0, pos)."""
+        total = 0
+        while pos > 0:
+            total += self.arvore[pos]
+            pos -= pos & -pos
+        return total
+
+    def posicao(self, indice: int) -> int:
+        """Posição do objeto vivo de índice `indice` (o índice deve ser válido)."""
+        pos = 0
+        restantes = indice + 1
+        passo = 1 << (self.n.bit_length() - 1)
+        while passo:
+            proxima = pos + passo
+            if proxima <= self.n:
+                vivos = passo - self.arvore[proxima]
+                if vivos < restantes:
+                    pos = proxima
+                    restantes -= vivos
+            passo >>= 1
+        return pos
+
+
+class _TypeTable:
+    def __init__(self, obj_type: str):
+        """
+        Tabela colunar com os objetos de um tipo.
+        Os campos numéricos do primeiro objeto definem as colunas float64; os demais campos
+        (listas de pontos, textos, etc.) ficam em um dicionário de extras por linha. A forma de cada
+        linha guarda a ordem original dos campos e quais valores eram inteiros, para que o dicionário
+        reconstruído seja igual ao original.
+        :param obj_type: Tipo dos objetos da tabela.
+        """
+        self.type = obj_type
+        self.fields = None
+        self.columns: Dict[str, np.ndarray] = {}
+        self.ids = np.empty(CAPACIDADE_INICIAL, dtype=np.int64)
+        self.alive = np.empty(CAPACIDADE_INICIAL, dtype=bool)
+        self._extras: List[Any] = []  # Por linha: dicionário de campos não colunares, ou None
+        self._formas: List[Any] = []  # Por linha: tupla ((campo, "f" | "i" | "e"), ...) na ordem original
+        self._formas_unicas: Dict[Any, Any] = {}  # Linhas com a mesma forma compartilham a tupla
+        self._carregar_extras = None  # Carregamento adiado dos extras (tabelas vindas de um arquivo de layout)
+        self.size = 0
+        self.dead = 0
+
+    @classmethod
+    def from_arrays(cls, obj_type: str, fields, ids: np.ndarray, columns: Dict[str, np.ndarray], carregar_extras):
+        """
+        Cria uma tabela sobre arrays já existentes (ex.: mapeados em memória), sem copiá-los.
+        Os arrays só são copiados na primeira alteração que precise escrever neles.
+        :param carregar_extras: Função sem argumentos que retorna (extras, formas), chamada no primeiro acesso.
+        """
+        tabela = cls(obj_type)
+        tabela.fields = tuple(fields)
+        tabela.ids = ids
+        tabela.columns = dict(columns)
+        tabela.alive = np.ones(len(ids), dtype=bool)
+        tabela.size = len(ids)
+        tabela._carregar_extras = carregar_extras
+        return tabela
+
+    def _garantir_extras(self):
+        if self._carregar_extras is not None:
+            self._extras, self._formas = self._carregar_extras()
+            self._carregar_extras = None
+
+    @property
+    def extras(self) -> List[Any]:
+        self._garantir_extras()
+        return self._extras
+
+    @property
+    def formas(self) -> List[Any]:
+        self._garantir_extras()
+        return self._formas
+
+    def materializar(self):
+        """Copia para a memória os arrays que ainda apontam para um arquivo mapeado."""
+        self._garantir_extras()
+        if not self.ids.flags.writeable:
+            self.ids = self.ids.copy()
+        for campo, coluna in self.columns.items():
+            if not coluna.flags.writeable:
+                self.columns[campo] = coluna.copy()
+
+    def _garantir_capacidade(self, extra: int):
+        necessario = self.size + extra
+        if necessario <= len(self.ids):
+            return
+        capacidade = _nova_capacidade(len(self.ids), necessario)
+        self.ids = _crescer(self.ids, capacidade)
+        self.alive = _crescer(self.alive, capacidade)
+        for campo, coluna in self.columns.items():
+            self.columns[campo] = _crescer(coluna, capacidade)
+
+    def append(self, obj_id: int, data: Dict[str, Any]) -> int:
+        """
+        Anexa um objeto à tabela.
+        :param obj_id: ID estável do objeto.
+        :param data: Dados do objeto.
+        :return: Linha ocupada pelo objeto.
+        """
+        if not isinstance(data, dict):
+            raise TypeError(f"Os dados do objeto devem ser um dicionário, não {type(data).__name__}.")
+        if self.fields is None:
+            self.fields = tuple(campo for campo, valor in data.items() if _numerico(valor))
+            self.columns = {campo: np.empty(len(self.ids), dtype=np.float64) for campo in self.fields}
+        self._garantir_capacidade(1)
+        linha = self.size
+        extras, forma = self._gravar(linha, data)
+        self.ids[linha] = obj_id
+        self.alive[linha] = True
+        self.extras.append(extras)
+        self.formas.append(forma)
+        self.size += 1
+        return linha
+
+    def update(self, linha: int, data: Dict[str, Any]):
+        """
+        Substitui os dados de uma linha (mesmas regras de append para colunas e extras).
+        :param linha: Linha do objeto.
+        :param data: Novos dados do objeto.
+        """
+        if not isinstance(data, dict):
+            raise TypeError(f"Os dados do objeto devem ser um dicionário, não {type(data).__name__}.")
+        self.materializar()
+        self._extras[linha], self._formas[linha] = self._gravar(linha, data)
+
+    def _gravar(self, linha: int, data: Dict[str, Any]):
+        """
+        Grava os campos numéricos de `data` nas colunas da linha; as colunas sem valor numérico ficam NaN.
+        :return: Tupla (extras, forma) da linha; extras é None quando vazio.
+        """
+        extras = {}
+        forma = []
+        for campo, valor in data.items():
+            if campo in self.columns and _numerico(valor):
+                self.columns[campo][linha] = valor
+                forma.append((campo, "i" if isinstance(valor, Integral) else "f"))
+            else:
+                extras[campo] = valor
+                forma.append((campo, "e"))
+        for campo, coluna in self.columns.items():
+            if campo not in data or campo in extras:
+                coluna[linha] = np.nan
+        forma = tuple(forma)
+        return extras or None, self._formas_unicas.setdefault(forma, forma)
+
+    def row_of(self, obj_id: int) -> int:
+        """Localiza a linha de um ID por busca binária (os IDs crescem na ordem de inserção)."""
+        linha = int(np.searchsorted(self.ids[:self.size], obj_id))
+        if linha < self.size and self.ids[linha] == obj_id and self.alive[linha]:
+            return linha
+        raise KeyError(obj_id)
+
+    def data(self, linha: int) -> Dict[str, Any]:
+        """Reconstrói o dicionário de dados de uma linha, na ordem e com os tipos originais."""
+        extras = self.extras[linha]
+        data = {}
+        for campo, tipo in self.formas[linha]:
+            if tipo == "e":
+                data[campo] = extras[campo]
+            elif tipo == "i":
+                data[campo] = int(self.columns[campo][linha])
+            else:
+                data[campo] = float(self.columns[campo][linha])
+        return data
+
+    def kill(self, linha: int):
+        """Marca a linha como removida (lápide)."""
+        self.alive[linha] = False
+        self.dead += 1
+
+    def compact(self):
+        """Remove as lápides, preservando a ordem das linhas vivas."""
+        if not self.dead:
+            return
+        self.materializar()
+        manter = np.flatnonzero(self.alive[:self.size])
+        n = len(manter)
+        self.ids[:n] = self.ids[manter]
+        self.alive[:n] = True
+        for coluna in self.columns.values():
+            coluna[:n] = coluna[manter]
+        self._extras = [self._extras[i] for i in manter]
+        self._formas = [self._formas[i] for i in manter]
+        self.size = n
+        self.dead = 0
+
+    def live_ids(self) -> np.ndarray:
+        return self.ids[:self.size][self.alive[:self.size]]
+
+
+class ObjectStore:
+    def __init__(self):
+        """
+        Armazenamento colunar de objetos com IDs estáveis.
+        Cada tipo tem sua própria tabela com buffers NumPy; a ordem global de inserção fica em um
+        array de IDs com marcação de lápides, o que torna a remoção O(1) até a próxima compactação.
+        As lápides são contadas por uma árvore de Fenwick, de modo que converter entre ID e índice
+        na ordem de inserção custa O(log n) mesmo antes da compactação.
+        """
+        self._tables: Dict[str, _TypeTable] = {}
+        self._type_names: List[str] = []
+        self._order = np.empty(CAPACIDADE_INICIAL, dtype=np.int64)
+        self._order_type = np.empty(CAPACIDADE_INICIAL, dtype=np.int32)
+        self._order_alive = np.empty(CAPACIDADE_INICIAL, dtype=bool)
+        self._size = 0
+        self._dead = 0
+        self._lapides = None  # _Lapides, criada na primeira remoção e descartada na compactação
+        self._next_id = 1
+
+    @classmethod
+    def from_arrays(cls, type_names, order: np.ndarray, order_type: np.ndarray, tables, next_id: int):
+        """
+        Cria um armazenamento sobre arrays já existentes (ex.: mapeados de um arquivo de layout).
+        :param type_names: Nomes dos tipos, na ordem dos códigos de `order_type`.
+        :param order: IDs em ordem de inserção.
+        :param order_type: Código do tipo de cada ID.
+        :param tables: Lista de _TypeTable criadas com _TypeTable.from_arrays.
+        :param next_id: Próximo ID a atribuir.
+        """
+        store = cls()
+        store._type_names = list(type_names)
+        store._tables = {tabela.type: tabela for tabela in tables}
+        store._order = order
+        store._order_type = order_type
+        store._order_alive = np.ones(len(order), dtype=bool)
+        store._size = len(order)
+        store._next_id = next_id
+        return store
+
+    def materializar(self):
+        """
+        Copia para a memória todos os arrays ainda mapeados de um arquivo, liberando o arquivo
+        (necessário, por exemplo, antes de sobrescrevê-lo).
+        """
+        if not self._order.flags.writeable:
+            self._order = self._order.copy()
+        if not self._order_type.flags.writeable:
+            self._order_type = self._order_type.copy()
+        for tabela in self._tables.values():
+            tabela.materializar()
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    def __contains__(self, obj_id) -> bool:
+        return self._posicao(obj_id) is not None
+
+    def __iter__(self):
+        for obj_id in self.ids():
+            yield self.get(int(obj_id))
+
+    def _posicao(self, obj_id):
+        """Posição de um ID vivo na ordem global (busca binária), ou None."""
+        pos = int(np.searchsorted(self._order[:self._size], obj_id))
+        if pos < self._size and self._order[pos] == obj_id and self._order_alive[pos]:
+            return pos
+        return None
+
+    def _tabela(self, obj_type: str) -> _TypeTable:
+        if obj_type not in self._tables:
+            self._tables[obj_type] = _TypeTable(obj_type)
+            self._type_names.append(obj_type)
+        return self._tables[obj_type]
+
+    def _garantir_capacidade(self, extra: int):
+        necessario = self._size + extra
+        if necessario <= len(self._order):
+            return
+        capacidade = _nova_capacidade(len(self._order), necessario)
+        self._order = _crescer(self._order, capacidade)
+        self._order_type = _crescer(self._order_type, capacidade)
+        self._order_alive = _crescer(self._order_alive, capacidade)
+        if self._lapides is not None:
+            self._lapides = _Lapides(self._order_alive[:self._size], capacidade)
+
+    def add(self, obj_type: str, data: Dict[str, Any]) -> int:
+        """
+        Adiciona um objeto.
+        :param obj_type: Tipo do objeto (ex.: "rectangle", "circle", "polygon").
+        :param data: Dados do objeto.
+        :return: ID estável atribuído ao objeto.
+        """
+        tabela = self._tabela(obj_type)
+        obj_id = self._next_id
+        tabela.append(obj_id, data)
+        self._garantir_capacidade(1)
+        self._order[self._size] = obj_id
+        self._order_type[self._size] = self._type_names.index(obj_type)
+        self._order_alive[self._size] = True
+        self._size += 1
+        self._next_id += 1
+        return obj_id
+
+    def extend(self, objs: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Adiciona vários objetos no formato {"type": ..., "data": {...}}.
+        :return: Lista com os IDs atribuídos.
+        """
+        objs = list(objs)
+        self._garantir_capacidade(len(objs))
+        return [self.add(obj["type"], obj["data"]) for obj in objs]
+
+    def get(self, obj_id: int) -> Dict[str, Any]:
+        """
+        Retorna um objeto no formato {"type": ..., "data": {...}}.
+        :raises KeyError: Se o ID não existir.
+        """
+        pos = self._posicao(obj_id)
+        if pos is None:
+            raise KeyError(obj_id)
+        tabela = self._tables[self._type_names[self._order_type[pos]]]
+        return {"type": tabela.type, "data": tabela.data(tabela.row_of(obj_id))}
+
+    def id_at(self, index: int) -> int:
+        """
+        Retorna o ID do objeto na posição `index` da ordem de inserção.
+        :raises IndexError: Se o índice for inválido.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        if not self._dead:
+            return int(self._order[index])
+        return int(self._order[self._lapides.posicao(index)])
+
+    def index_of(self, obj_id: int) -> int:
+        """
+        Retorna a posição do objeto na ordem de inserção (o inverso de id_at), em O(log n).
+        :raises KeyError: Se o ID não existir.
+        """
+        pos = self._posicao(obj_id)
+        if pos is None:
+            raise KeyError(obj_id)
+        return pos - self._lapides.antes(pos) if self._dead else pos
+
+    def remove(self, obj_id: int) -> Dict[str, Any]:
+        """
+        Remove um objeto pelo ID, marcando lápides na ordem global e na tabela do tipo.
+        :return: O objeto removido.
+        :raises KeyError: Se o ID não existir.
+        """
+        obj = self.get(obj_id)
+        pos = self._posicao(obj_id)
+        tabela = self._tables[obj["type"]]
+        tabela.kill(tabela.row_of(obj_id))
+        self._order_alive[pos] = False
+        if self._lapides is None:
+            self._lapides = _Lapides(self._order_alive[:self._size], len(self._order))
+        else:
+            self._lapides.marcar(pos)
+        self._dead += 1
+        if self._dead >= COMPACTAR_MINIMO and self._dead * 4 > self._size:
+            self.compact()
+        return obj
+
+    def update(self, obj_id: int, data: Dict[str, Any]):
+        """
+        Substitui os dados de um objeto, mantendo o ID, o tipo e a posição na ordem de inserção.
+        :raises KeyError: Se o ID não existir.
+        """
+        pos = self._posicao(obj_id)
+        if pos is None:
+            raise KeyError(obj_id)
+        tabela = self._tables[self._type_names[self._order_type[pos]]]
+        tabela.update(tabela.row_of(obj_id), data)
+
+    def remove_at(self, index: int) -> Dict[str, Any]:
+        """Remove o objeto na posição `index` da ordem de inserção."""
+        return self.remove(self.id_at(index))
+
+    def clear(self):
+        """Remove todos os objetos (os IDs continuam crescendo, nunca são reutilizados)."""
+        self._tables.clear()
+        self._type_names.clear()
+        # Buffers novos: os atuais podem estar mapeados de um arquivo de layout (somente leitura)
+        self._order = np.empty(CAPACIDADE_INICIAL, dtype=np.int64)
+        self._order_type = np.empty(CAPACIDADE_INICIAL, dtype=np.int32)
+        self._order_alive = np.empty(CAPACIDADE_INICIAL, dtype=bool)
+        self._size = 0
+        self._dead = 0
+        self._lapides = None
+
+    def compact(self):
+        """Descarta as lápides da ordem global e de todas as tabelas."""
+        if self._dead:
+            self.materializar()
+            manter = np.flatnonzero(self._order_alive[:self._size])
+            n = len(manter)
+            self._order[:n] = self._order[manter]
+            self._order_type[:n] = self._order_type[manter]
+            self._order_alive[:n] = True
+            self._size = n
+            self._dead = 0
+            self._lapides = None
+        for tabela in self._tables.values():
+            tabela.compact()
+
+    def ids(self, obj_type: str = None) -> np.ndarray:
+        """
+        Retorna os IDs vivos em ordem de inserção, opcionalmente apenas de um tipo (pelo índice de tipos).
+        :param obj_type: Tipo a filtrar, ou None para todos.
+        :return: Array int64 de IDs.
+        """
+        if obj_type is not None:
+            tabela = self._tables.get(obj_type)
+            return tabela.live_ids() if tabela else np.empty(0, dtype=np.int64)
+        return self._order[:self._size][self._order_alive[:self._size]]
+
+    def types(self) -> List[str]:
+        """Retorna os tipos com ao menos um objeto vivo."""
+        return [nome for nome, tabela in self._tables.items() if tabela.size > tabela.dead]
+
+    def columns(self, obj_type: str) -> Dict[str, np.ndarray]:
+        """
+        Retorna as colunas numéricas dos objetos vivos de um tipo, para cálculos vetorizados.
+        :param obj_type: Tipo dos objetos.
+        :return: Dicionário {"id": ids, campo: valores, ...} (somente para leitura); campos ausentes valem NaN.
+        """
+        tabela = self._tables.get(obj_type)
+        if tabela is None:
+            return {"id": np.empty(0, dtype=np.int64)}
+        # Sem lápides, retorna visões diretas dos buffers (sem cópia); com lápides, filtra as linhas vivas
+        vivos = slice(None) if not tabela.dead else tabela.alive[:tabela.size]
+        resultado = {"id": tabela.ids[:tabela.size][vivos]}
+        for campo, coluna in tabela.columns.items():
+            resultado[campo] = coluna[:tabela.size][vivos]
+        return resultado
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materializa todos os objetos como lista de dicionários (ex.: para gravar em JSON)."""
+        return list(self)
+
+
+class ObjectsView(Sequence):
+    def __init__(self, store: ObjectStore):
+        """
+        Visão somente leitura do ObjectStore com a interface de uma lista de dicionários
+        {"type": ..., "data": {...}}, para os chamadores que ainda usam o formato antigo.
+        :param store: Armazenamento de objetos.
+        """
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._store.get(int(obj_id)) for obj_id in self._store.ids()[index]]
+        if index < 0:
+            index += len(self._store)
+        return self._store.get(self._store.id_at(index))
+
+    def __iter__(self):
+        return iter(self._store)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, ObjectsView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ObjectsView({len(self)} objetos)"
@@ -1,12 +1,15 @@
-from PyQt5.QtWidgets import QGraphicsPolygonItem, QGraphicsEllipseItem
+from PyQt5.QtWidgets import QGraphicsPolygonItem
 from PyQt5.QtGui import QPolygonF, QPen, QBrush, QColor
 from PyQt5.QtCore import Qt, QObject, QPointF
 import logging
+from logic.vertex_index import VertexIndex
+from logic.geometry import canvas_sobra_area
+from logic.vertex_editing import VERTEX_RADIUS, VertexDragMixin, pick_radius, vertex_handle
 
 # Configurar logger
 logger = logging.getLogger("app_logger")
 
-class PolygonLogic(QObject):
+class PolygonLogic(VertexDragMixin, QObject):
     def __init__(self, canvas, toolbar):
         """
         Inicializa a lógica de criação de polígonos.
@@ -19,7 +22,10 @@ class PolygonLogic(QObject):
         self.points = []  # Lista para armazenar os pontos do polígono
         self.current_polygon = None  # Armazena o polígono atual em construção
         self.vertex_circles = []  # Lista para armazenar os círculos que representam os vértices
+        self.vertex_index = VertexIndex(cell_size=VERTEX_RADIUS * 2)  # Índice espacial para selecionar vértices
+        self.init_vertex_drag()  # Arraste dos vértices agrupado por quadro
         self.pen = QPen(Qt.black)  # Define a cor da borda do polígono
+        self.pen.setCosmetic(True)  # Espessura constante na tela, independente do zoom
         self.brush = QBrush(QColor(255, 255, 0, 128))  # Preenchimento amarelo com 50% de transparência
         self.is_finalized = False  # Indica se o polígono foi finalizado
         self.edit_mode = False  # Indica se o modo de edição está ativado
@@ -67,7 +73,7 @@ class PolygonLogic(QObject):
                 rect = self.canvas.current_rectangle.rect()
                 pos = self.adjust_point_to_rectangle(pos, rect)
             self.points.append(pos)
-            logger.info(f"Ponto adicionado: ({pos.x()}, {pos.y()})")
+            logger.info("Ponto adicionado: (%s, %s)", pos.x(), pos.y())
             # Desenha o polígono temporário apenas se houver mais de um ponto
             if len(self.points) > 1:
                 if self.current_polygon:
@@ -85,20 +91,20 @@ class PolygonLogic(QObject):
         """
         if event.type() == event.GraphicsSceneMousePress:
             pos = event.scenePos()
-            for i, circle in enumerate(self.vertex_circles):
-                if circle.contains(pos):
-                    self.selected_vertex_index = i
-                    logger.info(f"Vértice selecionado para edição: índice {i}")
-                    return True
+            i = self.vertex_index.nearest(pos, pick_radius(self.canvas))
+            if i is not None:
+                self.selected_vertex_index = i
+                logger.info("Vértice selecionado para edição: índice %d", i)
+                return True
         elif event.type() == event.GraphicsSceneMouseMove and hasattr(self, "selected_vertex_index"):
             pos = event.scenePos()
-            self.points[self.selected_vertex_index] = pos
-            self.update_polygon()
-            logger.info(f"Vértice editado: índice {self.selected_vertex_index}, nova posição ({pos.x()}, {pos.y()})")
+            self.queue_vertex_move(self.selected_vertex_index, pos)
         elif event.type() == event.GraphicsSceneMouseRelease:
             if hasattr(self, "selected_vertex_index"):
+                self.apply_pending_move()
+                pos = self.points[self.selected_vertex_index]
+                logger.info("Edição de vértice concluída: índice %d, nova posição (%s, %s)", self.selected_vertex_index, pos.x(), pos.y())
                 del self.selected_vertex_index
-                logger.info("Edição de vértice concluída.")
         return super(PolygonLogic, self).eventFilter(obj, event)
 
     def adjust_point_to_rectangle(self, point, rect):
@@ -120,14 +126,18 @@ class PolygonLogic(QObject):
             logger.error("Polígono inválido: são necessários pelo menos 3 pontos.")
             self.cancel_polygon_creation()
             return
+        # Calcula a área da sobra em milímetros reais, recortada pela chapa
+        try:
+            sobra = canvas_sobra_area(self.canvas, self.points)
+        except ValueError as e:
+            logger.error("%s Ajuste os pontos ou cancele a demarcação.", e)
+            return
         logger.info("Polígono finalizado com sucesso.")
         self.canvas.scene.removeEventFilter(self)  # Remove o filtro de eventos
         self.is_finalized = True  # Marca o polígono como finalizado
-        # Calcula a área do polígono
-        polygon_area = self.calculate_polygon_area(self.points)
-        logger.info(f"Área do polígono calculada: {polygon_area:.2f} m²")
+        logger.info("Área da sobra calculada: %.2f m²", sobra)
         # Atualiza o campo "Sobra" na toolbar
-        self.toolbar.update_sobra(polygon_area)
+        self.toolbar.update_sobra(sobra)
         self.points.clear()
 
     def edit_polygon(self):
@@ -140,7 +150,9 @@ class PolygonLogic(QObject):
         logger.info("Modo de edição de polígono ativado.")
         self.edit_mode = True
         self.canvas.scene.installEventFilter(self)
+        self.points = list(self.current_polygon.polygon())  # Os pontos são descartados ao finalizar
         self.draw_vertex_circles()
+        self.vertex_index.rebuild(self.points)
 
     def draw_vertex_circles(self):
         """
@@ -149,12 +161,10 @@ class PolygonLogic(QObject):
         self.vertex_circles.clear()
         polygon = self.current_polygon.polygon()
         for point in polygon:
-            circle = QGraphicsEllipseItem(point.x() - 5, point.y() - 5, 10, 10)
-            circle.setPen(QPen(Qt.red))
-            circle.setBrush(QBrush(Qt.red))
+            circle = vertex_handle(point, Qt.red)
             self.canvas.scene.addItem(circle)
             self.vertex_circles.append(circle)
-            logger.info(f"Círculo de edição adicionado no vértice ({point.x()}, {point.y()})")
+        logger.info("%d círculos de edição adicionados.", len(self.vertex_circles))
 
     def update_polygon(self):
         """
@@ -177,21 +187,6 @@ class PolygonLogic(QObject):
         self.vertex_circles.clear()
         logger.info("Círculos de edição removidos.")
 
-    def calculate_polygon_area(self, points):
-        """
-        Calcula a área de um polígono usando a fórmula do determinante.
-        :param points: Lista de pontos (QPointF) que formam o polígono.
-        :return: Área do polígono em metros quadrados.
-        """
-        n = len(points)
-        area = 0.0
-        for i in range(n):
-            j = (i + 1) % n
-            area += points[i].x() * points[j].y()
-            area -= points[j].x() * points[i].y()
-        area = abs(area) / 2.0
-        return area / 1e6  # Converte de mm² para m²
-
     def cancel_polygon_creation(self):
         """
         Cancela a criação do polígono atual.
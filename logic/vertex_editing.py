@@ -0,0 +1,121 @@
+from PyQt5.QtWidgets import QApplication, QGraphicsEllipseItem, QGraphicsItem
+from PyQt5.QtGui import QPen, QBrush
+from PyQt5.QtCore import QTimer
+import logging
+from logic.geometry import canvas_sobra_area
+from utils.logger import log_sampled
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+# Raio dos círculos de edição dos vértices em pixels de tela, usado também como raio de seleção
+VERTEX_RADIUS = 5
+
+
+def frame_interval_ms():
+    """
+    Retorna o intervalo entre quadros da tela principal, usado para agrupar os movimentos do mouse.
+    :return: Intervalo em milissegundos (60 Hz se a taxa de atualização não estiver disponível).
+    """
+    screen = QApplication.primaryScreen()
+    refresh_rate = screen.refreshRate() if screen else 0
+    return max(1, int(1000 / (refresh_rate if refresh_rate > 0 else 60)))
+
+
+def vertex_handle(point, color, radius=VERTEX_RADIUS):
+    """
+    Cria o círculo de edição de um vértice, com tamanho fixo na tela em qualquer zoom.
+    :param point: Posição do vértice na cena (QPointF).
+    :param color: Cor da borda e do preenchimento.
+    :param radius: Raio em pixels de tela.
+    :return: QGraphicsEllipseItem posicionado no vértice.
+    """
+    circle = QGraphicsEllipseItem(-radius, -radius, radius * 2, radius * 2)
+    circle.setFlag(QGraphicsItem.ItemIgnoresTransformations, True)
+    circle.setPos(point)
+    circle.setPen(QPen(color))
+    circle.setBrush(QBrush(color))
+    return circle
+
+
+def pick_radius(canvas, radius=VERTEX_RADIUS):
+    """
+    Converte o raio de seleção de pixels de tela para unidades da cena, pela escala atual da vista.
+    :param canvas: Canvas onde o polígono é editado.
+    :return: Raio de seleção na cena.
+    """
+    escala = canvas.view_scale()
+    return radius / escala if escala > 0 else radius
+
+
+class VertexDragMixin:
+    """
+    Arraste de vértices compartilhado pelos editores de polígono (QObject com canvas, toolbar, points,
+    vertex_index, current_polygon e vertex_circles): os movimentos do mouse são agrupados por quadro,
+    só o vértice arrastado é alterado no polígono e no índice, e a sobra é recalculada e revalidada.
+    """
+
+    def init_vertex_drag(self):
+        """Cria o temporizador que aplica o arraste uma vez por quadro; chamar no __init__."""
+        self._pending_move = None  # Última posição do arraste, aplicada no próximo quadro
+        self._drag_timer = QTimer(self)  # Agrupa os movimentos do mouse na taxa de atualização da tela
+        self._drag_timer.setSingleShot(True)
+        self._drag_timer.timeout.connect(self.apply_pending_move)
+
+    def queue_vertex_move(self, index, pos):
+        """
+        Guarda a posição do arraste para o próximo quadro; posições anteriores do mesmo quadro são descartadas.
+        :param index: Índice do vértice.
+        :param pos: Nova posição (QPointF).
+        """
+        self._pending_move = (index, pos)
+        if not self._drag_timer.isActive():
+            self._drag_timer.start(frame_interval_ms())
+
+    def apply_pending_move(self):
+        """
+        Aplica a última posição recebida durante o arraste; os movimentos intermediários do mesmo quadro são descartados.
+        """
+        self._drag_timer.stop()
+        if self._pending_move is None:
+            return
+        index, pos = self._pending_move
+        self._pending_move = None
+        self.points[index] = pos
+        self.vertex_index.move(index, pos)
+        self.move_vertex(index, pos)
+        if self.update_sobra_after_edit() is not None:
+            self.vertex_moved(index, pos)
+
+    def update_sobra_after_edit(self):
+        """
+        Recalcula a área da sobra após mover um vértice e a envia à toolbar.
+        Se as arestas passarem a se cruzar, a toolbar mantém a última área válida até o vértice ser ajustado.
+        :return: Área da sobra em m², ou None se o polígono ficou inválido.
+        """
+        try:
+            sobra = canvas_sobra_area(self.canvas, self.points)
+        except ValueError as e:
+            log_sampled(logger, logging.WARNING, "sobra_invalida", 1.0, "%s Ajuste os vértices.", e)
+            return None
+        self.toolbar.update_sobra(sobra)
+        return sobra
+
+    def move_vertex(self, index, pos):
+        """
+        Move um único vértice: altera apenas o ponto correspondente do polígono e o seu círculo de edição.
+        :param index: Índice do vértice.
+        :param pos: Nova posição (QPointF).
+        """
+        if not self.current_polygon:
+            return
+        polygon = self.current_polygon.polygon()
+        polygon.replace(index, pos)
+        self.current_polygon.setPolygon(polygon)
+        if index < len(self.vertex_circles):
+            self.vertex_circles[index].setPos(pos)
+        # Chamado a cada quadro do arraste: no máximo um registro a cada meio segundo
+        log_sampled(logger, logging.DEBUG, "move_vertex", 0.5, "Vértice editado: índice %d, nova posição (%s, %s)", index, pos.x(), pos.y())
+
+    def vertex_moved(self, index, pos):
+        """Chamado depois que um vértice arrastado foi aplicado e o polígono continua válido."""
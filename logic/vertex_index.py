@@ -0,0 +1,114 @@
+import math
+
+
+class VertexIndex:
+    def __init__(self, cell_size=10.0):
+        """
+        Índice espacial de vértices em grade uniforme, para selecionar o vértice mais próximo de um clique.
+        Cada célula guarda os índices dos vértices que caem nela; uma consulta só examina as células
+        ao alcance do raio de seleção, em tempo constante esperado, e mover um vértice atualiza
+        apenas as duas células envolvidas. Quando o raio consultado deixa de combinar com a célula
+        (ex.: o raio de seleção na cena muda com o zoom), a grade é refeita para o raio atual.
+        :param cell_size: Lado inicial da célula, na mesma unidade dos pontos (idealmente o dobro do raio de seleção).
+        """
+        if cell_size <= 0:
+            raise ValueError("O tamanho da célula deve ser positivo.")
+        self.cell_size = float(cell_size)
+        self._points = []  # Posição (x, y) de cada vértice, pelo índice
+        self._cells = {}  # (coluna, linha) da célula -> conjunto de índices de vértices
+
+    def __len__(self):
+        return len(self._points)
+
+    def _cell(self, x, y):
+        """Retorna a célula (coluna, linha) que contém o ponto (x, y)."""
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def set_cell_size(self, cell_size):
+        """
+        Troca o lado da célula e redistribui os vértices na nova grade.
+        :param cell_size: Novo lado da célula.
+        """
+        if cell_size <= 0:
+            raise ValueError("O tamanho da célula deve ser positivo.")
+        self.cell_size = float(cell_size)
+        self.rebuild(self._points)
+
+    def rebuild(self, points):
+        """
+        Reconstrói o índice a partir de uma sequência de pontos.
+        :param points: Pontos (QPointF ou tuplas (x, y)); o índice de cada um é sua posição na sequência.
+        """
+        self._points = []
+        self._cells = {}
+        for point in points:
+            self.append(point)
+
+    def append(self, point):
+        """
+        Adiciona um vértice ao final do índice.
+        :param point: QPointF ou tupla (x, y).
+        :return: Índice do vértice adicionado.
+        """
+        x, y = _xy(point)
+        index = len(self._points)
+        self._points.append((x, y))
+        self._cells.setdefault(self._cell(x, y), set()).add(index)
+        return index
+
+    def move(self, index, point):
+        """
+        Atualiza a posição de um vértice, mexendo apenas nas células de origem e de destino.
+        :param index: Índice do vértice.
+        :param point: Nova posição (QPointF ou tupla (x, y)).
+        """
+        x, y = _xy(point)
+        antiga = self._cell(*self._points[index])
+        nova = self._cell(x, y)
+        self._points[index] = (x, y)
+        if antiga != nova:
+            celula = self._cells[antiga]
+            celula.discard(index)
+            if not celula:
+                del self._cells[antiga]
+            self._cells.setdefault(nova, set()).add(index)
+
+    def clear(self):
+        """Remove todos os vértices do índice."""
+        self._points = []
+        self._cells = {}
+
+    def nearest(self, point, max_distance):
+        """
+        Retorna o vértice mais próximo do ponto, dentro da distância máxima.
+        :param point: Posição consultada (QPointF ou tupla (x, y)).
+        :param max_distance: Raio de seleção.
+        :return: Índice do vértice mais próximo, ou None se nenhum estiver ao alcance.
+        """
+        x, y = _xy(point)
+        # Mantém a consulta em 3x3 células: células pequenas demais para o raio custariam (2r/c)² células,
+        # e grandes demais juntariam vértices demais em cada uma
+        if max_distance > 0 and not self.cell_size / 8 <= max_distance <= self.cell_size:
+            self.set_cell_size(max_distance * 2)
+        alcance = math.ceil(max_distance / self.cell_size)
+        cx, cy = self._cell(x, y)
+        melhor, melhor_d2 = None, max_distance * max_distance
+        for i in range(cx - alcance, cx + alcance + 1):
+            for j in range(cy - alcance, cy + alcance + 1):
+                for index in self._cells.get((i, j), ()):
+                    px, py = self._points[index]
+                    d2 = (px - x) ** 2 + (py - y) ** 2
+                    if d2 <= melhor_d2 and (melhor is None or d2 < melhor_d2 or index < melhor):
+                        melhor, melhor_d2 = index, d2
+        return melhor
+
+
+def _xy(point):
+    """
+    Extrai as coordenadas de um ponto.
+    :param point: QPointF ou tupla (x, y).
+    :return: Tupla (x, y) de floats.
+    """
+    if hasattr(point, "x") and callable(point.x):
+        return float(point.x()), float(point.y())
+    return float(point[0]), float(point[1])
@@ -1,31 +1,62 @@
-from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget
-from PyQt5.QtCore import Qt
+import argparse
+import logging
+import os
+import sys
+import time
+from utils.instrumentation import recorder
+from utils.startup_profile import ImportTimer, startup_report
+
+INICIO = time.perf_counter()
+
+# Com --profile-startup, as importações a seguir já são medidas
+_import_timer = ImportTimer()
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    _import_timer.install()
+
+from PyQt5.QtWidgets import QApplication, QMainWindow, QShortcut, QVBoxLayout, QWidget
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from ui.toolbar_extended import ToolbarExtended
 from ui.canvas import Canvas
 from logic.object_manager import ObjectManager
 from rendering.renderer import Renderer
+from ui.stats_panel import StatsPanel
+from utils.logger import ARQUIVO_LOG, set_log_level, setup_logger
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    # Emitido quando a carga adiada (configuração, catálogo e objetos salvos) termina
+    loaded = pyqtSignal()
+
+    def __init__(self, deferred=False):
+        """
+        Inicializa a janela principal.
+        :param deferred: Se True, a janela é montada sem ler os objetos salvos, a configuração e o catálogo;
+                         load_deferred os carrega depois que a janela aparece.
+        """
         super().__init__()
         self.setWindowTitle("Editor de Gráficos Vetoriais")
         # Define o estado da janela como maximizado
         self.setWindowState(Qt.WindowMaximized)
 
         # Inicializa gerenciador de objetos
-        self.object_manager = ObjectManager()
+        with recorder.span("MainWindow: ObjectManager", "startup"):
+            self.object_manager = ObjectManager(load=not deferred)
 
         # Cria o canvas
-        self.canvas = Canvas(None)  # Passa None temporariamente, pois o renderer ainda não foi criado
+        with recorder.span("MainWindow: Canvas", "startup"):
+            self.canvas = Canvas(None)  # Passa None temporariamente, pois o renderer ainda não foi criado
 
         # Cria o renderizador, passando o object_manager e o canvas
-        self.renderer = Renderer(self.object_manager)
+        with recorder.span("MainWindow: Renderer", "startup"):
+            self.renderer = Renderer(self.object_manager)
 
-        # Atualiza o canvas com o renderizador
-        self.canvas.renderer = self.renderer
+            # Atualiza o canvas com o renderizador, que passa a desenhar os objetos salvos na cena
+            self.canvas.renderer = self.renderer
+            self.renderer.attach(self.canvas.scene)
 
         # Cria a barra de ferramentas
-        self.toolbar = ToolbarExtended(self.canvas, self.object_manager)
+        with recorder.span("MainWindow: ToolbarExtended", "startup"):
+            self.toolbar = ToolbarExtended(self.canvas, self.object_manager, deferred=deferred)
 
         # Configura o layout principal
         central_widget = QWidget()
@@ -35,8 +66,81 @@ class MainWindow(QMainWindow):
         central_widget.setLayout(layout)
         self.setCentralWidget(central_widget)
 
-if __name__ == "__main__":
-    app = QApplication([])
-    window = MainWindow()
+        # Painel com os tempos das ações da barra, do desenho e das consultas ao banco
+        with recorder.span("MainWindow: StatsPanel", "startup"):
+            self.stats_panel = StatsPanel(self)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.stats_panel)
+
+        # Alterna o log detalhado (DEBUG) sem reiniciar a aplicação
+        QShortcut(QKeySequence("Ctrl+Shift+L"), self, activated=self.toggle_debug_log)
+
+    def load_deferred(self):
+        """
+        Carrega o que não é necessário para exibir a janela: a configuração e o catálogo da barra de
+        ferramentas e os objetos salvos, lidos em segundo plano e aplicados na thread da interface.
+        """
+        with recorder.span("MainWindow: configuração e catálogo", "startup"):
+            self.toolbar.load_deferred()
+        from db_manager import migrar_esquema  # Importado sob demanda, como na barra de ferramentas
+        self.toolbar.executor.submit("migracao", migrar_esquema)
+        self._inicio_objetos = time.perf_counter()
+        self.toolbar.executor.submit(
+            "objetos", self.object_manager.read_saved_objects,
+            on_result=self._objetos_lidos, on_error=lambda mensagem: self._objetos_lidos(None),
+        )
+
+    def _objetos_lidos(self, store):
+        """Aplica os objetos lidos em segundo plano e avisa que a carga terminou."""
+        with recorder.span("MainWindow: aplicar objetos", "startup"):
+            self.object_manager.apply_saved_objects(store)
+        recorder.record("MainWindow: objetos salvos (leitura + aplicação)", "startup",
+                        self._inicio_objetos, time.perf_counter() - self._inicio_objetos)
+        self.loaded.emit()
+
+    def toggle_debug_log(self):
+        """
+        Alterna o nível do log entre INFO e DEBUG em tempo de execução.
+        """
+        logger = logging.getLogger("app_logger")
+        nivel = set_log_level(logging.INFO if logger.level == logging.DEBUG else logging.DEBUG)
+        logger.warning("Nível de log alterado para %s.", logging.getLevelName(nivel))
+
+    def closeEvent(self, event):
+        """
+        Grava as alterações pendentes dos objetos antes de fechar a janela.
+        """
+        self.object_manager.flush()
+        super().closeEvent(event)
+
+def main(argv=None):
+    """
+    Abre a janela o quanto antes e carrega os dados salvos depois da primeira pintura.
+    :param argv: Argumentos da linha de comando (padrão: sys.argv).
+    """
+    parser = argparse.ArgumentParser(description="Editor de chapas e peças.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Mostra o tempo de importação de cada módulo e de cada etapa da inicialização.")
+    args = parser.parse_args(argv)
+    setup_logger(arquivo=os.environ.get("APP_LOG_FILE", ARQUIVO_LOG))
+    app = QApplication(sys.argv[:1])
+    with recorder.span("MainWindow.__init__", "startup"):
+        window = MainWindow(deferred=True)
     window.show()
-    app.exec_()
\ No newline at end of file
+
+    def janela_exibida():
+        recorder.record("janela exibida (desde o início)", "startup", INICIO, time.perf_counter() - INICIO)
+        window.load_deferred()
+
+    def carga_concluida():
+        recorder.record("carga concluída (desde o início)", "startup", INICIO, time.perf_counter() - INICIO)
+        if args.profile_startup:
+            _import_timer.uninstall()
+            print(startup_report())
+
+    window.loaded.connect(carga_concluida)
+    # Disparado pelo laço de eventos, depois que a janela foi pintada pela primeira vez
+    QTimer.singleShot(0, janela_exibida)
+    app.exec_()
+
+if __name__ == "__main__":
+    main()
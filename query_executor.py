@@ -0,0 +1,187 @@
+import logging
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from db_manager import get_pool
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+
+class _QueryTask(QRunnable):
+    def __init__(self, executor, tag, generation, func, args):
+        """
+        Tarefa que executa uma função de consulta em uma thread do pool.
+        :param executor: QueryExecutor que recebe o resultado.
+        :param tag: Nome do tipo de consulta (consultas novas com a mesma tag cancelam as antigas).
+        :param generation: Número da consulta dentro da tag.
+        :param func: Função a executar.
+        :param args: Argumentos da função.
+        """
+        super().__init__()
+        self.executor = executor
+        self.tag = tag
+        self.generation = generation
+        self.func = func
+        self.args = args
+        self.connection = None  # Conexão da thread de trabalho, usada para interromper a consulta
+        # A conexão é da thread, não da tarefa: só pode ser interrompida enquanto func roda,
+        # senão o cancelamento atingiria a próxima tarefa da mesma thread
+        self._executando = False
+        self._lock = threading.Lock()
+        self.done = False  # run terminou: o executor pode soltar a referência da tarefa
+
+    def run(self):
+        try:
+            if not self.executor.is_stale(self.tag, self.generation):
+                self._execute()
+        finally:
+            self.done = True
+
+    def _execute(self):
+        self.connection = self.executor.pool.connection()
+        self.executor._register_running(self)
+        try:
+            with self._lock:
+                self._executando = True
+            try:
+                resultado = self.func(*self.args)
+            finally:
+                with self._lock:
+                    self._executando = False
+        except Exception as e:
+            self.executor._failed.emit(self.tag, self.generation, str(e))
+        else:
+            self.executor._finished.emit(self.tag, self.generation, resultado)
+        finally:
+            self.executor._unregister_running(self)
+
+    def interrupt(self):
+        """
+        Interrompe a consulta da tarefa, se func ainda estiver em execução.
+        :return: True se a conexão foi interrompida.
+        """
+        with self._lock:
+            if not self._executando:
+                return False
+            self.connection.interrupt()
+            return True
+
+
+class QueryExecutor(QObject):
+    # Sinais públicos, entregues sempre na thread da interface
+    resultado = pyqtSignal(str, object)  # tag, resultado
+    erro = pyqtSignal(str, str)  # tag, mensagem de erro
+    # Sinais internos emitidos pelas threads de trabalho
+    _finished = pyqtSignal(str, int, object)
+    _failed = pyqtSignal(str, int, str)
+
+    def __init__(self, max_threads=2, db_path=None, parent=None):
+        """
+        Inicializa o executor de consultas fora da thread da interface.
+        :param max_threads: Número máximo de consultas simultâneas.
+        :param db_path: Banco cujas conexões podem ser interrompidas ao cancelar (padrão: db_manager.DB_PATH).
+        :param parent: Objeto pai opcional.
+        """
+        super().__init__(parent)
+        self.pool = get_pool() if db_path is None else get_pool(db_path)
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        # Threads permanentes: cada uma mantém a sua conexão do pool aberta
+        self.thread_pool.setExpiryTimeout(-1)
+        self._lock = threading.Lock()
+        self._generations = {}
+        self._pending = {}  # tag -> tarefa ainda não iniciada
+        self._running = {}  # tag -> tarefa em execução
+        # Todas as tarefas entregues ao QThreadPool até terminarem: sem autoDelete, o objeto Python é o dono
+        # da tarefa, e liberá-lo (por exemplo, ao cancelar uma tarefa que já começou) derrubaria a thread
+        self._tasks = set()
+        self._callbacks = {}  # (tag, generation) -> (on_result, on_error)
+        self._finished.connect(self._deliver_result)
+        self._failed.connect(self._deliver_error)
+
+    def submit(self, tag, func, *args, on_result=None, on_error=None):
+        """
+        Agenda uma consulta, cancelando qualquer consulta anterior com a mesma tag.
+        :param tag: Nome do tipo de consulta.
+        :param func: Função a executar em uma thread de trabalho.
+        :param args: Argumentos da função.
+        :param on_result: Callback opcional chamado na thread da interface com o resultado.
+        :param on_error: Callback opcional chamado na thread da interface com a mensagem de erro.
+        :return: Número da consulta dentro da tag.
+        """
+        self.cancel(tag)
+        with self._lock:
+            generation = self._generations.get(tag, 0) + 1
+            self._generations[tag] = generation
+            task = _QueryTask(self, tag, generation, func, args)
+            task.setAutoDelete(False)
+            self._pending[tag] = task
+            self._tasks = {anterior for anterior in self._tasks if not anterior.done}
+            self._tasks.add(task)
+        if on_result or on_error:
+            self._callbacks[(tag, generation)] = (on_result, on_error)
+        self.thread_pool.start(task)
+        return generation
+
+    def cancel(self, tag):
+        """
+        Cancela a consulta atual da tag: retira do pool se ainda não começou ou interrompe o SQLite.
+        O resultado de uma consulta cancelada é descartado.
+        :param tag: Nome do tipo de consulta.
+        """
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            pending = self._pending.pop(tag, None)
+            running = self._running.get(tag)
+        if pending is not None and self.thread_pool.tryTake(pending):
+            with self._lock:
+                self._tasks.discard(pending)
+        if running is not None and running.interrupt():
+            logger.info("Consulta '%s' interrompida por uma consulta mais nova.", tag)
+        for key in [key for key in self._callbacks if key[0] == tag]:
+            del self._callbacks[key]
+
+    def is_stale(self, tag, generation):
+        """Indica se a consulta foi substituída por outra mais nova."""
+        with self._lock:
+            return self._generations.get(tag) != generation
+
+    def _register_running(self, task):
+        with self._lock:
+            if self._pending.get(task.tag) is task:
+                del self._pending[task.tag]
+            self._running[task.tag] = task
+
+    def _unregister_running(self, task):
+        with self._lock:
+            if self._running.get(task.tag) is task:
+                del self._running[task.tag]
+
+    @pyqtSlot(str, int, object)
+    def _deliver_result(self, tag, generation, resultado):
+        """Entrega o resultado na thread da interface, se a consulta ainda for a mais recente."""
+        if self.is_stale(tag, generation):
+            return
+        on_result, _ = self._callbacks.pop((tag, generation), (None, None))
+        if on_result:
+            on_result(resultado)
+        self.resultado.emit(tag, resultado)
+
+    @pyqtSlot(str, int, str)
+    def _deliver_error(self, tag, generation, mensagem):
+        """Entrega o erro na thread da interface, sem bloquear com diálogos modais."""
+        if self.is_stale(tag, generation):
+            return
+        logger.error("Erro na consulta '%s': %s", tag, mensagem)
+        _, on_error = self._callbacks.pop((tag, generation), (None, None))
+        if on_error:
+            on_error(mensagem)
+        self.erro.emit(tag, mensagem)
+
+    def wait(self, msecs=-1):
+        """
+        Aguarda o término das consultas em andamento.
+        :param msecs: Tempo máximo de espera em milissegundos (-1 para sem limite).
+        :return: True se todas as consultas terminaram.
+        """
+        return self.thread_pool.waitForDone(msecs)
@@ -1,15 +1,127 @@
-from PyQt5.QtCore import QObject
+from PyQt5.QtWidgets import QGraphicsEllipseItem, QGraphicsItem, QGraphicsPolygonItem, QGraphicsRectItem
+from PyQt5.QtGui import QPen, QPolygonF
+from PyQt5.QtCore import QObject, QPointF, Qt
+import logging
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
 
 class Renderer(QObject):
-    def __init__(self, object_manager):
+    def __init__(self, object_manager, scene=None):
         """
-        Inicializa o renderizador.
+        Inicializa o renderizador, que mantém a cena sincronizada com os objetos do ObjectManager.
+        Cada objeto vira um item gráfico, guardado em um mapa id -> item; as alterações avisadas
+        pelo ObjectManager são aplicadas item a item, sem reconstruir a cena.
         :param object_manager: Gerenciador de objetos para manipulação de dados.
+        :param scene: Cena onde os objetos são desenhados (pode ser definida depois com attach).
         """
         super().__init__()
         self.object_manager = object_manager
+        self.scene = None
+        self.items = {}  # id do objeto -> QGraphicsItem
+        self._dados = {}  # id do objeto -> objeto desenhado, para ignorar recargas sem alteração
+        # Item raiz sem conteúdo: os itens dos objetos são seus filhos, o que permite ao canvas
+        # limpar a cena sem apagar o que pertence ao modelo
+        self.root = QGraphicsRectItem()
+        self.root.setFlag(QGraphicsItem.ItemHasNoContents, True)
+        self.pen = QPen(Qt.black)
+        self.pen.setCosmetic(True)  # Espessura constante em pixels, independente do zoom
+        object_manager.add_listener(self.on_objects_changed)
+        if scene is not None:
+            self.attach(scene)
+
+    def attach(self, scene):
+        """
+        Passa a desenhar os objetos na cena informada, sincronizando-a por completo.
+        :param scene: QGraphicsScene de destino.
+        """
+        if self.root.scene() is not None:
+            self.root.scene().removeItem(self.root)
+        self.scene = scene
+        scene.addItem(self.root)
+        self.render()
 
     def render(self):
-        """Renderiza os objetos no canvas."""
-        for obj in self.object_manager.get_objects():
-            print(f"Renderizando objeto: {obj}")
\ No newline at end of file
+        """
+        Sincroniza a cena com todos os objetos: cria os que faltam, atualiza os alterados e
+        remove os que não existem mais. Objetos sem alteração não são tocados.
+        """
+        if self.scene is None:
+            return
+        objetos = {int(obj_id): self.object_manager.get_object(int(obj_id)) for obj_id in self.object_manager.store.ids()}
+        removidos = [obj_id for obj_id in self.items if obj_id not in objetos]
+        for obj_id in removidos:
+            self._remover(obj_id)
+        alterados = 0
+        for obj_id, obj in objetos.items():
+            if self._dados.get(obj_id) != obj:
+                self._desenhar(obj_id, obj)
+                alterados += 1
+        logger.info("Cena sincronizada: %d objetos desenhados, %d removidos, %d na cena.", alterados, len(removidos), len(self.items))
+
+    def on_objects_changed(self, evento, ids):
+        """
+        Aplica à cena uma alteração avisada pelo ObjectManager.
+        :param evento: "add", "update", "remove", "clear" ou "reload".
+        :param ids: IDs afetados.
+        """
+        if self.scene is None:
+            return
+        if evento in ("add", "update"):
+            for obj_id in ids:
+                self._desenhar(obj_id, self.object_manager.get_object(obj_id))
+        elif evento == "remove":
+            for obj_id in ids:
+                self._remover(obj_id)
+        elif evento == "clear":
+            for obj_id in list(self.items):
+                self._remover(obj_id)
+        elif evento == "reload":
+            self.render()
+
+    def _desenhar(self, obj_id, obj):
+        """Cria ou atualiza o item de um objeto; tipos sem representação gráfica são ignorados."""
+        item = self.items.get(obj_id)
+        if item is not None and self._dados[obj_id]["type"] != obj["type"]:
+            self._remover(obj_id)
+            item = None
+        try:
+            item = self._configurar(item, obj["type"], obj["data"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Objeto %s (%s) com dados inválidos para desenho: %s", obj_id, obj["type"], e)
+            return
+        if item is None:
+            return
+        if obj_id not in self.items:
+            item.setParentItem(self.root)
+            self.items[obj_id] = item
+        self._dados[obj_id] = obj
+
+    def _remover(self, obj_id):
+        item = self.items.pop(obj_id, None)
+        self._dados.pop(obj_id, None)
+        if item is not None and self.scene is not None:
+            self.scene.removeItem(item)
+
+    def _configurar(self, item, obj_type, data):
+        """
+        Cria (se item for None) ou atualiza o item gráfico de um objeto.
+        :param obj_type: "rectangle" (x, y, width, height), "circle" (x, y, radius, com centro em x, y)
+                         ou "polygon" (points: lista de [x, y]).
+        :return: O item, ou None para tipos sem representação gráfica.
+        """
+        if obj_type == "rectangle":
+            item = QGraphicsRectItem() if item is None else item
+            item.setRect(float(data.get("x", 0)), float(data.get("y", 0)), float(data["width"]), float(data["height"]))
+        elif obj_type == "circle":
+            item = QGraphicsEllipseItem() if item is None else item
+            raio = float(data["radius"])
+            item.setRect(float(data.get("x", 0)) - raio, float(data.get("y", 0)) - raio, 2 * raio, 2 * raio)
+        elif obj_type == "polygon":
+            item = QGraphicsPolygonItem() if item is None else item
+            item.setPolygon(QPolygonF([QPointF(float(x), float(y)) for x, y in data["points"]]))
+        else:
+            logger.debug("Tipo de objeto sem representação gráfica: %s", obj_type)
+            return None
+        item.setPen(self.pen)
+        return item
@@ -0,0 +1,132 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from batch_aproveitamento import CREATE_CHECKPOINT, aninhar_misto, atualizar_areas_dxf, calcular_aproveitamento, executar
+
+class TestBatchAproveitamento(unittest.TestCase):
+    def setUp(self):
+        """Cria um banco temporário com as tabelas pecas e aproveitamento."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "pecas_teste.db")
+        self.checkpoint = "teste"
+        conexao = sqlite3.connect(self.db_path)
+        conexao.execute(
+            "CREATE TABLE pecas (cod_peca TEXT PRIMARY KEY, comprimento REAL, largura REAL, comp_chapa REAL, larg_chapa REAL)"
+        )
+        conexao.execute(
+            "CREATE TABLE aproveitamento (id INTEGER PRIMARY KEY AUTOINCREMENT, multiplo_ideal REAL, sobra REAL, "
+            "area_peca_bruta REAL, area_chapa REAL, cod_peca TEXT, area_aproveitamento REAL, sucata REAL)"
+        )
+        pecas = [(f"P{i:03d}", 100.0, 50.0, 1000.0, 500.0) for i in range(30)] + [("INVALIDA", 0.0, 50.0, 1000.0, 500.0)]
+        conexao.executemany("INSERT INTO pecas VALUES (?, ?, ?, ?, ?)", pecas)
+        conexao.commit()
+        conexao.close()
+
+    def tearDown(self):
+        from db_manager import get_pool
+        get_pool(self.db_path).close_all()
+        self.tmpdir.cleanup()
+
+    def contar_resultados(self):
+        conexao = sqlite3.connect(self.db_path)
+        try:
+            return conexao.execute("SELECT COUNT(*), MIN(multiplo_ideal) FROM aproveitamento").fetchone()
+        finally:
+            conexao.close()
+
+    def test_calcular_aproveitamento(self):
+        """Testa o cálculo de uma peça isolada."""
+        resultado = calcular_aproveitamento(("P1", 100.0, 50.0, 1000.0, 500.0))
+        cod_peca, multiplo, sobra, sucata, area_aproveitamento, area_peca, area_chapa = resultado
+        self.assertEqual(multiplo, 100)
+        self.assertAlmostEqual(area_aproveitamento, 0.5)
+        self.assertAlmostEqual(sobra, 0.0)
+        self.assertIsNone(calcular_aproveitamento(("X", None, 50.0, 1000.0, 500.0)))
+        self.assertEqual(calcular_aproveitamento(("P2", "100,0", " 50,00 ", "1000", 500.0))[1], 100)
+
+    def test_executar(self):
+        """Testa a execução completa com processos e gravação em lote."""
+        gravados = executar(self.db_path, workers=2, tamanho_lote=7, checkpoint=self.checkpoint)
+        self.assertEqual(gravados, 30)
+        self.assertEqual(self.contar_resultados(), (30, 100.0))
+
+    def test_reexecutar_substitui_resultados(self):
+        """Testa que executar de novo substitui os resultados, sem duplicar linhas por código."""
+        executar(self.db_path, workers=1, tamanho_lote=7, checkpoint=self.checkpoint)
+        executar(self.db_path, workers=1, tamanho_lote=7, checkpoint=self.checkpoint)
+        self.assertEqual(self.contar_resultados(), (30, 100.0))
+
+    def test_retomar_checkpoint_no_banco(self):
+        """Testa a retomada após uma queda: o lote já gravado é refeito sem duplicar e o checkpoint sai do banco."""
+        executar(self.db_path, workers=1, tamanho_lote=7, checkpoint=self.checkpoint)
+        conexao = sqlite3.connect(self.db_path)
+        with conexao:
+            conexao.execute("INSERT INTO aproveitamento_checkpoint VALUES (?, 'P009', 10)", (self.checkpoint,))
+        gravados = executar(self.db_path, workers=1, tamanho_lote=5, checkpoint=self.checkpoint, retomar=True)
+        restantes = conexao.execute("SELECT COUNT(*) FROM aproveitamento_checkpoint").fetchone()[0]
+        conexao.close()
+        self.assertEqual(gravados, 30)
+        self.assertEqual(self.contar_resultados(), (30, 100.0))
+        self.assertEqual(restantes, 0)
+
+    def test_retomar(self):
+        """Testa a retomada a partir do checkpoint do banco, sem resultados anteriores."""
+        conexao = sqlite3.connect(self.db_path)
+        with conexao:
+            conexao.execute(CREATE_CHECKPOINT)
+            conexao.execute("INSERT INTO aproveitamento_checkpoint VALUES (?, 'P019', 20)", (self.checkpoint,))
+        conexao.close()
+        gravados = executar(self.db_path, workers=1, tamanho_lote=5, checkpoint=self.checkpoint, retomar=True)
+        self.assertEqual(gravados, 30)
+        self.assertEqual(self.contar_resultados()[0], 10)
+
+    def test_aninhar_misto(self):
+        """Testa o encaixe de códigos diferentes na mesma chapa (preenchida por completo) e a gravação por código."""
+        conexao = sqlite3.connect(self.db_path)
+        conexao.execute("INSERT INTO pecas VALUES ('GRANDE', 400.0, 250.0, 1000.0, 500.0)")
+        conexao.commit()
+        conexao.close()
+        posicionamentos, nao_posicionadas = aninhar_misto([("GRANDE", 3), ("P000", 60)], self.db_path)
+        self.assertEqual(nao_posicionadas, {"P000": 20})
+        conexao = sqlite3.connect(self.db_path)
+        try:
+            linhas = conexao.execute(
+                "SELECT cod_peca, multiplo_ideal, area_aproveitamento, sucata FROM aproveitamento ORDER BY cod_peca"
+            ).fetchall()
+        finally:
+            conexao.close()
+        self.assertEqual([linha[:2] for linha in linhas], [("GRANDE", 3.0), ("P000", 40.0)])
+        self.assertAlmostEqual(linhas[0][2] + linhas[1][2], 0.5)
+        self.assertAlmostEqual(linhas[0][3], 0.0)
+        with self.assertRaises(ValueError):
+            aninhar_misto([("NAO_EXISTE", 1)], self.db_path)
+
+    def test_atualizar_areas_dxf(self):
+        """Testa o cálculo das áreas líquida e bruta a partir do caminho_dxf das peças."""
+        dxf = os.path.join(self.tmpdir.name, "triangulo.dxf")
+        with open(dxf, "w") as file:
+            file.write("\n".join([
+                "0", "SECTION", "2", "ENTITIES",
+                "0", "LWPOLYLINE", "90", "3", "70", "1", "10", "0", "20", "0", "10", "200", "20", "0", "10", "0", "20", "100",
+                "0", "ENDSEC", "0", "EOF",
+            ]) + "\n")
+        conexao = sqlite3.connect(self.db_path)
+        conexao.execute("ALTER TABLE pecas ADD COLUMN area_peca_liquida REAL")
+        conexao.execute("ALTER TABLE pecas ADD COLUMN area_peca_bruta REAL")
+        conexao.execute("ALTER TABLE pecas ADD COLUMN caminho_dxf TEXT")
+        conexao.execute("UPDATE pecas SET caminho_dxf = ? WHERE cod_peca = 'P000'", (dxf,))
+        conexao.execute("UPDATE pecas SET caminho_dxf = 'nao_existe.dxf' WHERE cod_peca = 'P001'")
+        conexao.commit()
+        conexao.close()
+        self.assertEqual(atualizar_areas_dxf(self.db_path, diretorio_cache=None), 1)
+        conexao = sqlite3.connect(self.db_path)
+        try:
+            areas = conexao.execute("SELECT area_peca_liquida, area_peca_bruta FROM pecas WHERE cod_peca = 'P000'").fetchone()
+        finally:
+            conexao.close()
+        self.assertAlmostEqual(areas[0], 10000)  # mm²
+        self.assertAlmostEqual(areas[1], 20000)
+
+if __name__ == "__main__":
+    unittest.main()
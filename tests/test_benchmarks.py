@@ -0,0 +1,39 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from benchmarks.run_benchmarks import comparar, gerar_banco, medir
+
+class TestBenchmarks(unittest.TestCase):
+    def test_medir(self):
+        """Testa se as execuções de aquecimento e a preparação ficam fora das medidas."""
+        chamadas = []
+        medida = medir(lambda: chamadas.append("f"), repeticoes=3, aquecimento=2, preparar=lambda: chamadas.append("p"))
+        self.assertEqual(chamadas, ["p", "f"] * 5)
+        self.assertEqual(medida["repeticoes"], 3)
+        self.assertLessEqual(medida["minimo"], medida["mediana"])
+        self.assertLessEqual(medida["mediana"], medida["maximo"])
+
+    def test_comparar(self):
+        """Testa a detecção de regressões entre duas execuções."""
+        referencia = {"resultados": {"a": {"mediana": 1.0}, "b": {"mediana": 2.0}, "removido": {"mediana": 1.0}}}
+        atual = {"resultados": {"a": {"mediana": 1.5}, "b": {"mediana": 2.1}, "novo": {"mediana": 9.0}}}
+        comparacoes, regressoes = comparar(atual, referencia, limite=0.2)
+        self.assertEqual([c[0] for c in comparacoes], ["a", "b"])
+        self.assertEqual([r[0] for r in regressoes], ["a"])
+        self.assertAlmostEqual(regressoes[0][3], 1.5)
+
+    def test_gerar_banco(self):
+        """Testa a geração do banco de peças usado nos benchmarks do catálogo."""
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "pecas.db")
+            codigos = gerar_banco(caminho, 50)
+            conexao = sqlite3.connect(caminho)
+            try:
+                self.assertEqual(conexao.execute("SELECT COUNT(*) FROM pecas").fetchone()[0], 50)
+            finally:
+                conexao.close()
+            self.assertEqual(len(set(codigos)), 50)
+
+if __name__ == "__main__":
+    unittest.main()
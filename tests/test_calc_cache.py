@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from utils.calc_cache import CalcCache
+from utils.calculations import calcular_area_circulo
+
+chamadas = []
+
+def quadrado(x):
+    chamadas.append(x)
+    return x * x
+
+class TestCalcCache(unittest.TestCase):
+    def setUp(self):
+        chamadas.clear()
+
+    def test_hits_and_normalization(self):
+        """Testa se argumentos equivalentes (10 e 10.0) reaproveitam o mesmo resultado."""
+        cache = CalcCache(maxsize=10)
+        self.assertEqual(cache.call(quadrado, 10), 100)
+        self.assertEqual(cache.call(quadrado, 10.0), 100)
+        self.assertEqual(chamadas, [10])
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 0.5)
+
+    def test_lru_eviction(self):
+        """Testa se o resultado menos usado é descartado ao atingir o limite."""
+        cache = CalcCache(maxsize=2)
+        cache.call(quadrado, 1)
+        cache.call(quadrado, 2)
+        cache.call(quadrado, 1)
+        cache.call(quadrado, 3)  # Descarta 2
+        cache.call(quadrado, 1)
+        cache.call(quadrado, 2)
+        self.assertEqual(chamadas, [1, 2, 3, 2])
+        self.assertEqual(cache.stats()["size"], 2)
+
+    def test_memoizar(self):
+        """Testa o decorador memoizar."""
+        cache = CalcCache()
+        area = cache.memoizar(calcular_area_circulo)
+        self.assertEqual(area(100), area(100.0))
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_disk_tier(self):
+        """Testa se um novo cache encontra no banco os resultados de uma sessão anterior."""
+        from db_manager import get_pool
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "cache.db")
+            try:
+                anterior = CalcCache(db_path=db_path)
+                anterior.persistir(quadrado)
+                anterior.call(quadrado, 7)
+                anterior.flush()
+                novo = CalcCache(db_path=db_path)
+                novo.persistir(quadrado)
+                self.assertEqual(novo.call(quadrado, 7), 49)
+                self.assertEqual(chamadas, [7])
+                self.assertEqual(novo.stats()["disk_hits"], 1)
+            finally:
+                get_pool(db_path).close_all()
+
+    def test_disco_apenas_para_funcoes_registradas(self):
+        """Testa se funções não registradas com persistir() ficam só em memória."""
+        from db_manager import get_pool
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "cache.db")
+            try:
+                cache = CalcCache(db_path=db_path)
+                cache.call(quadrado, 3)
+                cache.flush()
+                self.assertIsNone(cache._escritor)  # Nada foi enfileirado para o disco
+                novo = CalcCache(db_path=db_path)
+                novo.call(quadrado, 3)
+                self.assertEqual(chamadas, [3, 3])
+            finally:
+                get_pool(db_path).close_all()
+
+    def test_versao_invalida_resultados_antigos(self):
+        """Testa se mudar a versão da função descarta os resultados gravados com a versão anterior."""
+        from db_manager import get_pool
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "cache.db")
+            try:
+                antigo = CalcCache(db_path=db_path)
+                antigo.persistir(quadrado, versao="1")
+                antigo.call(quadrado, 5)
+                antigo.flush()
+                novo = CalcCache(db_path=db_path)
+                novo.persistir(quadrado, versao="2")
+                novo.call(quadrado, 5)
+                novo.flush()
+                self.assertEqual(chamadas, [5, 5])
+                funcoes = get_pool(db_path).fetchall("SELECT DISTINCT funcao FROM cache_calculos")
+                self.assertEqual([f for (f,) in funcoes], [f"{quadrado.__module__}.quadrado@2"])
+            finally:
+                get_pool(db_path).close_all()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QPolygonF, QWheelEvent
+from PyQt5.QtCore import QPoint, QPointF, Qt
 from ui.canvas import Canvas
 from rendering.renderer import Renderer
 from logic.object_manager import ObjectManager
@@ -35,6 +37,27 @@ class TestCanvas(unittest.TestCase):
         items = self.canvas.scene.items()
         self.assertGreater(len(items), 1, "Os círculos não foram distribuídos corretamente.")
 
+    def test_distribute_circles_single_item(self):
+        """Testa se a distribuição usa um único item gráfico para todas as peças."""
+        self.canvas.draw_rectangle((50, 50), 200, 100)
+        self.canvas.distribute_circles(10)
+        self.assertEqual(len(self.canvas.scene.items()), 2, "As peças deveriam estar em um único item.")
+        self.assertEqual(self.canvas.distributed_item.count(), 50)
+
+    def test_distribute_circles_in_polygon(self):
+        """Testa a distribuição dentro de uma sobra, mantendo o polígono na cena."""
+        self.canvas.draw_rectangle((50, 50), 200, 100)
+        rect = self.canvas.current_rectangle.rect()
+        scale = self.canvas.get_scale_factor()
+        sobra = [QPointF(rect.x() + x * scale, rect.y() + y * scale) for x, y in [(0, 0), (100, 0), (0, 100)]]
+        polygon_item = self.canvas.scene.addPolygon(QPolygonF(sobra))
+        quantidade = self.canvas.distribute_circles_in_polygon(10, sobra)
+        self.assertGreater(quantidade, 0)
+        self.assertEqual(self.canvas.distributed_item.count(), quantidade)
+        self.canvas.distribute_circles_in_polygon(10, sobra)  # Substitui a distribuição anterior
+        self.assertEqual(len(self.canvas.scene.items()), 3)
+        self.assertIn(polygon_item, self.canvas.scene.items())
+
     def test_clear_scene(self):
         """Testa a limpeza do canvas."""
         self.canvas.draw_rectangle((50, 50), 200, 100)
@@ -42,5 +65,30 @@ class TestCanvas(unittest.TestCase):
         items = self.canvas.scene.items()
         self.assertEqual(len(items), 0, "O canvas não foi limpo corretamente.")
 
+    def test_resize_keeps_scene_geometry(self):
+        """Testa se redimensionar e dar zoom mudam só a transformação da vista, sem recriar os itens."""
+        self.canvas.resize(800, 600)
+        self.canvas.show()  # O viewport só acompanha o tamanho do widget visível
+        self.canvas.draw_rectangle((0, 0), 3000, 1500)
+        self.canvas.distribute_circles(50)
+        rect_item, circles = self.canvas.current_rectangle, self.canvas.distributed_item
+        self.assertEqual(rect_item.rect().width(), 3000)  # A cena está em milímetros
+        escala = self.canvas.view_scale()
+        self.canvas.resize(1600, 1200)
+        self.app.processEvents()
+        self.canvas._apply_resize()
+        self.assertAlmostEqual(self.canvas.view_scale(), escala * 2, delta=escala * 0.05)
+        evento = QWheelEvent(QPointF(400, 300), QPointF(400, 300), QPoint(0, 0), QPoint(0, 120),
+                             Qt.NoButton, Qt.NoModifier, Qt.NoScrollPhase, False)
+        escala = self.canvas.view_scale()
+        self.canvas.wheelEvent(evento)
+        self.assertAlmostEqual(self.canvas.view_scale(), escala * 1.15)
+        self.assertFalse(self.canvas.auto_fit)
+        self.canvas._apply_resize()  # Com zoom manual, o redimensionamento não reajusta a vista
+        self.assertAlmostEqual(self.canvas.view_scale(), escala * 1.15)
+        self.assertIs(self.canvas.current_rectangle, rect_item)
+        self.assertIs(self.canvas.distributed_item, circles)
+        self.assertTrue(rect_item.rect().contains(circles.boundingRect().adjusted(1, 1, -1, -1)))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
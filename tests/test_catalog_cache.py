@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from catalog_cache import PartCatalog, normalizar_codigo
+
+class TestPartCatalog(unittest.TestCase):
+    def setUp(self):
+        """Cria um banco temporário com alguns códigos de peça."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "pecas_teste.db")
+        self.conexao = sqlite3.connect(self.db_path)
+        self.conexao.execute("CREATE TABLE pecas (cod_peca TEXT PRIMARY KEY, comprimento REAL, largura REAL)")
+        self.conexao.executemany(
+            "INSERT INTO pecas VALUES (?, ?, ?)",
+            [("51.20.05.101", 100.0, 50.0), ("51.20.05.102", 120.0, 60.0), ("51.30.01.001", 80.0, 40.0), ("10", 10.0, 10.0)],
+        )
+        self.conexao.commit()
+        self.catalog = PartCatalog(self.db_path)
+        self.catalog.load()
+
+    def tearDown(self):
+        self.conexao.close()
+        self.catalog.pool.close_all()
+        self.tmpdir.cleanup()
+
+    def test_get(self):
+        """Testa a busca exata por código."""
+        self.assertEqual(self.catalog.get("51.20.05.102"), ("51.20.05.102", 120.0, 60.0))
+        self.assertIsNone(self.catalog.get("99"))
+
+    def test_prefix_search(self):
+        """Testa a busca por prefixo, inclusive sem os pontos do código."""
+        self.assertEqual(self.catalog.prefix_search("51.20"), ["51.20.05.101", "51.20.05.102"])
+        self.assertEqual(self.catalog.prefix_search("5130"), ["51.30.01.001"])
+        self.assertEqual(self.catalog.prefix_search("51", limite=1), ["51.20.05.101"])
+        self.assertEqual(normalizar_codigo("51.20.05.101"), "512005101")
+
+    def test_fuzzy_search(self):
+        """Testa a busca aproximada quando não há prefixo correspondente."""
+        self.assertIn("51.20.05.101", self.catalog.fuzzy_search("51.20.50.101"))
+
+    def test_fuzzy_search_codigos_que_colidem(self):
+        """Testa se códigos com a mesma forma normalizada voltam todos na busca aproximada."""
+        self.conexao.execute("INSERT INTO pecas VALUES ('51-20-05-101', 100.0, 50.0)")
+        self.conexao.commit()
+        self.assertTrue(self.catalog.refresh())
+        resultado = self.catalog.fuzzy_search("51.20.50.101")
+        self.assertIn("51.20.05.101", resultado)
+        self.assertIn("51-20-05-101", resultado)
+
+    def test_sem_alterar_o_esquema(self):
+        """Testa que o catálogo não cria tabelas nem gatilhos e detecta escritas da própria conexão do pool."""
+        objetos = self.conexao.execute("SELECT type, name FROM sqlite_master").fetchall()
+        self.assertEqual([nome for tipo, nome in objetos if tipo != "index"], ["pecas"])
+        with self.catalog.pool.transaction("teste") as conexao:
+            conexao.execute("UPDATE pecas SET largura = 12.5 WHERE cod_peca = '10'")
+        self.assertTrue(self.catalog.refresh())
+        self.assertEqual(self.catalog.get("10"), ("10", 10.0, 12.5))
+
+    def test_incremental_refresh(self):
+        """Testa a recarga incremental após inserções e a recarga completa após alterações."""
+        self.assertFalse(self.catalog.refresh())
+        self.conexao.execute("INSERT INTO pecas VALUES ('51.20.05.103', 130.0, 65.0)")
+        self.conexao.commit()
+        self.assertTrue(self.catalog.refresh())
+        self.assertEqual(len(self.catalog), 5)
+        self.assertIn("51.20.05.103", self.catalog.prefix_search("51.20.05"))
+        self.conexao.execute("UPDATE pecas SET comprimento = 11.0 WHERE cod_peca = '10'")
+        self.conexao.commit()
+        self.assertTrue(self.catalog.refresh())
+        self.assertEqual(self.catalog.get("10"), ("10", 11.0, 10.0))
+
+    def test_escrita_em_outra_tabela_nao_recarrega(self):
+        """Testa que escritas em outras tabelas do banco não recarregam o catálogo."""
+        self.conexao.execute("CREATE TABLE cache_calculos (funcao TEXT, chave TEXT, valor TEXT)")
+        self.conexao.execute("INSERT INTO cache_calculos VALUES ('f', 'k', '1')")
+        self.conexao.commit()
+        cargas = []
+        carregar = self.catalog.load
+        self.catalog.load = lambda: cargas.append(1) or carregar()
+        self.assertFalse(self.catalog.refresh())
+        self.assertEqual(cargas, [])
+        self.conexao.execute("DELETE FROM pecas WHERE cod_peca = '10'")
+        self.conexao.commit()
+        self.assertTrue(self.catalog.refresh())
+        self.assertEqual(cargas, [])  # As diferenças são aplicadas sem recarregar o catálogo
+        self.assertIsNone(self.catalog.get("10"))
+        self.assertEqual(self.catalog.prefix_search("1"), [])
+
+if __name__ == "__main__":
+    unittest.main()
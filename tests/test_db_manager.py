@@ -0,0 +1,85 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from db_manager import MIGRACOES, PRAGMAS_REDE, ConnectionPool, em_compartilhamento_de_rede, get_pool, migrar_esquema
+from database_handler import DatabaseHandler
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        """Cria um banco temporário com a tabela pecas."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "pecas_teste.db")
+        conexao = sqlite3.connect(self.db_path)
+        conexao.execute("CREATE TABLE pecas (cod_peca TEXT PRIMARY KEY, comprimento REAL, largura REAL)")
+        conexao.executemany("INSERT INTO pecas VALUES (?, ?, ?)", [("10", 10.0, 5.0), ("200", 200.0, 100.0)])
+        conexao.commit()
+        conexao.close()
+        self.pool = ConnectionPool(self.db_path)
+
+    def tearDown(self):
+        self.pool.close_all()
+        self.tmpdir.cleanup()
+
+    def test_connection_reused_per_thread(self):
+        """Testa se a mesma conexão é reutilizada na thread e separada entre threads."""
+        self.assertIs(self.pool.connection(), self.pool.connection())
+        outras = []
+        thread = threading.Thread(target=lambda: outras.append(self.pool.connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(outras[0], self.pool.connection())
+
+    def test_pragmas(self):
+        """Testa se o modo WAL é ativado nas conexões do pool."""
+        modo = self.pool.fetchone("PRAGMA journal_mode")[0]
+        self.assertEqual(modo.lower(), "wal")
+
+    def test_pragmas_rede(self):
+        """Testa o journal de rollback em compartilhamentos de rede e os pragmas passados a get_pool."""
+        self.assertFalse(em_compartilhamento_de_rede(self.db_path))
+        with mock.patch("db_manager.em_compartilhamento_de_rede", return_value=True):
+            pool = ConnectionPool(self.db_path)
+        self.assertEqual(pool.pragmas, PRAGMAS_REDE)
+        self.pool.close_all()
+        self.assertEqual(pool.fetchone("PRAGMA journal_mode")[0].lower(), "delete")
+        pool.close_all()
+        outro = os.path.join(self.tmpdir.name, "outro.db")
+        pool = get_pool(outro, pragmas={"journal_mode": "DELETE"})
+        self.assertEqual(pool.fetchone("PRAGMA journal_mode")[0].lower(), "delete")
+        self.assertIs(get_pool(outro), pool)
+        pool.close_all()
+
+    def test_latency_counters(self):
+        """Testa os contadores de latência por consulta."""
+        for _ in range(3):
+            self.pool.fetchone("SELECT * FROM pecas WHERE cod_peca = ?", ("10",), label="busca")
+        stats = self.pool.stats()["busca"]
+        self.assertEqual(stats["count"], 3)
+        self.assertGreaterEqual(stats["max_ms"], stats["avg_ms"])
+
+    def test_migrar_esquema(self):
+        """Testa as migrações: aplicadas uma única vez e usadas pela ordenação da tabela de peças."""
+        self.assertEqual(migrar_esquema(self.db_path), len(MIGRACOES))
+        self.assertEqual(migrar_esquema(self.db_path), 0)
+        pool = get_pool(self.db_path)
+        self.assertEqual(pool.fetchone("PRAGMA user_version")[0], len(MIGRACOES))
+        plano = " ".join(str(linha) for linha in pool.fetchall(
+            "EXPLAIN QUERY PLAN SELECT cod_peca FROM pecas WHERE (largura, cod_peca) > (?, ?) "
+            "ORDER BY largura, cod_peca LIMIT 10", (1.0, "")))
+        self.assertIn("idx_pecas_largura", plano)
+        self.assertNotIn("TEMP B-TREE", plano)
+        pool.close_all()
+
+    def test_shared_pool(self):
+        """Testa se DatabaseHandler compartilha o pool do mesmo arquivo."""
+        handler = DatabaseHandler(self.db_path)
+        self.assertIs(handler.pool, get_pool(self.db_path))
+        self.assertEqual(handler.buscar_peca_por_codigo("200"), {"comprimento": 200.0, "largura": 100.0})
+        self.assertIsNone(handler.buscar_peca_por_codigo("inexistente"))
+        handler.pool.close_all()
+
+if __name__ == "__main__":
+    unittest.main()
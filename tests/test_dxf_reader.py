@@ -0,0 +1,102 @@
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from logic import dxf_reader
+from logic.dxf_reader import areas_peca, carregar_geometria, geometria_dxf, ler_dxf, salvar_geometria
+from logic.geometry import polygon_area
+
+
+def escrever_dxf(caminho, entidades):
+    """Grava um DXF ASCII mínimo com as entidades informadas (listas de pares código/valor)."""
+    linhas = ["0", "SECTION", "2", "HEADER", "9", "$INSUNITS", "70", "4", "0", "ENDSEC", "0", "SECTION", "2", "ENTITIES"]
+    for entidade in entidades:
+        for codigo, valor in entidade:
+            linhas += [str(codigo), str(valor)]
+    linhas += ["0", "ENDSEC", "0", "EOF"]
+    with open(caminho, "w") as file:
+        file.write("\n".join(linhas) + "\n")
+
+
+def linha(x1, y1, x2, y2):
+    return [(0, "LINE"), (8, "0"), (10, x1), (20, y1), (30, 0), (11, x2), (21, y2), (31, 0)]
+
+
+class TestDxfReader(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.tmpdir.name, "peca.dxf")
+        self.cache = os.path.join(self.tmpdir.name, "cache")
+        # Placa 100 x 50 feita de linhas soltas (fora de ordem e invertidas), com um furo circular de raio 10
+        escrever_dxf(self.caminho, [
+            linha(100, 0, 100, 50), linha(0, 0, 100, 0), linha(0, 50, 100, 50), linha(0, 50, 0, 0),
+            [(0, "CIRCLE"), (10, 50), (20, 25), (40, 10)],
+            [(0, "TEXT"), (10, 0), (20, 0), (1, "ignorado")],
+        ])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_linhas_encadeadas(self):
+        """Testa o encadeamento de linhas soltas em um contorno e as áreas líquida e bruta."""
+        contornos = ler_dxf(self.caminho)
+        self.assertEqual(len(contornos), 2)
+        self.assertEqual(sorted(len(c) for c in contornos)[0], 4)
+        liquida, bruta = areas_peca(contornos)
+        self.assertAlmostEqual(bruta, 5000)  # mm², como as áreas já gravadas em pecas
+        # O furo é aproximado por um polígono inscrito: erro relativo abaixo de 1%
+        self.assertAlmostEqual(liquida, 5000 - math.pi * 100, delta=math.pi * 100 * 0.01)
+
+    def test_arcos_e_bojos(self):
+        """Testa ARC encadeado com LINE e LWPOLYLINE fechada com bojo (ambos formando um oblongo)."""
+        escrever_dxf(self.caminho, [
+            # Oblongo 100 x 20 com extremidades semicirculares, feito de linhas e arcos
+            linha(0, 0, 100, 0), linha(100, 20, 0, 20),
+            [(0, "ARC"), (10, 100), (20, 10), (40, 10), (50, 270), (51, 90)],
+            [(0, "ARC"), (10, 0), (20, 10), (40, 10), (50, 90), (51, 270)],
+            # O mesmo oblongo como polilinha com bojo 1 (semicírculo) nos trechos curvos, deslocado em y
+            [(0, "LWPOLYLINE"), (90, 4), (70, 1), (10, 0), (20, 100), (10, 100), (20, 100), (42, 1),
+             (10, 100), (20, 120), (10, 0), (20, 120), (42, 1)],
+        ])
+        contornos = ler_dxf(self.caminho, tolerancia=0.01)
+        self.assertEqual(len(contornos), 2)
+        esperado = 100 * 20 + math.pi * 100
+        for contorno in contornos:
+            self.assertAlmostEqual(polygon_area(contorno), esperado, delta=esperado * 1e-3)
+            self.assertAlmostEqual(np.ptp(contorno[:, 0]), 120, delta=0.01)
+
+    def test_formato_binario(self):
+        """Testa a gravação e a leitura do cache binário de contornos."""
+        contornos = [np.array([[0, 0], [1, 0], [1, 1]], float), np.array([[5, 5], [6, 5], [6, 6], [5, 6]], float)]
+        arquivo = os.path.join(self.tmpdir.name, "geo.bin")
+        salvar_geometria(contornos, arquivo)
+        lidos = carregar_geometria(arquivo)
+        self.assertEqual(len(lidos), 2)
+        for original, lido in zip(contornos, lidos):
+            np.testing.assert_array_equal(original, lido)
+        with open(arquivo, "r+b") as file:
+            file.truncate(40)
+        with self.assertRaises(ValueError):
+            carregar_geometria(arquivo)
+
+    def test_cache_por_mtime(self):
+        """Testa se o cache evita uma nova leitura e é invalidado quando o arquivo muda."""
+        primeira = geometria_dxf(self.caminho, diretorio=self.cache)
+        with mock.patch.object(dxf_reader, "ler_dxf", wraps=dxf_reader.ler_dxf) as leitor:
+            segunda = geometria_dxf(self.caminho, diretorio=self.cache)
+            leitor.assert_not_called()
+            self.assertEqual(len(primeira), len(segunda))
+            for a, b in zip(primeira, segunda):
+                np.testing.assert_array_equal(a, b)
+            escrever_dxf(self.caminho, [linha(0, 0, 10, 0), linha(10, 0, 10, 10), linha(10, 10, 0, 0)])
+            info = os.stat(self.caminho)
+            os.utime(self.caminho, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+            terceira = geometria_dxf(self.caminho, diretorio=self.cache)
+            leitor.assert_called_once()
+        self.assertEqual(len(terceira), 1)
+        self.assertAlmostEqual(polygon_area(terceira[0]), 50.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+import numpy as np
+from logic.geometry import as_array, clip_to_rect, is_simple, polygon_area, polygon_centroid, signed_area, sobra_area
+
+class TestGeometry(unittest.TestCase):
+    def test_area_and_centroid(self):
+        """Testa a área (com e sem sinal) e o centroide de um retângulo e de um triângulo."""
+        quadrado = np.array([[0, 0], [100, 0], [100, 50], [0, 50]])
+        self.assertAlmostEqual(signed_area(quadrado), 5000)
+        self.assertAlmostEqual(signed_area(quadrado[::-1]), -5000)
+        self.assertEqual(polygon_centroid(quadrado), (50.0, 25.0))
+        triangulo = [(0, 0), (30, 0), (0, 30)]
+        self.assertAlmostEqual(polygon_area(triangulo), 450)
+        np.testing.assert_allclose(polygon_centroid(triangulo), (10, 10))
+
+    def test_is_simple(self):
+        """Testa a detecção de auto-interseção (laço em oito, vértice repetido e polígono simples)."""
+        self.assertTrue(is_simple([(0, 0), (10, 0), (10, 10), (0, 10)]))
+        self.assertFalse(is_simple([(0, 0), (10, 10), (10, 0), (0, 10)]))
+        self.assertFalse(is_simple([(0, 0), (10, 0), (5, 5), (10, 10), (0, 10), (5, 5)]))
+        self.assertFalse(is_simple([(0, 0), (10, 0), (5, 0)]))
+        self.assertTrue(is_simple([(0, 0), (10, 0), (10, 10), (0, 0)]))  # Fechamento explícito
+
+    def test_is_simple_matches_brute_force(self):
+        """Testa a varredura contra a verificação de todos os pares de arestas."""
+        from logic.geometry import _cruzam
+        def todos_os_pares(pontos):
+            n = len(pontos)
+            for i in range(n):
+                for j in range(i + 2, n):
+                    if i == 0 and j == n - 1:
+                        continue
+                    if _cruzam(pontos[i], pontos[(i + 1) % n], pontos[j], pontos[(j + 1) % n]):
+                        return False
+            return True
+        rng = random.Random(3)
+        for _ in range(300):
+            n = rng.randint(4, 20)
+            angulos = np.sort([rng.random() for _ in range(n)]) * 2 * np.pi
+            raios = np.array([rng.uniform(1, 10) for _ in range(n)])
+            pontos = np.c_[raios * np.cos(angulos), raios * np.sin(angulos)]
+            pontos[rng.randrange(n)] += (rng.uniform(-8, 8), rng.uniform(-8, 8))
+            self.assertEqual(is_simple(pontos), todos_os_pares([tuple(p) for p in pontos.tolist()]))
+
+    def test_clip_to_rect(self):
+        """Testa o recorte pela chapa."""
+        maior = np.array([[-5, -5], [15, -5], [15, 15], [-5, 15]])
+        self.assertAlmostEqual(polygon_area(clip_to_rect(maior, 0, 0, 10, 10)), 100)
+        triangulo = np.array([[5, 5], [20, 5], [5, 20]])
+        self.assertAlmostEqual(polygon_area(clip_to_rect(triangulo, 0, 0, 10, 10)), 25)
+        self.assertEqual(len(clip_to_rect(triangulo + 100, 0, 0, 10, 10)), 0)
+
+    def test_sobra_area(self):
+        """Testa a área da sobra em m², recortada pela chapa, e a rejeição de polígonos inválidos."""
+        self.assertAlmostEqual(sobra_area([(0, 0), (1000, 0), (1000, 1000)]), 0.5)
+        self.assertAlmostEqual(sobra_area([(-500, 0), (1000, 0), (1000, 1000), (-500, 1000)], 500, 500), 0.25)
+        with self.assertRaises(ValueError):
+            sobra_area([(0, 0), (10, 10), (10, 0), (0, 10)])
+
+    def test_as_array(self):
+        """Testa a conversão de listas de tuplas."""
+        self.assertEqual(as_array([(1, 2), (3, 4)]).shape, (2, 2))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import json
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from PyQt5.QtWidgets import QApplication
+from utils.instrumentation import SpanRecorder, instrument, recorder
+from utils.startup_profile import ImportTimer, startup_report
+from ui.stats_panel import StatsPanel
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class Exemplo:
+    @instrument("teste")
+    def acao(self):
+        return "ok"
+
+    @instrument("teste", nome="soma")
+    def somar(self, a, b=0):
+        return a + b
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        recorder.reset()
+        recorder.ativo = True
+
+    def tearDown(self):
+        recorder.reset()
+        recorder.ativo = True
+
+    def test_histograma(self):
+        """Contagem, percentis e máximo são calculados a partir das durações registradas."""
+        registro = SpanRecorder()
+        for ms in range(1, 101):
+            registro.record("op", "teste", 0.0, ms / 1000)
+        stats = registro.stats()["op"]
+        self.assertEqual(stats["count"], 100)
+        self.assertAlmostEqual(stats["p50_ms"], 51.0)
+        self.assertAlmostEqual(stats["p95_ms"], 96.0)
+        self.assertAlmostEqual(stats["max_ms"], 100.0)
+        self.assertAlmostEqual(stats["avg_ms"], 50.5)
+        self.assertEqual(stats["categoria"], "teste")
+
+    def test_janela_limita_amostras(self):
+        """Os percentis usam só as amostras mais recentes; contagem e máximo consideram todas."""
+        registro = SpanRecorder(janela=10)
+        registro.record("op", "teste", 0.0, 1.0)
+        for _ in range(10):
+            registro.record("op", "teste", 0.0, 0.001)
+        stats = registro.stats()["op"]
+        self.assertEqual(stats["count"], 11)
+        self.assertAlmostEqual(stats["p95_ms"], 1.0)
+        self.assertAlmostEqual(stats["max_ms"], 1000.0)
+
+    def test_instrument_repassa_argumentos(self):
+        """O decorador mede a chamada e repassa os argumentos; aridade errada continua gerando TypeError."""
+        exemplo = Exemplo()
+        self.assertEqual(exemplo.acao(), "ok")
+        self.assertEqual(exemplo.somar(2, b=3), 5)
+        with self.assertRaises(TypeError):
+            exemplo.acao(False)
+        with self.assertRaises(TypeError):
+            exemplo.somar(2, 3, True)
+        stats = recorder.stats()
+        self.assertEqual(stats["Exemplo.acao"]["count"], 2)  # A chamada que falhou também é medida
+        self.assertEqual(stats["soma"]["count"], 2)
+
+    def test_desativado_nao_registra(self):
+        """Com o registro desativado, as funções instrumentadas rodam sem gerar spans."""
+        recorder.ativo = False
+        Exemplo().acao()
+        self.assertEqual(recorder.stats(), {})
+
+    def test_exportar_trace_chrome(self):
+        """O trace exportado tem um evento completo ("X") por span, em microssegundos."""
+        registro = SpanRecorder()
+        with registro.span("externo", "teste"):
+            with registro.span("interno", "teste"):
+                pass
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "trace.json")
+            self.assertEqual(registro.export_chrome_trace(caminho), 2)
+            with open(caminho, encoding="utf-8") as f:
+                trace = json.load(f)
+        completos = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+        self.assertEqual(set(completos), {"externo", "interno"})
+        externo, interno = completos["externo"], completos["interno"]
+        self.assertLessEqual(externo["ts"], interno["ts"])
+        self.assertGreaterEqual(externo["ts"] + externo["dur"], interno["ts"] + interno["dur"])
+        self.assertTrue(any(e["ph"] == "M" for e in trace["traceEvents"]))
+
+    def test_painel_exibe_operacoes(self):
+        """O painel lista uma linha por operação, com a contagem de chamadas."""
+        registro = SpanRecorder()
+        registro.record("lenta", "teste", 0.0, 0.5)
+        registro.record("rapida", "teste", 0.0, 0.001)
+        registro.record("rapida", "teste", 0.0, 0.001)
+        painel = StatsPanel(span_recorder=registro)
+        painel.atualizar()
+        self.assertEqual(painel.table.rowCount(), 2)
+        self.assertEqual(painel.table.item(0, 0).text(), "lenta")  # Ordenado pelo p95
+        self.assertEqual(painel.table.item(1, 1).text(), "2")
+        painel.zerar()
+        self.assertEqual(painel.table.rowCount(), 0)
+
+    def test_import_timer(self):
+        """As importações feitas com o medidor instalado viram spans "import" no relatório de inicialização."""
+        registro = SpanRecorder()
+        medidor = ImportTimer(registro)
+        sys.modules.pop("colorsys", None)
+        medidor.install()
+        try:
+            modulo = importlib.import_module("colorsys")
+        finally:
+            medidor.uninstall()
+        self.assertIn("import colorsys", registro.stats())
+        self.assertEqual(modulo.rgb_to_hsv(1.0, 0.0, 0.0)[0], 0.0)
+        with registro.span("MainWindow: Canvas", "startup"):
+            pass
+        relatorio = startup_report(registro)
+        self.assertIn("colorsys", relatorio)
+        self.assertIn("MainWindow: Canvas", relatorio)
+
+    def test_toolbar_importa_modulos_pesados_sob_demanda(self):
+        """Importar a barra de ferramentas não carrega os módulos de cálculo, de banco e da tabela de peças."""
+        pesados = ("numpy", "utils.calculations", "utils.packing", "utils.calc_cache", "db_manager",
+                   "query_executor", "ui.pecas_table_model")
+        codigo = (
+            "import sys\n"
+            "import ui.toolbar_extended\n"
+            f"print(','.join(m for m in {pesados!r} if m in sys.modules))"
+        )
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        saida = subprocess.run([sys.executable, "-c", codigo], cwd=raiz, capture_output=True, text=True, check=True,
+                               env=dict(os.environ, QT_QPA_PLATFORM="offscreen"))
+        self.assertEqual(saida.stdout.strip(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import unittest
+import struct
+import numpy as np
+from logic.layout_format import VERSAO, is_layout_file, json_to_layout, layout_to_json, load_layout, save_layout
+from logic.object_manager import ObjectManager
+from logic.object_store import ObjectStore
+
+class TestLayoutFormat(unittest.TestCase):
+    def setUp(self):
+        """Cria um armazenamento com círculos e um polígono."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.tmpdir.name, "objetos.layout")
+        self.store = ObjectStore()
+        self.store.extend([{"type": "circle", "data": {"x": i, "y": 2 * i, "radius": 3}} for i in range(1000)])
+        self.store.add("polygon", {"points": [[0, 0], [10, 0], [0, 10]], "closed": True})
+        self.store.remove_at(1)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_roundtrip_mmap(self):
+        """Testa se o layout gravado é lido de volta por mmap, sem copiar as colunas."""
+        save_layout(self.store, self.caminho)
+        self.assertTrue(is_layout_file(self.caminho))
+        carregado = load_layout(self.caminho)
+        self.assertEqual(len(carregado), 1000)
+        colunas = carregado.columns("circle")
+        self.assertFalse(colunas["x"].flags.writeable)
+        self.assertEqual(carregado.to_list(), self.store.to_list())
+
+    def test_formas_preservadas(self):
+        """Testa se os inteiros e a ordem dos campos sobrevivem à gravação e à leitura do layout."""
+        obj_id = self.store.add("circle", {"radius": 1.5, "x": 7, "y": 8})
+        save_layout(self.store, self.caminho)
+        data = load_layout(self.caminho).get(obj_id)["data"]
+        self.assertEqual(list(data), ["radius", "x", "y"])
+        self.assertIs(type(data["x"]), int)
+        self.assertIs(type(data["radius"]), float)
+
+    def test_mutation_after_load(self):
+        """Testa se o armazenamento mapeado aceita alterações (cópia na primeira escrita)."""
+        save_layout(self.store, self.caminho)
+        carregado = load_layout(self.caminho)
+        novo_id = carregado.add("circle", {"x": -1, "y": -1, "radius": 1})
+        carregado.remove_at(0)
+        carregado.compact()
+        self.assertEqual(carregado.get(novo_id)["data"]["x"], -1)
+        np.testing.assert_array_equal(carregado.columns("circle")["x"][:2], [2, 3])
+
+    def test_clear_after_load(self):
+        """Testa se o armazenamento mapeado aceita novos objetos depois de ser limpo."""
+        save_layout(self.store, self.caminho)
+        carregado = load_layout(self.caminho)
+        carregado.clear()
+        novo_id = carregado.add("circle", {"x": 5, "y": 6, "radius": 1})
+        self.assertEqual(carregado.to_list(), [{"type": "circle", "data": {"x": 5, "y": 6, "radius": 1}}])
+        self.assertEqual(carregado.index_of(novo_id), 0)
+
+    def test_object_manager_clear_after_load(self):
+        """Testa clear_objects seguido de add_object em um layout reaberto (modo write-behind)."""
+        save_layout(self.store, self.caminho)
+        manager = ObjectManager(self.caminho, flush_interval=60)
+        manager.clear_objects()
+        manager.add_object("circle", {"x": 1, "y": 1, "radius": 2})
+        self.assertEqual(manager.count_objects(), 1)
+        manager.flush()
+        self.assertEqual(ObjectManager(self.caminho).count_objects(), 1)
+
+    def test_outra_versao_rejeitada(self):
+        """Testa se um arquivo de outra versão do formato é recusado."""
+        save_layout(self.store, self.caminho)
+        with open(self.caminho, "r+b") as file:
+            file.seek(8)
+            file.write(struct.pack("<I", VERSAO - 1))
+        with self.assertRaises(ValueError):
+            load_layout(self.caminho)
+
+    def test_json_converters(self):
+        """Testa a conversão entre JSON e o formato binário nos dois sentidos."""
+        json_path = os.path.join(self.tmpdir.name, "objetos.json")
+        with open(json_path, "w") as file:
+            json.dump(self.store.to_list(), file)
+        self.assertEqual(json_to_layout(json_path, self.caminho), 1000)
+        volta = os.path.join(self.tmpdir.name, "volta.json")
+        layout_to_json(self.caminho, volta)
+        with open(volta, "r") as file:
+            self.assertEqual(json.load(file), self.store.to_list())
+
+    def test_object_manager_binary(self):
+        """Testa o ObjectManager persistindo no formato binário."""
+        manager = ObjectManager(self.caminho, flush_interval=60)
+        manager.add_objects("circle", [{"x": 1, "y": 1, "radius": 2}] * 5)
+        manager.flush()
+        reaberto = ObjectManager(self.caminho, flush_interval=60)
+        self.assertEqual(reaberto.count_objects(), 5)
+        reaberto.remove_object(0)
+        reaberto.flush()
+        self.assertEqual(ObjectManager(self.caminho).count_objects(), 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import logging
+import os
+import tempfile
+import unittest
+from logging.handlers import QueueHandler
+from utils.logger import LOGGER_NAME, log_sampled, set_log_level, setup_logger, shutdown_logger
+
+
+class ColetorHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.mensagens = []
+
+    def emit(self, record):
+        self.mensagens.append(record.getMessage())
+
+
+class TestLogger(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger(LOGGER_NAME)
+        self.nivel_original = self.logger.level
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        shutdown_logger()
+        for handler in [h for h in self.logger.handlers if isinstance(h, QueueHandler)]:
+            self.logger.removeHandler(handler)
+        self.logger.setLevel(self.nivel_original)
+        self.dir.cleanup()
+
+    def test_escrita_em_segundo_plano_no_arquivo(self):
+        """Os registros passam pela fila e chegam ao arquivo rotativo ao parar o escritor."""
+        arquivo = os.path.join(self.dir.name, "logs", "app.log")
+        setup_logger(nivel="INFO", arquivo=arquivo, console=False)
+        self.logger.info("Peça %s calculada", "ABC")
+        self.logger.debug("não deve aparecer")
+        shutdown_logger()
+        with open(arquivo, encoding="utf-8") as f:
+            conteudo = f.read()
+        self.assertIn("Peça ABC calculada", conteudo)
+        self.assertNotIn("não deve aparecer", conteudo)
+
+    def test_reconfigurar_nao_duplica_handlers(self):
+        """Chamar setup_logger de novo substitui o handler da fila em vez de acumular."""
+        setup_logger(console=False)
+        setup_logger(console=False)
+        filas = [h for h in self.logger.handlers if isinstance(h, QueueHandler)]
+        self.assertEqual(len(filas), 1)
+
+    def test_set_log_level(self):
+        """O nível pode ser trocado em tempo de execução, por nome ou número, e desligado com OFF."""
+        self.assertEqual(set_log_level("debug"), logging.DEBUG)
+        self.assertTrue(self.logger.isEnabledFor(logging.DEBUG))
+        set_log_level("OFF")
+        self.assertFalse(self.logger.isEnabledFor(logging.CRITICAL))
+        with self.assertRaises(ValueError):
+            set_log_level("VERBOSO")
+
+    def test_log_sampled_suprime_e_conta(self):
+        """Dentro do intervalo só o primeiro registro é emitido; os suprimidos são informados depois."""
+        coletor = ColetorHandler()
+        logger = logging.getLogger("teste_amostragem")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(coletor)
+        try:
+            emitidos = [log_sampled(logger, logging.DEBUG, "teste", 60.0, "arraste %d", i) for i in range(100)]
+            self.assertEqual(sum(emitidos), 1)
+            self.assertEqual(coletor.mensagens, ["arraste 0"])
+            self.assertTrue(log_sampled(logger, logging.DEBUG, "teste", 0.0, "arraste %d", 100))
+            self.assertEqual(coletor.mensagens[-1], "arraste 100 (+99 suprimidas)")
+            # Nível desabilitado: nada é formatado nem contado
+            logger.setLevel(logging.INFO)
+            self.assertFalse(log_sampled(logger, logging.DEBUG, "outro", 0.0, "x"))
+        finally:
+            logger.removeHandler(coletor)
+
+
+if __name__ == '__main__':
+    unittest.main()
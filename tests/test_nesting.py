@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+from logic.nesting import grid_centers, hex_centers, compute_centers, points_in_polygon, distance_to_edges, polygon_centers
+
+class TestNesting(unittest.TestCase):
+    def test_grid_centers(self):
+        """Testa a distribuição em grade quadrada."""
+        centers = grid_centers(200, 100, 10)
+        self.assertEqual(centers.shape, (50, 2), "A grade deveria ter 10 colunas e 5 linhas.")
+        np.testing.assert_allclose(centers[0], (10, 10))
+        np.testing.assert_allclose(centers[-1], (190, 90))
+
+    def test_hex_centers_inside_rectangle(self):
+        """Testa se todos os círculos hexagonais ficam dentro do retângulo sem sobreposição."""
+        radius = 10
+        centers = hex_centers(200, 200, radius)
+        self.assertGreater(len(centers), len(grid_centers(200, 200, radius)))
+        self.assertTrue(np.all(centers - radius >= -1e-9))
+        self.assertTrue(np.all(centers[:, 0] + radius <= 200 + 1e-9))
+        self.assertTrue(np.all(centers[:, 1] + radius <= 200 + 1e-9))
+        distances = np.linalg.norm(centers[:, np.newaxis] - centers[np.newaxis, :], axis=-1)
+        np.fill_diagonal(distances, np.inf)
+        self.assertGreaterEqual(distances.min(), 2 * radius - 1e-9)
+
+    def test_small_rectangle(self):
+        """Testa um retângulo menor que o diâmetro."""
+        self.assertEqual(len(compute_centers(5, 5, 10)), 0)
+        self.assertEqual(len(compute_centers(5, 5, 10, "hexagonal")), 0)
+
+    def test_invalid_layout(self):
+        """Testa a rejeição de layouts desconhecidos."""
+        with self.assertRaises(ValueError):
+            compute_centers(100, 100, 5, "triangular")
+
+    def test_points_in_polygon(self):
+        """Testa o teste de ponto no polígono em um polígono em L."""
+        poligono = np.array([[0, 0], [30, 0], [30, 10], [10, 10], [10, 30], [0, 30]])
+        pontos = np.array([[5, 5], [20, 5], [20, 20], [5, 25], [-1, 5], [40, 40]])
+        np.testing.assert_array_equal(points_in_polygon(pontos, poligono), [True, True, False, True, False, False])
+
+    def test_distance_to_edges(self):
+        """Testa a distância até as arestas, inclusive a poda pelo limite."""
+        quadrado = np.array([[0, 0], [100, 0], [100, 100], [0, 100]])
+        np.testing.assert_allclose(distance_to_edges([[50, 50], [10, 20], [150, 50]], quadrado), [50, 10, 50])
+        np.testing.assert_allclose(distance_to_edges([[50, 50]], quadrado, limite=5), [5])
+
+    def test_polygon_centers(self):
+        """Testa a distribuição em um polígono irregular: peças inteiras dentro e sem sobreposição."""
+        radius = 5
+        poligono = np.array([[0, 0], [300, 0], [300, 100], [100, 100], [100, 300], [0, 300]])
+        centers = polygon_centers(poligono, radius)
+        self.assertGreater(len(centers), 450)
+        self.assertTrue(points_in_polygon(centers, poligono).all())
+        self.assertTrue(np.all(distance_to_edges(centers, poligono) >= radius - 1e-9))
+        distances = np.linalg.norm(centers[:, np.newaxis] - centers[np.newaxis, :], axis=-1)
+        np.fill_diagonal(distances, np.inf)
+        self.assertGreaterEqual(distances.min(), 2 * radius - 1e-9)
+
+    def test_polygon_centers_matches_rectangle(self):
+        """Testa se, em um retângulo, o resultado não é pior que a distribuição no retângulo."""
+        quadrado = np.array([[0, 0], [200, 0], [200, 200], [0, 200]])
+        for layout in ("grade", "hexagonal"):
+            self.assertGreaterEqual(len(polygon_centers(quadrado, 10, layout)), len(compute_centers(200, 200, 10, layout)))
+
+if __name__ == "__main__":
+    unittest.main()
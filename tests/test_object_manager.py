@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from logic.object_manager import ObjectManager
+
+class TestObjectManager(unittest.TestCase):
+    def setUp(self):
+        """Usa um arquivo de objetos em diretório temporário."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmpdir.name, "objects.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def ler_arquivo(self):
+        with open(self.config_file, "r") as file:
+            return json.load(file)
+
+    def test_write_behind_journal(self):
+        """Testa se as alterações vão para o journal e só são consolidadas no flush."""
+        manager = ObjectManager(self.config_file, flush_interval=60)
+        manager.add_objects("circle", [{"radius": r} for r in range(100)])
+        manager.add_object("rectangle", {"width": 10, "height": 5})
+        manager.remove_object(0)
+        self.assertFalse(os.path.exists(self.config_file))
+        with open(manager.journal_file, "r") as file:
+            self.assertEqual(len(file.readlines()), 3)
+        manager.flush()
+        self.assertEqual(len(self.ler_arquivo()), 100)
+        self.assertFalse(os.path.exists(manager.journal_file))
+
+    def test_recover_from_journal(self):
+        """Testa a recuperação após uma queda: o journal é reaplicado e uma linha incompleta é ignorada."""
+        manager = ObjectManager(self.config_file, flush_interval=60)
+        manager.add_object("circle", {"radius": 1})
+        manager.flush()
+        manager.add_object("circle", {"radius": 2})
+        manager.clear_objects()
+        manager.add_object("circle", {"radius": 3})
+        manager._timer.cancel()  # Simula a queda antes da gravação agendada
+        with open(manager.journal_file, "a") as file:
+            file.write('{"op":"add","obj')
+        recuperado = ObjectManager(self.config_file, flush_interval=60)
+        self.assertEqual(recuperado.get_objects(), [{"type": "circle", "data": {"radius": 3}}])
+        self.assertEqual(self.ler_arquivo(), recuperado.get_objects())
+        self.assertFalse(os.path.exists(recuperado.journal_file))
+
+    def test_queda_apos_substituir_arquivo(self):
+        """Testa uma queda entre a substituição do arquivo e a remoção do journal: nada é reaplicado duas vezes."""
+        manager = ObjectManager(self.config_file, flush_interval=60)
+        manager.add_objects("circle", [{"radius": r} for r in range(3)])
+        manager.remove_object(0)
+        manager._timer.cancel()
+        with mock.patch("logic.object_manager.os.remove", side_effect=OSError("queda")):
+            manager.flush()
+        self.assertTrue(os.path.exists(manager.journal_consolidando))
+        manager._dirty = False  # O processo "caiu": nada mais é gravado por este gerenciador
+        recuperado = ObjectManager(self.config_file, flush_interval=60)
+        self.assertEqual([obj["data"]["radius"] for obj in recuperado.get_objects()], [1, 2])
+        self.assertFalse(os.path.exists(recuperado.journal_consolidando))
+
+    def test_queda_antes_de_substituir_arquivo(self):
+        """Testa uma queda depois de pôr o journal de lado e antes de substituir o arquivo."""
+        manager = ObjectManager(self.config_file, flush_interval=60)
+        manager.add_objects("circle", [{"radius": r} for r in range(3)])
+        manager.flush()
+        manager.remove_object(0)
+        manager._timer.cancel()
+        replace = os.replace
+        def cair_na_substituicao(origem, destino):
+            if destino == self.config_file:
+                raise OSError("queda")
+            replace(origem, destino)
+        with mock.patch("logic.object_manager.os.replace", side_effect=cair_na_substituicao):
+            manager.flush()
+        self.assertEqual(len(self.ler_arquivo()), 3)
+        manager._dirty = False
+        recuperado = ObjectManager(self.config_file, flush_interval=60)
+        self.assertEqual([obj["data"]["radius"] for obj in recuperado.get_objects()], [1, 2])
+        self.assertEqual(len(self.ler_arquivo()), 2)
+        self.assertFalse(os.path.exists(recuperado.journal_consolidando))
+
+    def test_timer_flush(self):
+        """Testa se o temporizador grava o arquivo após o intervalo."""
+        manager = ObjectManager(self.config_file, flush_interval=0.01)
+        with manager._lock:  # Impede que o temporizador dispare antes de guardarmos a referência
+            manager.add_object("circle", {"radius": 1})
+            timer = manager._timer
+        timer.join(1)
+        self.assertEqual(len(self.ler_arquivo()), 1)
+
+    def test_synchronous_mode(self):
+        """Testa o modo sem write-behind, que grava o arquivo a cada alteração."""
+        manager = ObjectManager(self.config_file, write_behind=False)
+        manager.add_object("circle", {"radius": 1})
+        self.assertEqual(len(self.ler_arquivo()), 1)
+        self.assertFalse(os.path.exists(manager.journal_file))
+
+    def test_listeners_e_update(self):
+        """Testa os avisos de alteração e a atualização de um objeto, inclusive pelo journal."""
+        manager = ObjectManager(self.config_file, flush_interval=60)
+        eventos = []
+        manager.add_listener(lambda evento, ids: eventos.append((evento, list(ids))))
+        ids = manager.add_objects("circle", [{"radius": 1}, {"radius": 2}])
+        manager.update_object(ids[1], {"radius": 5, "nome": "maior"})
+        manager.remove_object(0)
+        manager.clear_objects()
+        self.assertEqual(eventos, [("add", ids), ("update", [ids[1]]), ("remove", [ids[0]]), ("clear", [])])
+        manager.add_object("circle", {"radius": 1})
+        novo = manager.add_object("circle", {"radius": 2})
+        manager.update_object(novo, {"radius": 7})
+        manager._timer.cancel()  # Simula a queda antes da gravação agendada
+        recuperado = ObjectManager(self.config_file, flush_interval=60)
+        self.assertEqual([obj["data"]["radius"] for obj in recuperado.get_objects()], [1, 7])
+
+    def test_carga_adiada(self):
+        """Testa a carga em duas etapas: até aplicar os objetos lidos, o arquivo não é regravado."""
+        ObjectManager(self.config_file, write_behind=False).add_objects("circle", [{"radius": 1}, {"radius": 2}])
+        manager = ObjectManager(self.config_file, write_behind=False, load=False)
+        eventos = []
+        manager.add_listener(lambda evento, ids: eventos.append(evento))
+        self.assertEqual(manager.count_objects(), 0)
+        manager.add_object("circle", {"radius": 3})  # Antes da carga: vai para o journal
+        manager.flush()
+        self.assertEqual(len(self.ler_arquivo()), 2)
+        manager.apply_saved_objects(manager.read_saved_objects())
+        self.assertTrue(manager.loaded)
+        self.assertEqual([obj["data"]["radius"] for obj in manager.get_objects()], [1, 2, 3])
+        self.assertEqual(self.ler_arquivo(), manager.get_objects())
+        self.assertEqual(eventos, ["add", "reload"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import numpy as np
+from logic.object_store import ObjectStore, ObjectsView, COMPACTAR_MINIMO
+
+class TestObjectStore(unittest.TestCase):
+    def setUp(self):
+        """Cria um armazenamento com objetos de tipos variados."""
+        self.store = ObjectStore()
+        self.ids = [
+            self.store.add("circle", {"x": 1, "y": 2, "radius": 5}),
+            self.store.add("polygon", {"points": [[0, 0], [1, 0], [0, 1]]}),
+            self.store.add("circle", {"x": 3, "radius": 6, "label": "A"}),
+        ]
+
+    def test_roundtrip(self):
+        """Testa se os objetos voltam no formato de dicionário original."""
+        self.assertEqual(self.store.get(self.ids[0]), {"type": "circle", "data": {"x": 1, "y": 2, "radius": 5}})
+        self.assertEqual(self.store.get(self.ids[2]), {"type": "circle", "data": {"x": 3, "radius": 6, "label": "A"}})
+        self.assertEqual(self.store.get(self.ids[1])["data"]["points"][1], [1, 0])
+
+    def test_type_index_and_columns(self):
+        """Testa o índice por tipo e o acesso colunar."""
+        np.testing.assert_array_equal(self.store.ids("circle"), [self.ids[0], self.ids[2]])
+        colunas = self.store.columns("circle")
+        np.testing.assert_array_equal(colunas["radius"], [5, 6])
+        self.assertTrue(np.isnan(colunas["y"][1]))
+        self.assertEqual(len(self.store.ids("rectangle")), 0)
+
+    def test_remove_with_stable_ids(self):
+        """Testa se a remoção mantém os IDs e a ordem dos demais objetos."""
+        removido = self.store.remove_at(0)
+        self.assertEqual(removido["data"]["radius"], 5)
+        self.assertNotIn(self.ids[0], self.store)
+        self.assertEqual(self.store.id_at(0), self.ids[1])
+        self.assertEqual(self.store.get(self.ids[2])["data"]["label"], "A")
+        with self.assertRaises(KeyError):
+            self.store.remove(self.ids[0])
+
+    def test_compaction(self):
+        """Testa a compactação automática das lápides."""
+        ids = [self.store.add("circle", {"x": i, "y": 0, "radius": 1}) for i in range(COMPACTAR_MINIMO * 2)]
+        for obj_id in ids[::2]:
+            self.store.remove(obj_id)
+        self.assertLess(self.store._size, 3 + len(ids))
+        self.assertEqual(len(self.store), 3 + len(ids) // 2)
+        self.assertEqual(self.store.get(ids[-1])["data"]["x"], len(ids) - 1)
+        np.testing.assert_array_equal(self.store.columns("circle")["x"][2:], np.arange(1, len(ids), 2))
+
+    def test_tipos_e_ordem_preservados(self):
+        """Testa se inteiros voltam como int, floats como float e as chaves na ordem original."""
+        obj_id = self.store.add("circle", {"radius": 2.5, "label": "B", "x": 4, "y": 1.0})
+        data = self.store.get(obj_id)["data"]
+        self.assertEqual(list(data), ["radius", "label", "x", "y"])
+        self.assertIs(type(data["x"]), int)
+        self.assertIs(type(data["y"]), float)
+        self.assertIs(type(self.store.get(self.ids[0])["data"]["x"]), int)
+        grande = self.store.add("circle", {"x": 2 ** 60, "y": 0, "radius": 1})
+        self.assertEqual(self.store.get(grande)["data"]["x"], 2 ** 60)  # Sem perda de precisão
+
+    def test_index_of_com_lapides(self):
+        """Testa se index_of e id_at concordam com a ordem dos vivos enquanto há lápides."""
+        ids = self.ids + [self.store.add("circle", {"x": i, "y": 0, "radius": 1}) for i in range(200)]
+        removidos = set(ids[1::3]) | {ids[-1]}
+        for obj_id in removidos:
+            self.store.remove(obj_id)
+        self.store.add("circle", {"x": -1, "y": 0, "radius": 1})  # Crescimento com lápides pendentes
+        vivos = [int(obj_id) for obj_id in self.store.ids()]
+        self.assertTrue(self.store._dead)
+        for indice, obj_id in enumerate(vivos):
+            self.assertEqual(self.store.index_of(obj_id), indice)
+            self.assertEqual(self.store.id_at(indice), obj_id)
+        with self.assertRaises(KeyError):
+            self.store.index_of(ids[1])
+
+    def test_view(self):
+        """Testa a visão compatível com lista de dicionários."""
+        view = ObjectsView(self.store)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view[-1]["data"]["label"], "A")
+        self.assertEqual([obj["type"] for obj in view], ["circle", "polygon", "circle"])
+        self.assertEqual(view, self.store.to_list())
+
+if __name__ == "__main__":
+    unittest.main()
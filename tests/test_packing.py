@@ -0,0 +1,100 @@
+import unittest
+import numpy as np
+from utils.packing import empacotar_circulos, empacotar_misto, resolver_guilhotina
+from utils.calculations import calcular_multiplo_ideal
+
+def sobrepostas(posicoes, kerf=0.0):
+    """Verifica se algum par de peças se sobrepõe (considerando o kerf)."""
+    x, y, w, h = posicoes.T
+    sep_x = (x[:, None] + w[:, None] + kerf <= x[None, :] + 1e-9) | (x[None, :] + w[None, :] + kerf <= x[:, None] + 1e-9)
+    sep_y = (y[:, None] + h[:, None] + kerf <= y[None, :] + 1e-9) | (y[None, :] + h[None, :] + kerf <= y[:, None] + 1e-9)
+    separadas = sep_x | sep_y
+    np.fill_diagonal(separadas, True)
+    return not separadas.all()
+
+class TestPacking(unittest.TestCase):
+    def test_rotation_beats_fixed_grid(self):
+        """Testa se misturar orientações supera a grade fixa (3 x 3 = 9)."""
+        total, posicoes = resolver_guilhotina(100, 70, 30, 20)
+        self.assertEqual(total, 11)
+        self.assertEqual(len(posicoes), 11)
+        self.assertFalse(sobrepostas(posicoes))
+        self.assertTrue(np.all(posicoes[:, 0] + posicoes[:, 2] <= 100 + 1e-9))
+        self.assertTrue(np.all(posicoes[:, 1] + posicoes[:, 3] <= 70 + 1e-9))
+
+    def test_kerf(self):
+        """Testa se o kerf é respeitado entre peças vizinhas."""
+        total, posicoes = resolver_guilhotina(100, 100, 20, 20, kerf=5)
+        self.assertEqual(total, 16)
+        self.assertFalse(sobrepostas(posicoes, kerf=5))
+
+    def test_never_worse_than_grid(self):
+        """Testa se o resultado nunca é menor que a grade de orientação fixa."""
+        for chapa, peca in [((3000, 1500), (170, 95)), ((1000, 500), (100, 50)), ((1250, 2500), (333, 121))]:
+            grade = (chapa[0] // peca[0]) * (chapa[1] // peca[1])
+            total, _ = resolver_guilhotina(*chapa, *peca)
+            self.assertGreaterEqual(total, grade)
+
+    def test_cache_and_vertical_strips(self):
+        """Testa o cache LRU e as faixas verticais (chapa transposta)."""
+        primeiro = resolver_guilhotina(70, 100, 20, 30)
+        self.assertIs(resolver_guilhotina(70, 100, 20, 30), primeiro)
+        self.assertEqual(primeiro[0], 11)
+        self.assertFalse(sobrepostas(primeiro[1]))
+
+    def test_empacotar_circulos(self):
+        """Testa se o arranjo de círculos supera a grade e respeita bordas e distâncias."""
+        total, centros = empacotar_circulos(1000, 500, 20)
+        self.assertEqual(total, 343)  # Grade quadrada: 25 x 12 = 300
+        self.assertEqual(len(centros), total)
+        self.assertTrue(np.all(centros - 20 >= -1e-9))
+        self.assertTrue(np.all(centros + 20 <= (1000 + 1e-9, 500 + 1e-9)))
+        distancias = np.linalg.norm(centros[:, None] - centros[None, :], axis=-1)
+        np.fill_diagonal(distancias, np.inf)
+        self.assertGreaterEqual(distancias.min(), 40 - 1e-9)
+
+    def test_empacotar_circulos_kerf_margem(self):
+        """Testa o kerf entre peças e a margem nas bordas."""
+        total, centros = empacotar_circulos(1000, 500, 20, kerf=3, margem=10)
+        self.assertLess(total, 343)
+        self.assertTrue(np.all(centros - 30 >= -1e-9))
+        self.assertTrue(np.all(centros + 30 <= (1000 + 1e-9, 500 + 1e-9)))
+        distancias = np.linalg.norm(centros[:, None] - centros[None, :], axis=-1)
+        np.fill_diagonal(distancias, np.inf)
+        self.assertGreaterEqual(distancias.min(), 43 - 1e-9)
+        self.assertEqual(empacotar_circulos(30, 30, 20)[0], 0)
+
+    def test_multiplo_ideal_circular(self):
+        """Testa o ramo circular de calcular_multiplo_ideal, que nunca perde para a grade quadrada."""
+        self.assertEqual(calcular_multiplo_ideal(0.02, 200, 100, 20, 20, "circular"), 50)
+        self.assertEqual(calcular_multiplo_ideal(0.04, 200, 200, 20, 20, "circular"), 105)
+
+    def test_empacotar_misto(self):
+        """Testa o encaixe de códigos diferentes sem sobreposição e dentro da chapa."""
+        pecas = [("A", 100, 50, 40), ("B", 200, 120, 10), ("C", 30, 30, 200)]
+        posicionamentos, nao_posicionadas = empacotar_misto(1000, 500, pecas, kerf=2)
+        posicoes = np.array([p[1:] for p in posicionamentos])
+        self.assertFalse(sobrepostas(posicoes, kerf=2))
+        self.assertTrue(np.all(posicoes[:, 0] + posicoes[:, 2] <= 1000 + 1e-9))
+        self.assertTrue(np.all(posicoes[:, 1] + posicoes[:, 3] <= 500 + 1e-9))
+        colocadas = {codigo: 0 for codigo, *_ in pecas}
+        for codigo, *_ in posicionamentos:
+            colocadas[codigo] += 1
+        for codigo, _, _, quantidade in pecas:
+            self.assertEqual(colocadas[codigo] + nao_posicionadas.get(codigo, 0), quantidade)
+        self.assertEqual(colocadas["B"], 10)
+
+    def test_empacotar_misto_completo(self):
+        """Testa se peças que preenchem a chapa exatamente são todas posicionadas."""
+        posicionamentos, nao_posicionadas = empacotar_misto(100, 100, [("A", 50, 50, 2), ("B", 100, 50, 1)])
+        self.assertEqual(len(posicionamentos), 3)
+        self.assertEqual(nao_posicionadas, {})
+        with self.assertRaises(ValueError):
+            empacotar_misto(100, 100, [("A", 0, 50, 1)])
+
+    def test_calcular_multiplo_ideal(self):
+        """Testa a integração com calcular_multiplo_ideal."""
+        self.assertEqual(calcular_multiplo_ideal(0.007, 100, 70, 30, 20), 11)
+
+if __name__ == "__main__":
+    unittest.main()
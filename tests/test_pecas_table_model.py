@@ -0,0 +1,99 @@
+import os
+import sqlite3
+import tempfile
+import sys
+import unittest
+from PyQt5.QtCore import Qt, QModelIndex
+from PyQt5.QtWidgets import QApplication
+from query_executor import QueryExecutor
+from ui.pecas_table_model import PecasTableModel
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+class TestPecasTableModel(unittest.TestCase):
+    def setUp(self):
+        """Cria um banco temporário com 1000 peças."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "pecas_teste.db")
+        conexao = sqlite3.connect(self.db_path)
+        conexao.execute("CREATE TABLE pecas (cod_peca TEXT PRIMARY KEY, comprimento REAL, largura REAL)")
+        conexao.executemany(
+            "INSERT INTO pecas VALUES (?, ?, ?)", [(f"{i:04d}", float(i), float(1000 - i)) for i in range(1000)]
+        )
+        conexao.commit()
+        conexao.close()
+        self.model = PecasTableModel(self.db_path, page_size=100)
+
+    def tearDown(self):
+        self.model.clear()
+        self.model.pool.close_all()
+        self.tmpdir.cleanup()
+
+    def test_lazy_pages(self):
+        """Testa se apenas a primeira página é lida até a view pedir mais linhas."""
+        self.model.set_filter("")
+        self.assertEqual(self.model.rowCount(), 100)
+        self.assertTrue(self.model.canFetchMore(QModelIndex()))
+        while self.model.canFetchMore(QModelIndex()):
+            self.model.fetchMore(QModelIndex())
+        self.assertEqual(self.model.rowCount(), 1000)
+
+    def test_sort_in_sql(self):
+        """Testa a ordenação executada pelo banco."""
+        self.model.set_filter("")
+        self.model.sort(1, Qt.DescendingOrder)
+        self.assertEqual(self.model.row(0), ("0999", 999.0, 1.0))
+        self.assertEqual(self.model.data(self.model.index(0, 2)), "1.0")
+
+    def test_filter(self):
+        """Testa os filtros por prefixo e por código exato."""
+        self.model.set_filter("001")
+        self.assertEqual(self.model.rowCount(), 10)
+        self.model.set_filter("0010", exato=True)
+        self.assertEqual(self.model.rowCount(), 1)
+        self.assertFalse(self.model.canFetchMore(QModelIndex()))
+
+    def test_leitura_em_segundo_plano(self):
+        """Testa a leitura das páginas pelo executor, fora da thread da interface, e os índices de ordenação."""
+        executor = QueryExecutor(db_path=self.db_path)
+        model = PecasTableModel(self.db_path, page_size=100, executor=executor)
+        paginas = []
+        model.carregado.connect(paginas.append)
+        model.set_filter("")
+        model.sort(2, Qt.AscendingOrder)
+        self.assertEqual(model.rowCount(), 0)  # Nada é lido na thread da interface
+        self.assertFalse(model.canFetchMore(QModelIndex()))  # Uma página por vez
+        for _ in range(100):
+            if paginas:
+                break
+            executor.wait(1000)
+            app.processEvents()
+        self.assertEqual(paginas, [100])  # A leitura anterior à ordenação foi descartada
+        self.assertEqual(model.row(0), ("0999", 999.0, 1.0))
+        model.fetchMore(QModelIndex())
+        for _ in range(100):
+            if len(paginas) == 2:
+                break
+            executor.wait(1000)
+            app.processEvents()
+        self.assertEqual(model.rowCount(), 200)
+        self.assertEqual(model.row(199), ("0800", 800.0, 200.0))
+
+    def test_paginas_por_chave(self):
+        """Testa a paginação por chave (sem OFFSET) com valores repetidos e NULLs nos dois sentidos."""
+        self.model.pool.executemany("UPDATE pecas SET largura = ? WHERE cod_peca = ?",
+                                    [(None if i % 7 == 0 else float(i % 5), f"{i:04d}") for i in range(1000)])
+        todas = self.model.pool.fetchall("SELECT cod_peca, comprimento, largura FROM pecas")
+        chave = lambda linha: (linha[2] is not None, linha[2] or 0, linha[0])  # NULLs primeiro, como no SQLite
+        self.model.set_filter("")
+        for ordem in (Qt.AscendingOrder, Qt.DescendingOrder):
+            self.model.sort(2, ordem)
+            self.assertNotIn("OFFSET", self.model._build_query(self.model.row(0))[0][0])
+            while self.model.canFetchMore(QModelIndex()):
+                self.model.fetchMore(QModelIndex())
+            linhas = [self.model.row(i) for i in range(self.model.rowCount())]
+            self.assertEqual(linhas, sorted(todas, key=chave, reverse=ordem == Qt.DescendingOrder))
+        self.assertEqual(self.model.data(self.model.index(999, 2)), "")
+
+if __name__ == "__main__":
+    unittest.main()
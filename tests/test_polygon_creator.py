@@ -1,22 +1,31 @@
 import unittest
+from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QPointF
 from ui.canvas import Canvas
 from ui.polygon_creator import PolygonCreator
+from logic.geometry import polygon_area_m2
 from logic.object_manager import ObjectManager
 from rendering.renderer import Renderer
 
+class ToolbarFalsa:
+    def __init__(self):
+        self.sobra = None
+
+    def update_sobra(self, area):
+        self.sobra = area
+
 class TestPolygonCreator(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Inicializa a aplicação PyQt para os testes."""
-        cls.app = QApplication([])
+        cls.app = QApplication.instance() or QApplication([])
 
     def setUp(self):
         """Configura o ambiente de teste."""
         self.object_manager = ObjectManager()
         self.renderer = Renderer(self.object_manager)
         self.canvas = Canvas(self.renderer)
-        self.toolbar = None  # Simula uma toolbar simples
+        self.toolbar = ToolbarFalsa()  # Simula uma toolbar simples
         self.polygon_creator = PolygonCreator(self.canvas, self.toolbar)
 
     def test_start_polygon_creation(self):
@@ -39,6 +48,17 @@ class TestPolygonCreator(unittest.TestCase):
         self.polygon_creator.points.append(QPointF(100, 100))
         self.polygon_creator.finalize_polygon()
         self.assertTrue(self.polygon_creator.is_finalized, "O polígono não foi finalizado corretamente.")
+        self.assertAlmostEqual(self.toolbar.sobra, 0.005, places=6, msg="A sobra não foi enviada à toolbar em m².")
+
+    def test_finalize_self_intersecting_polygon(self):
+        """Testa se um polígono com arestas que se cruzam não é finalizado e continua em criação."""
+        self.polygon_creator.start_polygon_creation()
+        for x, y in [(0, 0), (100, 100), (100, 0), (0, 100)]:
+            self.polygon_creator.points.append(QPointF(x, y))
+        self.polygon_creator.finalize_polygon()
+        self.assertFalse(self.polygon_creator.is_finalized, "Um polígono que se cruza foi finalizado.")
+        self.assertEqual(len(self.polygon_creator.points), 4, "Os pontos devem ser mantidos para ajuste.")
+        self.assertIsNone(self.toolbar.sobra)
 
     def test_invalid_polygon(self):
         """Testa a finalização de um polígono inválido."""
@@ -51,8 +71,8 @@ class TestPolygonCreator(unittest.TestCase):
     def test_calculate_polygon_area(self):
         """Testa o cálculo da área de um polígono."""
         points = [QPointF(0, 0), QPointF(100, 0), QPointF(100, 100)]
-        area = self.polygon_creator.calculate_polygon_area(points)
-        self.assertAlmostEqual(area, 0.01, places=4, msg="A área do polígono foi calculada incorretamente.")
+        area = polygon_area_m2(points)
+        self.assertAlmostEqual(area, 0.005, places=6, msg="A área do polígono foi calculada incorretamente.")
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
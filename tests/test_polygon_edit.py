@@ -0,0 +1,64 @@
+import unittest
+from PyQt5.QtWidgets import QApplication, QGraphicsPolygonItem
+from PyQt5.QtGui import QPolygonF
+from PyQt5.QtCore import QPointF
+from ui.canvas import Canvas
+from ui.polygon_creator import PolygonCreator
+from logic.vertex_editing import frame_interval_ms
+
+class ToolbarFalsa:
+    def update_sobra(self, area):
+        self.sobra = area
+
+class TestPolygonEdit(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Inicializa a aplicação PyQt para os testes."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Cria um polígono finalizado em modo de edição."""
+        self.canvas = Canvas(None)
+        self.creator = PolygonCreator(self.canvas, ToolbarFalsa())
+        self.creator.points = [QPointF(0, 0), QPointF(100, 0), QPointF(100, 100), QPointF(0, 100)]
+        self.creator.current_polygon = QGraphicsPolygonItem(QPolygonF(self.creator.points))
+        self.canvas.scene.addItem(self.creator.current_polygon)
+        self.creator.finalize_polygon()
+        self.creator.edit_polygon()
+
+    def test_drag_moves_single_handle(self):
+        """Testa se o arraste altera só o vértice e o círculo afetados, sem recriar os demais."""
+        circulos = list(self.creator.vertex_circles)
+        self.creator._pending_move = (1, QPointF(90, 10))
+        self.creator._pending_move = (1, QPointF(80, 20))  # Movimentos do mesmo quadro: vale o último
+        self.creator.apply_pending_move()
+        self.assertEqual(self.creator.vertex_circles, circulos)
+        self.assertEqual(self.creator.current_polygon.polygon()[1], QPointF(80, 20))
+        self.assertEqual(self.creator.vertex_circles[1].pos(), QPointF(80, 20))
+        self.assertEqual(self.creator.vertex_index.nearest((81, 21), 5), 1)
+        self.assertEqual(self.creator.current_polygon.polygon()[2], QPointF(100, 100))
+
+    def test_drag_recalcula_sobra(self):
+        """Testa se o arraste recalcula a sobra e avisa a mudança do polígono."""
+        mudancas = []
+        self.creator.polygon_changed.connect(lambda: mudancas.append(True))
+        self.creator._pending_move = (2, QPointF(100, 200))
+        self.creator.apply_pending_move()
+        self.assertAlmostEqual(self.creator.toolbar.sobra, 0.015)
+        self.assertEqual(mudancas, [True])
+
+    def test_drag_que_cruza_arestas_mantem_sobra(self):
+        """Testa se um vértice movido para cruzar as arestas não altera a sobra nem a distribuição."""
+        mudancas = []
+        self.creator.polygon_changed.connect(lambda: mudancas.append(True))
+        self.creator._pending_move = (1, QPointF(0, 200))  # (0,0),(0,200),(100,100),(0,100): arestas se cruzam
+        self.creator.apply_pending_move()
+        self.assertAlmostEqual(self.creator.toolbar.sobra, 0.01)
+        self.assertEqual(mudancas, [])
+
+    def test_frame_interval(self):
+        """Testa se o intervalo de quadros é positivo."""
+        self.assertGreater(frame_interval_ms(), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from PyQt5.QtWidgets import QApplication
+from query_executor import QueryExecutor, _QueryTask
+
+def consulta_lenta(valor, atraso):
+    time.sleep(atraso)
+    return valor
+
+def consulta_com_erro():
+    raise RuntimeError("banco bloqueado")
+
+class TestQueryExecutor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Inicializa a aplicação PyQt para os testes."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.executor = QueryExecutor(max_threads=2, db_path=os.path.join(self.tmpdir.name, "pecas_teste.db"))
+        self.resultados = []
+        self.erros = []
+        self.executor.resultado.connect(lambda tag, resultado: self.resultados.append((tag, resultado)))
+        self.executor.erro.connect(lambda tag, mensagem: self.erros.append((tag, mensagem)))
+
+    def tearDown(self):
+        self.executor.wait(5000)
+        self.executor.pool.close_all()
+        self.tmpdir.cleanup()
+
+    def processar_eventos(self):
+        """Processa eventos até as consultas terminarem e os sinais serem entregues."""
+        self.executor.wait(5000)
+        limite = time.time() + 1
+        while time.time() < limite:
+            self.app.processEvents()
+
+    def test_stale_query_discarded(self):
+        """Testa se uma consulta substituída por outra com a mesma tag é descartada."""
+        self.executor.submit("buscar", consulta_lenta, "antiga", 0.3)
+        time.sleep(0.05)
+        self.executor.submit("buscar", consulta_lenta, "nova", 0.0)
+        self.processar_eventos()
+        self.assertEqual(self.resultados, [("buscar", "nova")])
+
+    def test_interromper_somente_em_execucao(self):
+        """Testa que uma tarefa concluída não interrompe a conexão, já usada pela próxima tarefa da thread."""
+        interrompida = []
+        tarefa = _QueryTask(self.executor, "buscar", 0, lambda: interrompida.append(tarefa.interrupt()), ())
+        self.executor._generations["buscar"] = 0
+        tarefa.run()
+        self.assertEqual(interrompida, [True])
+        tarefa.connection = mock.Mock()
+        self.assertFalse(tarefa.interrupt())
+        tarefa.connection.interrupt.assert_not_called()
+        self.processar_eventos()
+
+    def test_callback(self):
+        """Testa a entrega do resultado ao callback na thread da interface."""
+        recebidos = []
+        self.executor.submit("catalogo", consulta_lenta, 42, 0.0, on_result=recebidos.append)
+        self.processar_eventos()
+        self.assertEqual(recebidos, [42])
+
+    def test_error_channel(self):
+        """Testa se erros chegam pelo sinal, sem exceções na thread da interface."""
+        self.executor.submit("buscar", consulta_com_erro)
+        self.processar_eventos()
+        self.assertEqual(self.erros, [("buscar", "banco bloqueado")])
+        self.assertEqual(self.resultados, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from PyQt5.QtWidgets import QApplication, QGraphicsScene
+from logic.object_manager import ObjectManager
+from rendering.renderer import Renderer
+
+class TestRenderer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Inicializa a aplicação PyQt para os testes."""
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Cria um ObjectManager em diretório temporário e um renderizador ligado a uma cena."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmpdir.name, "objects.json")
+        self.manager = ObjectManager(self.config_file, write_behind=False)
+        self.scene = QGraphicsScene()
+        self.renderer = Renderer(self.manager, self.scene)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_add_update_remove(self):
+        """Testa se cada alteração do modelo mexe apenas no item correspondente."""
+        ids = self.manager.add_objects("circle", [{"x": i * 10, "y": 0, "radius": 4} for i in range(5)])
+        rect_id = self.manager.add_object("rectangle", {"x": 0, "y": 0, "width": 100, "height": 50})
+        self.assertEqual(len(self.renderer.items), 6)
+        item = self.renderer.items[ids[2]]
+        self.assertEqual(item.rect().center().x(), 20)
+        self.manager.update_object(ids[2], {"x": 70, "y": 5, "radius": 4})
+        self.assertIs(self.renderer.items[ids[2]], item)  # O mesmo item, atualizado
+        self.assertEqual((item.rect().center().x(), item.rect().center().y()), (70, 5))
+        self.manager.remove_object_by_id(rect_id)
+        self.manager.remove_object(0)
+        self.assertEqual(sorted(self.renderer.items), ids[1:])
+        self.assertEqual(len(self.renderer.root.childItems()), 4)
+        self.manager.clear_objects()
+        self.assertEqual(self.renderer.items, {})
+        self.assertEqual(self.renderer.root.childItems(), [])
+
+    def test_reload_keeps_unchanged_items(self):
+        """Testa se recarregar o arquivo só recria os itens dos objetos que mudaram."""
+        ids = self.manager.add_objects("circle", [{"x": i, "y": i, "radius": 1} for i in range(100)])
+        self.manager.add_object("polygon", {"points": [[0, 0], [10, 0], [0, 10]]})
+        antes = dict(self.renderer.items)
+        self.manager.store.update(ids[5], {"x": 500, "y": 500, "radius": 1})  # Alteração fora do ObjectManager
+        self.manager.load_saved_objects()
+        mesmos = [obj_id for obj_id in antes if self.renderer.items[obj_id] is antes[obj_id]]
+        self.assertEqual(len(mesmos), 101)
+        self.assertEqual(self.renderer.items[ids[5]].rect().center().x(), 5)  # Voltou ao valor salvo
+
+    def test_render_objects(self):
+        """Testa se render_objects sincroniza a cena e ignora tipos sem representação."""
+        self.manager.add_object("nota", {"texto": "sem desenho"})
+        self.manager.add_object("circle", {"x": 0, "y": 0, "radius": 2})
+        self.renderer.items.clear()
+        self.renderer._dados.clear()
+        self.manager.render_objects(self.renderer)
+        self.assertEqual(len(self.renderer.items), 1)
+
+if __name__ == "__main__":
+    unittest.main()
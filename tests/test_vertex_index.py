@@ -0,0 +1,50 @@
+import random
+import unittest
+from PyQt5.QtCore import QPointF
+from logic.vertex_index import VertexIndex
+
+class TestVertexIndex(unittest.TestCase):
+    def setUp(self):
+        """Cria um índice com vértices aleatórios."""
+        rng = random.Random(42)
+        self.points = [(rng.uniform(0, 1000), rng.uniform(0, 1000)) for _ in range(500)]
+        self.index = VertexIndex(cell_size=10)
+        self.index.rebuild(self.points)
+
+    def brute_force(self, x, y, raio):
+        candidatos = [(((px - x) ** 2 + (py - y) ** 2), i) for i, (px, py) in enumerate(self.points)]
+        d2, i = min(candidatos)
+        return i if d2 <= raio * raio else None
+
+    def test_nearest_matches_brute_force(self):
+        """Testa se a consulta pela grade coincide com a busca linear."""
+        rng = random.Random(7)
+        for _ in range(300):
+            x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+            self.assertEqual(self.index.nearest((x, y), 25), self.brute_force(x, y, 25))
+
+    def test_qpointf_and_miss(self):
+        """Testa a consulta com QPointF e um clique fora do alcance."""
+        x, y = self.points[10]
+        self.assertEqual(self.index.nearest(QPointF(x + 1, y - 1), 5), 10)
+        self.assertIsNone(VertexIndex().nearest((0, 0), 5))
+
+    def test_move(self):
+        """Testa a atualização incremental ao mover um vértice."""
+        self.index.move(3, QPointF(-500, -500))
+        self.points[3] = (-500, -500)
+        self.assertEqual(self.index.nearest((-498, -501), 5), 3)
+        self.assertEqual(len(self.index), 500)
+        for x, y in self.points[:50]:
+            self.assertEqual(self.index.nearest((x, y), 1), self.brute_force(x, y, 1))
+
+    def test_celula_acompanha_raio(self):
+        """Testa se a grade é refeita para o raio consultado (zoom afastado ou aproximado)."""
+        x, y = self.points[0]
+        self.assertEqual(self.index.nearest((x, y), 500), self.brute_force(x, y, 500))
+        self.assertEqual(self.index.cell_size, 1000)
+        self.assertEqual(self.index.nearest((x, y), 2), 0)
+        self.assertEqual(self.index.cell_size, 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,34 @@
 from PyQt5.QtWidgets import QGraphicsScene, QGraphicsView, QSizePolicy
 from PyQt5.QtGui import QPen
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 import logging
+import time
+from logic.nesting import compute_centers, polygon_centers
+from logic.geometry import as_array, clip_to_rect
+from ui.circle_batch_item import CircleBatchItem
+from logic.vertex_editing import frame_interval_ms
+from utils.instrumentation import instrument
 
 # Configurar logger
 logger = logging.getLogger("app_logger")
 
+# Fração da vista deixada livre em cada lado da chapa ao ajustar a vista
+FIT_MARGIN = 0.15
+# Fator de zoom por passo da roda do mouse (120 unidades de angleDelta)
+ZOOM_STEP = 1.15
+# Limites da escala da vista, em pixels por milímetro
+MIN_VIEW_SCALE = 1e-3
+MAX_VIEW_SCALE = 1e3
+# Área navegável em volta da chapa, em múltiplos do tamanho da chapa
+PAN_EXTENT = 3
+
+
+def cosmetic_pen(color=Qt.black):
+    """Retorna uma caneta de 1 pixel, com a mesma espessura na tela em qualquer zoom."""
+    pen = QPen(color)
+    pen.setCosmetic(True)
+    return pen
+
 class Canvas(QGraphicsView):
     def __init__(self, renderer):
         """
@@ -17,70 +40,150 @@ class Canvas(QGraphicsView):
         self.scene = QGraphicsScene()
         self.setScene(self.scene)
         self.current_rectangle = None  # Armazena o retângulo atual
-        self.scale_factor = 1.0  # Fator de escala aplicado ao retângulo
+        # Unidades da cena por milímetro: a cena fica em milímetros reais, e o zoom e o ajuste
+        # ao tamanho da janela são feitos apenas pela transformação da vista
+        self.scale_factor = 1.0
         self.original_width = None  # Largura original do retângulo
         self.original_height = None  # Altura original do retângulo
+        self.distributed_item = None  # Item único com todas as peças distribuídas
         # Configura o canvas para redimensionar automaticamente
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.setAlignment(Qt.AlignCenter)  # Centraliza o conteúdo no canvas
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)  # Zoom em torno do cursor
+        self.setResizeAnchor(QGraphicsView.AnchorViewCenter)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)  # A navegação é feita com o botão do meio
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.auto_fit = True  # Reajusta a vista à chapa ao redimensionar, até o usuário aplicar zoom ou mover a vista
+        self._pan_start = None  # Última posição do mouse durante o arraste com o botão do meio
+        self._resize_timer = QTimer(self)  # Agrupa os eventos de redimensionamento em um ajuste por quadro
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.timeout.connect(self._apply_resize)
         logger.info("Canvas inicializado com sucesso.")
 
     def resizeEvent(self, event):
-        """Redimensiona o canvas e ajusta os elementos para manter a escala."""
+        """
+        Redimensiona o canvas. A geometria da cena não muda: apenas a transformação da vista é
+        reajustada à chapa, uma vez por quadro, independentemente do número de itens.
+        """
         super().resizeEvent(event)
-        if self.current_rectangle:
-            self.redraw_rectangle()
+        if self.auto_fit and self.current_rectangle and not self._resize_timer.isActive():
+            self._resize_timer.start(frame_interval_ms())
+
+    def _apply_resize(self):
+        if self.auto_fit:
+            self.fit_to_view()
+
+    @instrument("canvas")
+    def fit_to_view(self):
+        """Ajusta a transformação da vista para mostrar a chapa inteira, com margem, e volta ao ajuste automático."""
+        if not self.current_rectangle:
+            return
+        self.auto_fit = True
+        rect = self.current_rectangle.rect()
+        # A chapa ocupa (1 - 2 * FIT_MARGIN) da vista em cada eixo
+        fator = FIT_MARGIN / (1 - 2 * FIT_MARGIN)
+        self.fitInView(rect.adjusted(-rect.width() * fator, -rect.height() * fator,
+                                     rect.width() * fator, rect.height() * fator), Qt.KeepAspectRatio)
+
+    def view_scale(self):
+        """Retorna a escala atual da vista, em pixels por milímetro."""
+        return self.transform().m11()
+
+    def wheelEvent(self, event):
+        """Aplica zoom com a roda do mouse, em torno do cursor, alterando apenas a transformação da vista."""
+        passos = event.angleDelta().y() / 120
+        if not passos:
+            super().wheelEvent(event)
+            return
+        escala = self.view_scale()
+        fator = ZOOM_STEP ** passos
+        fator = min(max(escala * fator, MIN_VIEW_SCALE), MAX_VIEW_SCALE) / escala
+        self.auto_fit = False
+        self.scale(fator, fator)
+        event.accept()
+
+    def mousePressEvent(self, event):
+        """Inicia o arraste da vista com o botão do meio; os demais botões seguem para a cena."""
+        if event.button() == Qt.MiddleButton:
+            self._pan_start = event.pos()
+            self.setCursor(Qt.ClosedHandCursor)
+            event.accept()
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        """Move a vista durante o arraste com o botão do meio."""
+        if self._pan_start is not None:
+            delta = event.pos() - self._pan_start
+            self._pan_start = event.pos()
+            self.auto_fit = False
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
+            event.accept()
+            return
+        super().mouseMoveEvent(event)
 
+    def mouseReleaseEvent(self, event):
+        """Encerra o arraste da vista."""
+        if event.button() == Qt.MiddleButton and self._pan_start is not None:
+            self._pan_start = None
+            self.unsetCursor()
+            event.accept()
+            return
+        super().mouseReleaseEvent(event)
+
+    @instrument("canvas")
     def clear_scene(self):
-        """Limpa todos os itens do canvas, exceto o retângulo atual."""
+        """Limpa todos os itens do canvas, exceto o retângulo atual e os objetos desenhados pelo renderizador."""
         try:
-            if self.current_rectangle:
-                # Remove todos os itens, exceto o retângulo atual
-                for item in self.scene.items():
-                    if item != self.current_rectangle:
-                        self.scene.removeItem(item)
-            else:
-                # Se não houver retângulo, limpa tudo
-                self.scene.clear()
+            # Os objetos do modelo (filhos do item raiz do renderizador) são mantidos
+            manter = (self.current_rectangle, getattr(self.renderer, "root", None))
+            # Remove os itens de primeiro nível, exceto o retângulo atual; os filhos saem com os pais
+            for item in self.scene.items():
+                if item.parentItem() is None and item not in manter:
+                    self.scene.removeItem(item)
+            self.distributed_item = None
             logger.info("Canvas limpo.")
         except Exception as e:
             logger.error(f"Erro ao limpar o canvas: {e}")
 
+    @instrument("canvas")
     def draw_rectangle(self, position, width, height):
-        """Desenha um retângulo no canvas, ajustando a escala para caber dentro do canvas."""
+        """Desenha a chapa em milímetros reais, com o canto em (0, 0), e ajusta a vista para mostrá-la."""
         self.clear_scene()  # Limpa o canvas antes de desenhar um novo retângulo
         self.original_width = width
         self.original_height = height
         self.redraw_rectangle()
+        self.fit_to_view()
 
+    @instrument("canvas")
     def redraw_rectangle(self):
-        """Redesenha o retângulo com base nas dimensões originais e no tamanho atual do canvas."""
+        """Atualiza o retângulo da chapa e a área navegável da cena a partir das dimensões originais."""
         if not self.original_width or not self.original_height:
             return
-        canvas_width = self.width()
-        canvas_height = self.height()
-        margin_x = canvas_width * 0.15
-        margin_y = canvas_height * 0.15
-        available_width = canvas_width - 2 * margin_x
-        available_height = canvas_height - 2 * margin_y
-        scale_x = available_width / self.original_width
-        scale_y = available_height / self.original_height
-        self.scale_factor = min(scale_x, scale_y)
-        scaled_width = self.original_width * self.scale_factor
-        scaled_height = self.original_height * self.scale_factor
-        x = margin_x + (available_width - scaled_width) / 2
-        y = margin_y + (available_height - scaled_height) / 2
         if self.current_rectangle:
-            self.scene.removeItem(self.current_rectangle)
-        pen = QPen(Qt.black)
-        rect = self.scene.addRect(x, y, scaled_width, scaled_height, pen)
-        self.current_rectangle = rect
-        logger.info(f"Retângulo redesenhado com dimensões reais: {self.original_width}x{self.original_height}, escala: {self.scale_factor}")
+            self.current_rectangle.setRect(0, 0, self.original_width, self.original_height)
+        else:
+            self.current_rectangle = self.scene.addRect(0, 0, self.original_width, self.original_height, cosmetic_pen())
+        rect = self.current_rectangle.rect()
+        self.scene.setSceneRect(rect.adjusted(-rect.width() * PAN_EXTENT, -rect.height() * PAN_EXTENT,
+                                              rect.width() * PAN_EXTENT, rect.height() * PAN_EXTENT))
+        logger.info("Retângulo redesenhado com dimensões reais: %sx%s", self.original_width, self.original_height)
+
+    def scene_to_sheet(self, points):
+        """
+        Converte pontos da cena para milímetros reais, relativos ao canto da chapa.
+        :param points: Pontos na cena (lista de QPointF ou array (N, 2)).
+        :return: Array NumPy (N, 2) em milímetros.
+        """
+        rect = self.current_rectangle.rect()
+        return (as_array(points) - (rect.x(), rect.y())) / self.scale_factor
 
     def get_scale_factor(self):
-        """Retorna o fator de escala aplicado ao retângulo."""
+        """Retorna o fator de escala entre milímetros e unidades da cena (1.0: a cena está em milímetros)."""
         return self.scale_factor
 
+    @instrument("canvas")
     def draw_circle(self, radius):
         """Desenha um círculo no centro do retângulo atual."""
         if not self.current_rectangle:
@@ -92,32 +195,65 @@ class Canvas(QGraphicsView):
         center_x = rect.x() + rect.width() / 2
         center_y = rect.y() + rect.height() / 2
         scaled_radius = radius * self.scale_factor
-        pen = QPen(Qt.black)
+        pen = cosmetic_pen()
         self.current_circle = self.scene.addEllipse(
             center_x - scaled_radius, center_y - scaled_radius, scaled_radius * 2, scaled_radius * 2, pen
         )
-        logger.info(f"Círculo desenhado com raio real: {radius}, escala: {self.scale_factor}")
+        logger.info("Círculo desenhado com raio real: %s", radius)
 
-    def distribute_circles(self, radius):
-        """Distribui círculos dentro do retângulo atual."""
+    @instrument("canvas")
+    def distribute_circles(self, radius, layout="otimizado", kerf=0.0, margin=0.0):
+        """
+        Distribui círculos dentro do retângulo atual.
+        :param radius: Raio real dos círculos em milímetros.
+        :param layout: Disposição dos círculos ("grade", "hexagonal" ou "otimizado").
+        :param kerf: Distância entre peças em milímetros (layout "otimizado").
+        :param margin: Distância até as bordas da chapa em milímetros (layout "otimizado").
+        """
         if not self.current_rectangle:
             logger.error("Nenhum retângulo disponível para distribuir círculos.")
             return
+        inicio = time.perf_counter()
         self.clear_scene()
+        centers = compute_centers(self.original_width, self.original_height, radius, layout, kerf, margin)
+        self.draw_circles_for_distribution(radius, centers)
+        # Um único registro agregado para toda a distribuição, em vez de um por círculo
+        logger.info("%d círculos distribuídos em layout %s (raio %s) em %.1f ms",
+                    len(centers), layout, radius, (time.perf_counter() - inicio) * 1000)
+
+    @instrument("canvas")
+    def distribute_circles_in_polygon(self, radius, points, layout="hexagonal"):
+        """
+        Distribui círculos dentro de um polígono (ex.: a sobra demarcada), recortado pela chapa atual.
+        Substitui apenas a distribuição anterior, mantendo o polígono e os demais itens na cena.
+        :param radius: Raio real dos círculos em milímetros.
+        :param points: Vértices do polígono na cena (lista de QPointF).
+        :param layout: Disposição dos círculos ("grade" ou "hexagonal").
+        :return: Número de círculos distribuídos.
+        """
+        if not self.current_rectangle:
+            logger.error("Nenhum retângulo disponível para distribuir círculos.")
+            return 0
+        inicio = time.perf_counter()
+        polygon = clip_to_rect(self.scene_to_sheet(points), 0.0, 0.0, self.original_width, self.original_height)
+        centers = polygon_centers(polygon, radius, layout)
+        self.draw_circles_for_distribution(radius, centers)
+        logger.info("%d círculos distribuídos na sobra em layout %s (raio %s) em %.1f ms",
+                    len(centers), layout, radius, (time.perf_counter() - inicio) * 1000)
+        return len(centers)
+
+    @instrument("canvas")
+    def draw_circles_for_distribution(self, radius, centers):
+        """
+        Desenha os círculos distribuídos em um único item a partir de um array de centros.
+        :param radius: Raio real dos círculos em milímetros.
+        :param centers: Array NumPy (N, 2) com os centros em milímetros, relativos ao retângulo atual.
+        """
+        if self.distributed_item is not None:
+            self.scene.removeItem(self.distributed_item)  # Substitui a distribuição anterior
+            self.distributed_item = None
         rect = self.current_rectangle.rect()
-        spacing = radius * 2
-        cols = int(rect.width() // (spacing * self.scale_factor))
-        rows = int(rect.height() // (spacing * self.scale_factor))
-        logger.info(f"Distribuindo círculos: {cols} colunas, {rows} linhas")
-        for row in range(rows):
-            for col in range(cols):
-                x = rect.x() + col * spacing * self.scale_factor + radius * self.scale_factor
-                y = rect.y() + row * spacing * self.scale_factor + radius * self.scale_factor
-                self.draw_circle_for_distribution(radius, x, y)
-
-    def draw_circle_for_distribution(self, radius, x, y):
-        """Desenha um círculo nas coordenadas especificadas sem apagar o anterior."""
         scaled_radius = radius * self.scale_factor
-        pen = QPen(Qt.black)
-        self.scene.addEllipse(x - scaled_radius, y - scaled_radius, scaled_radius * 2, scaled_radius * 2, pen)
-        logger.info(f"Círculo distribuído com raio real: {radius}, escala: {self.scale_factor}")
\ No newline at end of file
+        scene_centers = centers * self.scale_factor + (rect.x(), rect.y())
+        self.distributed_item = CircleBatchItem(scene_centers, scaled_radius, cosmetic_pen())
+        self.scene.addItem(self.distributed_item)
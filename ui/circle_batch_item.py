@@ -0,0 +1,125 @@
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt5.QtGui import QPainterPath, QPen, QPixmap, QPainter
+from PyQt5.QtCore import Qt, QRectF
+import numpy as np
+import logging
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+
+class CircleBatchItem(QGraphicsItem):
+    # Abaixo deste diâmetro em pixels de tela o item passa a desenhar o pixmap em cache
+    PIXMAP_THRESHOLD = 3.0
+    # Maior lado do pixmap em cache, em pixels
+    PIXMAP_MAX_SIZE = 2048
+
+    def __init__(self, centers, radius, pen=None, parent=None):
+        """
+        Inicializa um item gráfico que desenha vários círculos de uma só vez.
+        :param centers: Array (N, 2) com os centros dos círculos em coordenadas da cena.
+        :param radius: Raio dos círculos em coordenadas da cena.
+        :param pen: Caneta compartilhada por todos os círculos (padrão: preta).
+        :param parent: Item pai opcional.
+        """
+        super().__init__(parent)
+        self.pen = pen if pen is not None else QPen(Qt.black)
+        self.radius = radius
+        self.centers = np.empty((0, 2), dtype=np.float64)
+        self._path = QPainterPath()
+        self._bounding_rect = QRectF()
+        self._pixmap = None
+        # Necessário para que option.exposedRect indique a área realmente exposta
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+        self.set_centers(centers, radius)
+
+    def set_centers(self, centers, radius=None):
+        """
+        Substitui o buffer de centros e invalida os caches de desenho.
+        :param centers: Array (N, 2) com os centros dos círculos em coordenadas da cena.
+        :param radius: Novo raio opcional em coordenadas da cena.
+        """
+        self.prepareGeometryChange()
+        if radius is not None:
+            self.radius = radius
+        self.centers = np.ascontiguousarray(centers, dtype=np.float64).reshape(-1, 2)
+        diameter = self.radius * 2
+        self._path = QPainterPath()
+        for x, y in (self.centers - self.radius).tolist():
+            self._path.addEllipse(x, y, diameter, diameter)
+        if len(self.centers):
+            x_min, y_min = self.centers.min(axis=0) - self.radius
+            x_max, y_max = self.centers.max(axis=0) + self.radius
+            half_pen = self.pen.widthF() / 2
+            self._bounding_rect = QRectF(x_min, y_min, x_max - x_min, y_max - y_min).adjusted(
+                -half_pen, -half_pen, half_pen, half_pen
+            )
+        else:
+            self._bounding_rect = QRectF()
+        self._pixmap = None
+        self.update()
+
+    def count(self):
+        """Retorna o número de círculos desenhados pelo item."""
+        return len(self.centers)
+
+    def boundingRect(self):
+        """Retorna o retângulo envolvente calculado uma única vez em set_centers."""
+        return self._bounding_rect
+
+    def shape(self):
+        """Retorna o contorno usado para seleção e colisão."""
+        return self._path
+
+    def paint(self, painter, option, widget=None):
+        """
+        Desenha todos os círculos com uma única chamada, ou o pixmap em cache quando a escala é pequena.
+        """
+        if not len(self.centers):
+            return
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if self.radius * 2 * lod < self.PIXMAP_THRESHOLD:
+            pixmap = self._cached_pixmap()
+            painter.drawPixmap(self._bounding_rect, pixmap, QRectF(pixmap.rect()))
+            return
+        painter.setPen(self.pen)
+        painter.setBrush(Qt.NoBrush)
+        exposed = option.exposedRect
+        bounding_area = self._bounding_rect.width() * self._bounding_rect.height()
+        if exposed.width() * exposed.height() >= 0.25 * bounding_area:
+            painter.drawPath(self._path)
+            return
+        # Com zoom alto, desenha apenas os círculos que tocam a área exposta
+        r = self.radius
+        visible = (
+            (self.centers[:, 0] + r >= exposed.left()) & (self.centers[:, 0] - r <= exposed.right())
+            & (self.centers[:, 1] + r >= exposed.top()) & (self.centers[:, 1] - r <= exposed.bottom())
+        )
+        diameter = r * 2
+        for x, y in (self.centers[visible] - r).tolist():
+            painter.drawEllipse(QRectF(x, y, diameter, diameter))
+
+    def _cached_pixmap(self):
+        """
+        Renderiza os círculos uma vez em um pixmap de resolução limitada.
+        :return: QPixmap com o desenho dos círculos.
+        """
+        if self._pixmap is None:
+            rect = self._bounding_rect
+            scale = self.PIXMAP_MAX_SIZE / max(rect.width(), rect.height(), 1e-9)
+            width = max(1, int(rect.width() * scale))
+            height = max(1, int(rect.height() * scale))
+            pixmap = QPixmap(width, height)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.scale(scale, scale)
+            painter.translate(-rect.x(), -rect.y())
+            pen = QPen(self.pen)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.drawPath(self._path)
+            painter.end()
+            self._pixmap = pixmap
+            logger.debug("Pixmap em cache gerado para %d círculos (%dx%d).", len(self.centers), width, height)
+        return self._pixmap
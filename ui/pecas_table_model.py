@@ -0,0 +1,206 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+import logging
+from db_manager import DB_PATH, get_pool
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+
+class PecasTableModel(QAbstractTableModel):
+    COLUMNS = ("cod_peca", "comprimento", "largura")  # Colunas da tabela pecas exibidas
+    HEADERS = ("Código", "Comprimento", "Largura")
+    # Emitido quando uma página termina de ser lida (com o número de linhas já na tabela)
+    carregado = pyqtSignal(int)
+
+    def __init__(self, db_path=DB_PATH, page_size=200, parent=None, executor=None):
+        """
+        Inicializa o modelo de tabela que lê a tabela pecas sob demanda, uma página por vez.
+        Apenas as páginas já exibidas pela view viram objetos Python.
+        :param db_path: Caminho para o arquivo do banco de dados SQLite.
+        :param page_size: Número de linhas lidas a cada fetchMore.
+        :param parent: Objeto pai opcional.
+        :param executor: QueryExecutor que lê as páginas fora da thread da interface; sem ele,
+                         as páginas são lidas na hora (uso em scripts e testes).
+        """
+        super().__init__(parent)
+        self.pool = get_pool(db_path)
+        self.page_size = page_size
+        self.executor = executor
+        self._rows = []
+        self._filter = None  # None = nenhuma consulta ativa; "" = todas as peças
+        self._exact = False
+        self._sort_column = 0
+        self._sort_order = Qt.AscendingOrder
+        self._fim = True  # Todas as linhas da consulta atual já foram lidas
+        self._carregando = False  # Há uma página sendo lida em segundo plano
+
+    def set_filter(self, texto="", exato=False):
+        """
+        Define o filtro da tabela e recomeça a leitura com a consulta correspondente.
+        :param texto: Código (exato) ou prefixo do código; vazio para todas as peças.
+        :param exato: Se True, filtra pelo código exato em vez do prefixo.
+        """
+        self._filter = texto
+        self._exact = exato
+        self._reload()
+
+    def clear(self):
+        """Remove todas as linhas e descarta a leitura em andamento."""
+        self._cancelar()
+        self.beginResetModel()
+        self._rows = []
+        self._filter = None
+        self._fim = True
+        self.endResetModel()
+
+    def _build_query(self, depois_de=None):
+        """
+        Monta as consultas SQL da próxima página, com filtro e ordenação.
+        A página começa logo depois da última linha lida (paginação por chave): a condição
+        (coluna, cod_peca) > (?, ?) posiciona a leitura direto no índice, enquanto um OFFSET percorreria
+        e descartaria todas as linhas anteriores. Ordenando por comprimento ou largura, as peças sem valor
+        (NULL) formam um trecho à parte, antes dos valores na ordem crescente e depois na decrescente;
+        quando um trecho acaba, a página continua pela consulta do trecho seguinte.
+        :param depois_de: Última linha lida, ou None para a primeira página.
+        :return: Lista de tuplas (sql, parâmetros), lidas em sequência; falta o parâmetro do LIMIT.
+        """
+        filtro = []
+        params_filtro = ()
+        if self._filter and self._exact:
+            filtro.append("cod_peca = ?")
+            params_filtro = (self._filter,)
+        elif self._filter:
+            # Escapa os curingas do LIKE para que o texto seja tratado literalmente
+            prefixo = self._filter.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            filtro.append("cod_peca LIKE ? ESCAPE '\\'")
+            params_filtro = (prefixo + "%",)
+        crescente = self._sort_order == Qt.AscendingOrder
+        direcao = "ASC" if crescente else "DESC"
+        maior = ">" if crescente else "<"
+
+        def consulta(condicoes, params, ordem):
+            sql = f"SELECT {', '.join(self.COLUMNS)} FROM pecas"
+            if filtro or condicoes:
+                sql += " WHERE " + " AND ".join(filtro + condicoes)
+            return sql + f" ORDER BY {ordem} LIMIT ?", params_filtro + params
+
+        if self._sort_column == 0:
+            if depois_de is None:
+                return [consulta([], (), f"cod_peca {direcao}")]
+            return [consulta([f"cod_peca {maior} ?"], (depois_de[0],), f"cod_peca {direcao}")]
+
+        coluna = self.COLUMNS[self._sort_column]
+        ordem_valores = f"{coluna} {direcao}, cod_peca {direcao}"
+        ordem_nulos = f"cod_peca {direcao}"
+        valores = consulta([f"{coluna} IS NOT NULL"], (), ordem_valores)
+        nulos = consulta([f"{coluna} IS NULL"], (), ordem_nulos)
+        if depois_de is None:
+            return [nulos, valores] if crescente else [valores, nulos]
+        valor, codigo = depois_de[self._sort_column], depois_de[0]
+        if valor is None:
+            restante = consulta([f"{coluna} IS NULL", f"cod_peca {maior} ?"], (codigo,), ordem_nulos)
+            return [restante, valores] if crescente else [restante]
+        # A comparação de tuplas já exclui os NULLs
+        restante = consulta([f"({coluna}, cod_peca) {maior} (?, ?)"], (valor, codigo), ordem_valores)
+        return [restante] if crescente else [restante, nulos]
+
+    def _cancelar(self):
+        """Descarta a página em leitura, se houver."""
+        if self.executor is not None and self._carregando:
+            self.executor.cancel("pecas_tabela")
+        self._carregando = False
+
+    def _reload(self):
+        """Reexecuta a consulta e carrega a primeira página."""
+        self._cancelar()
+        self.beginResetModel()
+        self._rows = []
+        self._fim = self._filter is None
+        self.endResetModel()
+        self._buscar_pagina()
+
+    def _buscar_pagina(self):
+        """Pede a próxima página ao executor (ou a lê na hora, sem executor)."""
+        if self._fim or self._carregando:
+            return
+        consultas = self._build_query(self._rows[-1] if self._rows else None)
+        if self.executor is None:
+            self._pagina_lida(self._ler_pagina(consultas, self.page_size))
+            return
+        self._carregando = True
+        self.executor.submit("pecas_tabela", self._ler_pagina, consultas, self.page_size,
+                             on_result=self._pagina_lida, on_error=self._erro_pagina)
+
+    def _ler_pagina(self, consultas, limite):
+        """
+        Lê uma página executando as consultas em sequência até completar `limite` linhas;
+        roda na thread de trabalho quando há executor.
+        """
+        pagina = []
+        for sql, params in consultas:
+            pagina += self.pool.fetchall(sql, params + (limite - len(pagina),), label="pecas_tabela")
+            if len(pagina) >= limite:
+                break
+        return pagina
+
+    def _pagina_lida(self, pagina):
+        """Insere no modelo a página lida, na thread da interface."""
+        self._carregando = False
+        if len(pagina) < self.page_size:
+            self._fim = True
+        if pagina:
+            inicio = len(self._rows)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(pagina) - 1)
+            self._rows.extend(pagina)
+            self.endInsertRows()
+        self.carregado.emit(len(self._rows))
+
+    def _erro_pagina(self, mensagem):
+        """Encerra a leitura após um erro (já registrado e exibido pelo executor)."""
+        self._carregando = False
+        self._fim = True
+
+    def rowCount(self, parent=QModelIndex()):
+        """Retorna o número de linhas já lidas do cursor."""
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        """Formata o valor da célula apenas quando a view o solicita."""
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        valor = self._rows[index.row()][index.column()]
+        return "" if valor is None else str(valor)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+    def row(self, index):
+        """
+        Retorna a linha bruta (cod_peca, comprimento, largura) de uma posição.
+        :param index: Posição da linha na tabela.
+        :return: Tupla com os dados da peça.
+        """
+        return self._rows[index]
+
+    def canFetchMore(self, parent=QModelIndex()):
+        """Indica se a consulta ainda tem linhas a entregar e nenhuma página está em leitura."""
+        return not parent.isValid() and not self._fim and not self._carregando
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Pede a próxima página; as linhas entram no modelo quando a leitura termina."""
+        if self.canFetchMore(parent):
+            self._buscar_pagina()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Ordena a tabela no SQL e recomeça a leitura."""
+        self._sort_column = column
+        self._sort_order = order
+        if self._filter is not None:
+            self._reload()
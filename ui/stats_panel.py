@@ -0,0 +1,98 @@
+# stats_panel.py
+from PyQt5.QtWidgets import (QDockWidget, QFileDialog, QHBoxLayout, QHeaderView, QPushButton, QTableWidget,
+                             QTableWidgetItem, QVBoxLayout, QWidget)
+from PyQt5.QtCore import Qt, QTimer
+import logging
+from utils.instrumentation import recorder
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+# Intervalo de atualização do painel em milissegundos
+INTERVALO_ATUALIZACAO = 1000
+
+COLUNAS = ["Operação", "Qtd", "p50 (ms)", "p95 (ms)", "Máx (ms)", "Total (ms)"]
+
+
+class StatsPanel(QDockWidget):
+    def __init__(self, parent=None, span_recorder=None):
+        """
+        Painel com os histogramas de tempo das operações instrumentadas, atualizado periodicamente
+        enquanto estiver visível, com botões para exportar o trace e zerar as medições.
+        :param parent: Janela principal.
+        :param span_recorder: Registro de spans exibido (padrão: o registro compartilhado).
+        """
+        super().__init__("Desempenho", parent)
+        self.setObjectName("stats_panel")
+        self.recorder = span_recorder or recorder
+        self._versao_exibida = -1
+
+        self.table = QTableWidget(0, len(COLUNAS))
+        self.table.setHorizontalHeaderLabels(COLUNAS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+
+        btn_exportar = QPushButton("Exportar Trace")
+        btn_exportar.clicked.connect(self.exportar_trace)
+        btn_zerar = QPushButton("Zerar")
+        btn_zerar.clicked.connect(self.zerar)
+
+        botoes = QHBoxLayout()
+        botoes.addWidget(btn_exportar)
+        botoes.addWidget(btn_zerar)
+        botoes.addStretch()
+        layout = QVBoxLayout()
+        layout.addLayout(botoes)
+        layout.addWidget(self.table)
+        conteudo = QWidget()
+        conteudo.setLayout(layout)
+        self.setWidget(conteudo)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(INTERVALO_ATUALIZACAO)
+        self.timer.timeout.connect(self.atualizar)
+        self.visibilityChanged.connect(self._visibilidade_alterada)
+
+    def _visibilidade_alterada(self, visivel):
+        """Atualiza apenas enquanto o painel está visível."""
+        if visivel:
+            self.atualizar()
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+    def atualizar(self):
+        """
+        Preenche a tabela com os histogramas, das operações mais demoradas (p95) para as mais rápidas.
+        Não faz nada se nenhum span novo foi registrado desde a última atualização.
+        """
+        if self.recorder.versao == self._versao_exibida:
+            return
+        self._versao_exibida = self.recorder.versao
+        linhas = sorted(self.recorder.stats().items(), key=lambda item: item[1]["p95_ms"], reverse=True)
+        self.table.setRowCount(len(linhas))
+        for linha, (nome, stats) in enumerate(linhas):
+            valores = [nome, str(stats["count"])] + [
+                f"{stats[chave]:.2f}" for chave in ("p50_ms", "p95_ms", "max_ms", "total_ms")
+            ]
+            for coluna, valor in enumerate(valores):
+                item = QTableWidgetItem(valor)
+                if coluna > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(linha, coluna, item)
+
+    def exportar_trace(self):
+        """Pergunta o arquivo de destino e exporta os spans no formato de trace do Chrome."""
+        caminho, _ = QFileDialog.getSaveFileName(self, "Exportar Trace", "trace.json", "Trace JSON (*.json)")
+        if not caminho:
+            return
+        try:
+            self.recorder.export_chrome_trace(caminho)
+        except OSError as e:
+            logger.error("Erro ao exportar trace para %s: %s", caminho, e)
+
+    def zerar(self):
+        """Descarta as medições acumuladas."""
+        self.recorder.reset()
+        self.atualizar()
@@ -1,24 +1,95 @@
 # toolbar_extended.py
-from PyQt5.QtWidgets import QPushButton, QHBoxLayout, QWidget, QLineEdit, QLabel, QVBoxLayout, QTableWidget, QTableWidgetItem, QMessageBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QPushButton, QHBoxLayout, QWidget, QLineEdit, QLabel, QVBoxLayout, QTableView, QMessageBox, QCompleter
+from PyQt5.QtCore import Qt, QStringListModel, pyqtSignal
 import json
 import logging
 import os
-from utils.calculations import calcular_area_retangulo, calcular_area_circulo, calcular_sucata, calcular_multiplo_ideal
-from db_manager import buscar_peca_por_codigo, buscar_todas_pecas  # Importa funções do banco de dados
+from utils.instrumentation import instrument
+from utils.logger import log_sampled
 
 # Configurar logger
 logger = logging.getLogger("app_logger")
 
 class ToolbarExtended(QWidget):
-    def __init__(self, canvas, object_manager):
+    # Erros de banco reportados por qualquer thread, exibidos na thread da interface
+    db_error = pyqtSignal(str)
+
+    def __init__(self, canvas, object_manager, deferred=False):
+        """
+        Inicializa a barra de ferramentas estendida.
+        :param canvas: Canvas onde a chapa e as peças são desenhadas.
+        :param object_manager: Gerenciador de objetos.
+        :param deferred: Se True, a configuração salva e o catálogo só são carregados em load_deferred,
+                         chamado depois que a janela aparece.
+        Os módulos de cálculo, de banco e da tabela de peças são importados no primeiro uso
+        (propriedades executor, calc_cache e table_model), fora da abertura da janela.
+        """
         super().__init__()
         self.canvas = canvas
         self.object_manager = object_manager
         self.polygon_creator = None  # Inicializa como None para evitar o erro
+        self.sobra_radius = None  # Raio das peças distribuídas na sobra (None quando a distribuição na sobra está desligada)
         self.config_file = "config.json"  # Arquivo para salvar os últimos dados
-        self.load_saved_data()  # Carrega os dados salvos
+        self.catalog = None  # Catálogo de peças em memória, carregado em segundo plano
+        self._calc_cache = None  # Criados no primeiro uso (ver as propriedades)
+        self._executor = None
+        self._table_model = None
+        self.saved_data = {}
+        if not deferred:
+            self.load_saved_data()  # Carrega os dados salvos
         self.init_ui_extended()  # Chama o método específico para ToolbarExtended
+        self.db_error.connect(self.mostrar_erro_banco)
+        if not deferred:
+            self.carregar_catalogo()
+
+    @property
+    def executor(self):
+        """
+        Executor das consultas ao banco fora da thread da interface, criado no primeiro uso junto
+        com o registro dos erros de banco na linha de status.
+        """
+        if self._executor is None:
+            from db_manager import registrar_ouvinte_erro, remover_ouvinte_erro  # Importado sob demanda, como o executor
+            from query_executor import QueryExecutor
+            self._executor = QueryExecutor(parent=self)
+            self._executor.erro.connect(lambda tag, mensagem: self.mostrar_erro_banco(mensagem))
+            ouvinte = self.db_error.emit
+            registrar_ouvinte_erro(ouvinte)
+            self.destroyed.connect(lambda: remover_ouvinte_erro(ouvinte))
+        return self._executor
+
+    @property
+    def calc_cache(self):
+        """Resultados de cálculo reaproveitados entre cliques e sessões, criado no primeiro cálculo."""
+        if self._calc_cache is None:
+            from db_manager import DB_PATH
+            from utils.calc_cache import CalcCache
+            from utils.calculations import calcular_multiplo_ideal
+            self._calc_cache = CalcCache(maxsize=256, db_path=DB_PATH)
+            self._calc_cache.persistir(calcular_multiplo_ideal, dependencias=("utils.packing",))  # Só o cálculo caro vai para o disco
+        return self._calc_cache
+
+    @property
+    def table_model(self):
+        """Modelo da tabela de peças, criado na primeira consulta (a tabela começa vazia)."""
+        if self._table_model is None:
+            from ui.pecas_table_model import PecasTableModel
+            self._table_model = PecasTableModel(parent=self, executor=self.executor)
+            self._table_model.carregado.connect(lambda linhas: self.log_latencia("pecas_tabela"))
+            self.table.setModel(self._table_model)
+            self.table.sortByColumn(0, Qt.AscendingOrder)
+        return self._table_model
+
+    def load_deferred(self):
+        """Carrega a configuração salva, preenchendo os campos ainda vazios, e inicia a carga do catálogo."""
+        self.load_saved_data()
+        self.restore_inputs()
+        self.carregar_catalogo()
+
+    def carregar_catalogo(self):
+        """Carrega o catálogo de peças em segundo plano."""
+        from catalog_cache import get_catalog  # Importado sob demanda: não é necessário para exibir a janela
+        self.executor.submit("catalogo", get_catalog, on_result=self.catalogo_carregado)
 
     def load_saved_data(self):
         """Carrega os últimos dados salvos do arquivo de configuração."""
@@ -28,7 +99,17 @@ class ToolbarExtended(QWidget):
                 with open(self.config_file, "r") as file:
                     self.saved_data = json.load(file)
             except Exception as e:
-                logger.error(f"Erro ao carregar dados salvos: {e}")
+                logger.error("Erro ao carregar dados salvos: %s", e)
+
+    def restore_inputs(self):
+        """Preenche os campos vazios com os últimos valores salvos."""
+        campos = (
+            (self.height_input, "height"), (self.length_input, "length"), (self.radius_input, "radius"),
+            (self.kerf_input, "kerf"), (self.margin_input, "margin"),
+        )
+        for campo, chave in campos:
+            if not campo.text():
+                campo.setText(str(self.saved_data.get(chave, "")))
 
     def save_data(self):
         """Salva os últimos dados no arquivo de configuração."""
@@ -36,7 +117,7 @@ class ToolbarExtended(QWidget):
             with open(self.config_file, "w") as file:
                 json.dump(self.saved_data, file)
         except Exception as e:
-            logger.error(f"Erro ao salvar dados: {e}")
+            logger.error("Erro ao salvar dados: %s", e)
 
     def init_ui_extended(self):
         """Inicializa a interface específica da barra de ferramentas estendida."""
@@ -51,57 +132,75 @@ class ToolbarExtended(QWidget):
 
         btn_create_polygon = QPushButton("Demarcar Sobra")
         btn_create_polygon.setFixedWidth(button_size)
-        btn_create_polygon.clicked.connect(self.start_polygon_creation)
+        # Os métodos instrumentados não aceitam o "checked" de clicked: as lambdas o descartam
+        btn_create_polygon.clicked.connect(lambda: self.start_polygon_creation())
         button_layout.addWidget(btn_create_polygon)
 
         btn_finalize_polygon = QPushButton("Finalizar Sobra")
         btn_finalize_polygon.setFixedWidth(button_size)
-        btn_finalize_polygon.clicked.connect(self.finalize_polygon)
+        btn_finalize_polygon.clicked.connect(lambda: self.finalize_polygon())
         button_layout.addWidget(btn_finalize_polygon)
 
         btn_edit_polygon = QPushButton("Editar Sobra")
         btn_edit_polygon.setFixedWidth(button_size)
-        btn_edit_polygon.clicked.connect(self.edit_polygon)
+        btn_edit_polygon.clicked.connect(lambda: self.edit_polygon())
         button_layout.addWidget(btn_edit_polygon)
 
         btn_create_rectangle = QPushButton("Chapa")
         btn_create_rectangle.setFixedWidth(button_size)
-        btn_create_rectangle.clicked.connect(self.create_rectangle)
+        btn_create_rectangle.clicked.connect(lambda: self.create_rectangle())
         button_layout.addWidget(btn_create_rectangle)
 
         self.height_input = QLineEdit()
         self.height_input.setPlaceholderText("Altura")
-        self.height_input.setText(str(self.saved_data.get("height", "")))
         button_layout.addWidget(QLabel("A:"))
         button_layout.addWidget(self.height_input)
 
         self.length_input = QLineEdit()
         self.length_input.setPlaceholderText("Comprimento")
-        self.length_input.setText(str(self.saved_data.get("length", "")))
         button_layout.addWidget(QLabel("C:"))
         button_layout.addWidget(self.length_input)
 
         btn_create_circle = QPushButton("Peça")
         btn_create_circle.setFixedWidth(button_size)
-        btn_create_circle.clicked.connect(self.create_circle)
+        btn_create_circle.clicked.connect(lambda: self.create_circle())
         button_layout.addWidget(btn_create_circle)
 
         self.radius_input = QLineEdit()
         self.radius_input.setPlaceholderText("Raio")
-        self.radius_input.setText(str(self.saved_data.get("radius", "")))
         button_layout.addWidget(QLabel("R:"))
         button_layout.addWidget(self.radius_input)
 
+        self.kerf_input = QLineEdit()
+        self.kerf_input.setPlaceholderText("Kerf")
+        button_layout.addWidget(QLabel("K:"))
+        button_layout.addWidget(self.kerf_input)
+
+        self.margin_input = QLineEdit()
+        self.margin_input.setPlaceholderText("Margem")
+        button_layout.addWidget(QLabel("M:"))
+        button_layout.addWidget(self.margin_input)
+
         btn_distribute_circles = QPushButton("Distribuir Peça")
         btn_distribute_circles.setFixedWidth(button_size)
-        btn_distribute_circles.clicked.connect(self.distribute_circles)
+        btn_distribute_circles.clicked.connect(lambda: self.distribute_circles())
         button_layout.addWidget(btn_distribute_circles)
 
+        btn_distribute_sobra = QPushButton("Distribuir na Sobra")
+        btn_distribute_sobra.setFixedWidth(button_size)
+        btn_distribute_sobra.clicked.connect(lambda: self.distribute_in_sobra())
+        button_layout.addWidget(btn_distribute_sobra)
+
         btn_clear_screen = QPushButton("Limpar Tela")
         btn_clear_screen.setFixedWidth(button_size)
-        btn_clear_screen.clicked.connect(self.clear_screen)
+        btn_clear_screen.clicked.connect(lambda: self.clear_screen())
         button_layout.addWidget(btn_clear_screen)
 
+        btn_fit_view = QPushButton("Ajustar Vista")
+        btn_fit_view.setFixedWidth(button_size)
+        btn_fit_view.clicked.connect(lambda: self.canvas.fit_to_view())
+        button_layout.addWidget(btn_fit_view)
+
         main_layout.addLayout(button_layout)
 
         # Campos para busca no banco de dados
@@ -109,16 +208,22 @@ class ToolbarExtended(QWidget):
 
         self.entry_codigo = QLineEdit()
         self.entry_codigo.setPlaceholderText("Código da Peça")
+        # Sugestões enquanto o usuário digita, vindas do catálogo em memória
+        self.completion_model = QStringListModel()
+        self.completer = QCompleter(self.completion_model, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.entry_codigo.setCompleter(self.completer)
+        self.entry_codigo.textEdited.connect(self.atualizar_sugestoes)
         db_layout.addWidget(self.entry_codigo)
 
         btn_medidas = QPushButton("Medidas")
         btn_medidas.setFixedWidth(button_size)
-        btn_medidas.clicked.connect(self.buscar_por_codigo)
+        btn_medidas.clicked.connect(lambda: self.buscar_por_codigo())
         db_layout.addWidget(btn_medidas)
 
         btn_carregar_todos = QPushButton("Carregar Todos")
         btn_carregar_todos.setFixedWidth(button_size)
-        btn_carregar_todos.clicked.connect(self.carregar_todos)
+        btn_carregar_todos.clicked.connect(lambda: self.carregar_todos())
         db_layout.addWidget(btn_carregar_todos)
 
         main_layout.addLayout(db_layout)
@@ -138,10 +243,10 @@ class ToolbarExtended(QWidget):
 
         main_layout.addLayout(fields_layout)
 
-        # Tabela para listar peças
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Código", "Comprimento", "Largura"])
+        # Tabela para listar peças, lida do banco sob demanda conforme a rolagem (modelo criado na primeira consulta)
+        self.table = QTableView()
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.AscendingOrder)
         main_layout.addWidget(self.table)
 
         # Campos de exibição de texto
@@ -156,11 +261,16 @@ class ToolbarExtended(QWidget):
         text_fields_layout.addWidget(self.sucata_display)
         self.sobra_display = QLabel("Sobra: ")  # Novo campo "Sobra"
         text_fields_layout.addWidget(self.sobra_display)
+        self.status_display = QLabel("")  # Erros de banco, sem diálogos modais
+        self.status_display.setStyleSheet("color: red")
+        text_fields_layout.addWidget(self.status_display)
 
         main_layout.addLayout(text_fields_layout)
         self.setLayout(main_layout)
+        self.restore_inputs()
         logger.info("ToolbarExtended configurada com sucesso.")
 
+    @instrument("toolbar")
     def buscar_por_codigo(self):
         """Busca uma peça pelo código no banco de dados."""
         cod_peca = self.entry_codigo.text()
@@ -168,27 +278,101 @@ class ToolbarExtended(QWidget):
             QMessageBox.warning(self, "Aviso", "Por favor, insira um código de peça.")
             return
 
-        dado = buscar_peca_por_codigo(cod_peca)
+        self.status_display.clear()
+        self.executor.submit("buscar", self.consultar_codigo, cod_peca, on_result=self.exibir_peca)
+
+    def consultar_codigo(self, cod_peca):
+        """
+        Consulta a peça no catálogo (ou no banco, se o catálogo não estiver carregado).
+        Executada em uma thread de trabalho; não deve tocar em widgets.
+        :param cod_peca: Código da peça.
+        :return: Tupla (cod_peca, dado, sugestões de códigos parecidos).
+        """
+        catalogo = self.catalog
+        if catalogo:
+            catalogo.refresh()
+            dado = catalogo.get(cod_peca)
+        else:
+            from db_manager import buscar_peca_por_codigo
+            dado = buscar_peca_por_codigo(cod_peca)
+        sugestoes = catalogo.fuzzy_search(cod_peca, limite=5) if catalogo and not dado else []
+        return cod_peca, dado, sugestoes
+
+    @instrument("toolbar")
+    def exibir_peca(self, resultado):
+        """
+        Exibe o resultado de consultar_codigo na interface.
+        :param resultado: Tupla (cod_peca, dado, sugestões).
+        """
+        cod_peca, dado, sugestoes = resultado
+        if not self.catalog:
+            self.log_latencia("buscar_peca_por_codigo")
         if dado:
             self.entry_comprimento.setText(str(dado[1]))
             self.entry_largura.setText(str(dado[2]))
-            self.atualizar_tabela([dado])
+            self.atualizar_tabela(cod_peca)
+            return
+        if sugestoes:
+            QMessageBox.information(self, "Info", f"Nenhuma peça encontrada com esse código. Códigos parecidos: {', '.join(sugestoes)}")
         else:
             QMessageBox.information(self, "Info", "Nenhuma peça encontrada com esse código.")
 
+    @instrument("toolbar")
+    def catalogo_carregado(self, catalogo):
+        """
+        Recebe o catálogo carregado em segundo plano.
+        :param catalogo: Instância de PartCatalog ou None se o banco não pôde ser lido.
+        """
+        self.catalog = catalogo
+        if catalogo is not None:
+            self.log_latencia("catalogo_carregar")
+
+    def mostrar_erro_banco(self, mensagem):
+        """
+        Exibe um erro de banco de dados na linha de status, sem bloquear a interface.
+        :param mensagem: Mensagem de erro.
+        """
+        self.status_display.setText(mensagem)
+
+    @instrument("toolbar")
+    def atualizar_sugestoes(self, texto):
+        """
+        Atualiza as sugestões de código conforme o usuário digita.
+        Uma busca ainda em andamento para o código anterior é cancelada.
+        :param texto: Texto atual do campo de código.
+        """
+        self.executor.cancel("buscar")
+        if not self.catalog or not texto:
+            self.completion_model.setStringList([])
+            return
+        self.completion_model.setStringList(self.catalog.prefix_search(texto, limite=50))
+        self.completer.complete()
+
+    @instrument("toolbar")
     def carregar_todos(self):
         """Carrega todas as peças do banco de dados."""
-        dados = buscar_todas_pecas()
-        self.atualizar_tabela(dados)
+        self.atualizar_tabela()
 
-    def atualizar_tabela(self, dados):
-        """Atualiza a tabela com os dados fornecidos."""
-        self.table.setRowCount(len(dados))
-        for row, dado in enumerate(dados):
-            self.table.setItem(row, 0, QTableWidgetItem(str(dado[0])))
-            self.table.setItem(row, 1, QTableWidgetItem(str(dado[1])))
-            self.table.setItem(row, 2, QTableWidgetItem(str(dado[2])))
+    def log_latencia(self, label):
+        """
+        Registra a latência da última consulta e a média acumulada pelo pool de conexões.
+        :param label: Nome da consulta nos contadores do pool.
+        """
+        from db_manager import get_pool
+        stats = get_pool().stats().get(label)
+        if stats:
+            # Uma consulta por tecla na busca: no máximo um registro por segundo para cada consulta
+            log_sampled(logger, logging.INFO, "latencia_" + label, 1.0, "Consulta '%s': %.2f ms (média %.2f ms em %d consultas)",
+                        label, stats["last_ms"], stats["avg_ms"], stats["count"])
+
+    def atualizar_tabela(self, cod_peca=""):
+        """
+        Atualiza a tabela com a consulta correspondente; o modelo lê as linhas sob demanda.
+        :param cod_peca: Código exato a exibir, ou vazio para todas as peças.
+        """
+        self.table_model.set_filter(cod_peca, exato=bool(cod_peca))
 
+    @instrument("toolbar")
     def start_polygon_creation(self):
         """Inicia a criação de um polígono."""
         if self.polygon_creator is None:
@@ -196,30 +380,63 @@ class ToolbarExtended(QWidget):
                 from ui.polygon_creator import PolygonCreator  # Importa aqui para evitar circular imports
                 self.polygon_creator = PolygonCreator(self.canvas, self)  # Passa o toolbar como argumento
             except ImportError as e:
-                logger.error(f"Erro ao importar PolygonCreator: {e}")
+                logger.error("Erro ao importar PolygonCreator: %s", e)
                 return
+            self.polygon_creator.polygon_changed.connect(self.atualizar_distribuicao_sobra)
+        self.sobra_radius = None
         self.polygon_creator.start_polygon_creation()
 
+    @instrument("toolbar")
     def finalize_polygon(self):
         """Finaliza a criação do polígono."""
         if self.polygon_creator:
             self.polygon_creator.finalize_polygon()
             logger.info("Finalização do polígono acionada via Toolbar.")
 
+    @instrument("toolbar")
     def edit_polygon(self):
         """Ativa o modo de edição do último polígono criado."""
         if self.polygon_creator:
             self.polygon_creator.edit_polygon()
             logger.info("Edição de polígono acionada via Toolbar.")
 
+    @instrument("toolbar")
+    def distribute_in_sobra(self):
+        """Distribui as peças dentro da sobra demarcada; a distribuição acompanha a edição do contorno."""
+        try:
+            radius = float(self.radius_input.text())
+        except ValueError:
+            logger.error("Valor inválido para raio.")
+            return
+        if radius <= 0:
+            logger.error("O raio deve ser um valor positivo.")
+            return
+        if not self.polygon_creator or not self.polygon_creator.is_finalized:
+            logger.error("Nenhuma sobra finalizada para distribuir peças.")
+            return
+        self.sobra_radius = radius
+        self.atualizar_distribuicao_sobra()
+
+    @instrument("toolbar")
+    def atualizar_distribuicao_sobra(self):
+        """Recalcula a distribuição na sobra, se ativa (chamado a cada alteração do contorno)."""
+        if self.sobra_radius is None or not self.polygon_creator or not self.polygon_creator.is_finalized:
+            return
+        from utils.calculations import calcular_area_circulo  # Importado sob demanda: carrega o NumPy e o empacotamento
+        quantidade = self.canvas.distribute_circles_in_polygon(self.sobra_radius, self.polygon_creator.points)
+        circle_area = self.calc_cache.call(calcular_area_circulo, self.sobra_radius)
+        self.multiplo_ideal_display.setText(f"Múltiplo na Sobra: {quantidade}")
+        self.area_pieces_display.setText(f"Área das Peças: {quantidade * circle_area:.2f} m²")
+
     def update_sobra(self, polygon_area):
         """
         Atualiza o campo "Sobra" com a área do polígono em m².
         :param polygon_area: Área do polígono em metros quadrados.
         """
         self.sobra_display.setText(f"Sobra: {polygon_area:.2f} m²")
-        logger.info(f"Campo 'Sobra' atualizado com área: {polygon_area:.2f} m²")
+        logger.debug("Campo 'Sobra' atualizado com área: %.2f m²", polygon_area)  # Chamado a cada quadro da edição de vértices
 
+    @instrument("toolbar")
     def create_rectangle(self):
         try:
             height = float(self.height_input.text())
@@ -227,7 +444,7 @@ class ToolbarExtended(QWidget):
             if height <= 0 or length <= 0:
                 logger.error("Altura e comprimento devem ser valores positivos.")
                 return
-            logger.info(f"Botão 'Criar Retângulo' clicado. Altura={height}, Comprimento={length}")
+            logger.info("Botão 'Criar Retângulo' clicado. Altura=%s, Comprimento=%s", height, length)
             self.canvas.draw_rectangle((50, 50), length, height)
             logger.info("Retângulo adicionado ao canvas.")
             # Salva os valores no arquivo de configuração
@@ -235,29 +452,33 @@ class ToolbarExtended(QWidget):
             self.saved_data["length"] = length
             self.save_data()
             # Atualiza as informações de área
-            rect_area = calcular_area_retangulo(length, height)
+            from utils.calculations import calcular_area_retangulo
+            rect_area = self.calc_cache.call(calcular_area_retangulo, length, height)
             self.update_area_info(rect_area=rect_area)
         except ValueError:
             logger.error("Valores inválidos para altura ou comprimento.")
 
+    @instrument("toolbar")
     def create_circle(self):
         try:
             radius = float(self.radius_input.text())
             if radius <= 0:
                 logger.error("O raio deve ser um valor positivo.")
                 return
-            logger.info(f"Botão 'Criar Círculo' clicado. Raio={radius}")
+            logger.info("Botão 'Criar Círculo' clicado. Raio=%s", radius)
             self.canvas.draw_circle(radius)  # Corrigido para passar apenas o raio
             logger.info("Círculo adicionado ao canvas.")
             # Salva o valor no arquivo de configuração
             self.saved_data["radius"] = radius
             self.save_data()
             # Atualiza as informações de área
-            circle_area = calcular_area_circulo(radius)
+            from utils.calculations import calcular_area_circulo
+            circle_area = self.calc_cache.call(calcular_area_circulo, radius)
             self.update_area_info(circle_radius=radius, circle_area=circle_area)
         except ValueError:
             logger.error("Valor inválido para raio.")
 
+    @instrument("toolbar")
     def distribute_circles(self):
         try:
             radius = float(self.radius_input.text())
@@ -267,18 +488,37 @@ class ToolbarExtended(QWidget):
             if not self.canvas.current_rectangle:
                 logger.error("Nenhum retângulo disponível para distribuir círculos.")
                 return
-            self.canvas.distribute_circles(radius)
+            kerf, margin = self.read_kerf_margin()
+            self.sobra_radius = None
+            self.canvas.distribute_circles(radius, kerf=kerf, margin=margin)
+            self.saved_data["kerf"] = kerf
+            self.saved_data["margin"] = margin
+            self.save_data()
             logger.info("Círculos distribuídos dentro do retângulo.")
             # Atualiza as informações de área
-            rect = self.canvas.current_rectangle.rect()
-            rect_area = calcular_area_retangulo(rect.width(), rect.height())
-            circle_area = calcular_area_circulo(radius)
-            self.update_area_info(rect_area=rect_area, circle_area=circle_area)
+            from utils.calculations import calcular_area_circulo, calcular_area_retangulo
+            rect_area = self.calc_cache.call(calcular_area_retangulo, self.canvas.original_width, self.canvas.original_height)
+            circle_area = self.calc_cache.call(calcular_area_circulo, radius)
+            self.update_area_info(rect_area=rect_area, circle_radius=radius, circle_area=circle_area)
         except Exception as e:
-            logger.error(f"Erro ao distribuir círculos: {e}")
+            logger.error("Erro ao distribuir círculos: %s", e)
+
+    def read_kerf_margin(self):
+        """
+        Lê o kerf e a margem da chapa; campos vazios valem zero.
+        :return: Tupla (kerf, margem) em milímetros.
+        :raises ValueError: Se algum valor for inválido ou negativo.
+        """
+        kerf = float(self.kerf_input.text() or 0)
+        margin = float(self.margin_input.text() or 0)
+        if kerf < 0 or margin < 0:
+            raise ValueError("Kerf e margem não podem ser negativos.")
+        return kerf, margin
 
+    @instrument("toolbar")
     def clear_screen(self):
         """Limpa todo o conteúdo do canvas."""
+        self.sobra_radius = None
         self.canvas.clear_scene()
         logger.info("Tela limpa pelo botão 'Limpar Tela'.")
 
@@ -289,15 +529,27 @@ class ToolbarExtended(QWidget):
         :param circle_radius: Raio do círculo.
         :param circle_area: Área do círculo.
         """
+        from utils.calculations import calcular_area_circulo, calcular_multiplo_ideal, calcular_sucata
         if rect_area:
             self.area_pieces_display.setText(f"Área das Peças: {rect_area:.2f} m²")
         if circle_radius:
-            circle_area = calcular_area_circulo(circle_radius)
+            if circle_area is None:
+                circle_area = self.calc_cache.call(calcular_area_circulo, circle_radius)
             self.area_single_piece_display.setText(f"Área Peça: {circle_area:.2f} m²")
-        if circle_area and rect_area:
-            multiplo_ideal = calcular_multiplo_ideal(rect_area, circle_area)
+        if circle_area and rect_area and circle_radius and self.canvas.original_width:
+            diametro = circle_radius * 2
+            try:
+                kerf, margin = self.read_kerf_margin()
+            except ValueError:
+                kerf, margin = 0.0, 0.0
+            multiplo_ideal = self.calc_cache.call(
+                calcular_multiplo_ideal, rect_area, self.canvas.original_width, self.canvas.original_height,
+                diametro, diametro, "circular", kerf, margin
+            )
             total_pieces_area = multiplo_ideal * circle_area
             sucata = calcular_sucata(rect_area, total_pieces_area)
             self.multiplo_ideal_display.setText(f"Múltiplo Ideal: {multiplo_ideal}")
             self.sucata_display.setText(f"Sucata: {sucata:.2f} m²")
-            self.area_pieces_display.setText(f"Área das Peças: {total_pieces_area:.2f} m²")
\ No newline at end of file
+            self.area_pieces_display.setText(f"Área das Peças: {total_pieces_area:.2f} m²")
+            if logger.isEnabledFor(logging.DEBUG):  # Evita montar as estatísticas a cada atualização das áreas
+                logger.debug("Cache de cálculos: %s", self.calc_cache.stats())
\ No newline at end of file
@@ -0,0 +1,245 @@
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS cache_calculos ("
+    "funcao TEXT NOT NULL, chave TEXT NOT NULL, valor TEXT NOT NULL, PRIMARY KEY (funcao, chave))"
+)
+
+
+def versao_codigo(*objetos):
+    """
+    Calcula a versão do código de funções ou módulos: um hash curto do código-fonte de cada um.
+    :param objetos: Funções, módulos ou nomes de módulos ("utils.packing").
+    :return: Texto hexadecimal com 12 caracteres.
+    """
+    resumo = hashlib.sha1()
+    for objeto in objetos:
+        if isinstance(objeto, str):
+            objeto = importlib.import_module(objeto)
+        try:
+            fonte = inspect.getsource(objeto)
+        except (OSError, TypeError):
+            codigo = getattr(objeto, "__code__", None)  # Sem o fonte (ex.: executável congelado), usa o bytecode
+            fonte = repr((codigo.co_code, codigo.co_consts)) if codigo else repr(objeto)
+        resumo.update(fonte.encode("utf-8"))
+    return resumo.hexdigest()[:12]
+
+
+class CalcCache:
+    def __init__(self, maxsize=1024, db_path=None, precisao=6):
+        """
+        Inicializa o cache de resultados das funções de cálculo.
+        Todas as funções usam o cache em memória; o nível em disco vale apenas para as registradas com
+        persistir(), que devem ser as de cálculo caro (as áreas custam menos que uma consulta ao banco).
+        :param maxsize: Número máximo de resultados em memória (os menos usados são descartados).
+        :param db_path: Banco SQLite opcional para persistir os resultados entre execuções
+                        (tabela cache_calculos, ao lado de aproveitamento).
+        :param precisao: Casas decimais usadas para normalizar argumentos em ponto flutuante.
+        """
+        self.maxsize = maxsize
+        self.precisao = precisao
+        self.db_path = db_path
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self._tabela_criada = False
+        self._persistentes = {}  # Função -> nome versionado usado na tabela
+        self._fila = queue.Queue()
+        self._escritor = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def _normalizar(self, valor):
+        """Normaliza um argumento: números viram float arredondado, para que 10 e 10.0000001 coincidam."""
+        if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+            return valor
+        if isinstance(valor, (int, float)):
+            return round(float(valor), self.precisao) + 0.0  # + 0.0 converte -0.0 em 0.0
+        if isinstance(valor, (list, tuple)):
+            return [self._normalizar(item) for item in valor]
+        return repr(valor)
+
+    def _chave(self, args, kwargs):
+        """Monta a chave textual de uma chamada a partir dos argumentos normalizados."""
+        return json.dumps(
+            [[self._normalizar(arg) for arg in args], sorted((k, self._normalizar(v)) for k, v in kwargs.items())]
+        )
+
+    def _nome(self, func):
+        """Nome da função no cache; as persistentes levam a versão do código (ex.: "modulo.funcao@1a2b3c")."""
+        return self._persistentes.get(func) or f"{func.__module__}.{func.__qualname__}"
+
+    def persistir(self, func, versao=None, dependencias=()):
+        """
+        Registra uma função de cálculo caro para o nível em disco.
+        Os resultados são gravados com a versão do código; ao mudar a versão, os resultados antigos da
+        função deixam de ser usados e são apagados da tabela.
+        :param func: Função de cálculo pura.
+        :param versao: Versão explícita (padrão: hash do fonte do módulo da função e das dependências).
+        :param dependencias: Funções ou módulos cujo código também altera o resultado.
+        """
+        if versao is None:
+            versao = versao_codigo(func.__module__, *dependencias)
+        base = f"{func.__module__}.{func.__qualname__}"
+        nome = f"{base}@{versao}"
+        self._persistentes[func] = nome
+        if self.db_path:
+            self._enfileirar(("limpar", base, nome))
+
+    def _pool(self):
+        from db_manager import get_pool  # Importa aqui para manter o módulo de cálculos independente do banco
+        return get_pool(self.db_path)
+
+    def _ler_disco(self, funcao, chave):
+        """Busca um resultado na tabela cache_calculos; retorna (encontrado, valor)."""
+        try:
+            self._criar_tabela()
+            linha = self._pool().fetchone(
+                "SELECT valor FROM cache_calculos WHERE funcao = ? AND chave = ?", (funcao, chave), label="cache_calculos_ler"
+            )
+        except sqlite3.Error as e:
+            logger.error("Erro ao ler o cache de cálculos: %s", e)
+            return False, None
+        if linha is None:
+            return False, None
+        return True, json.loads(linha[0])
+
+    def _gravar_disco(self, funcao, chave, resultado):
+        """Enfileira a gravação de um resultado serializável em JSON; a escrita é feita em segundo plano."""
+        try:
+            valor = json.dumps(resultado)
+        except (TypeError, ValueError):
+            return  # Resultados não serializáveis (ex.: arrays) ficam apenas em memória
+        self._enfileirar(("gravar", funcao, chave, valor))
+
+    def _enfileirar(self, tarefa):
+        """Entrega uma tarefa ao escritor em segundo plano, iniciando-o na primeira vez."""
+        with self._lock:
+            if self._escritor is None:
+                self._escritor = threading.Thread(target=self._escrever, name="calc_cache", daemon=True)
+                self._escritor.start()
+        self._fila.put(tarefa)
+
+    def _escrever(self):
+        """Laço do escritor: agrupa as gravações pendentes em uma transação por vez."""
+        while True:
+            tarefas = [self._fila.get()]
+            while True:
+                try:
+                    tarefas.append(self._fila.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._criar_tabela()
+                pool = self._pool()
+                for tarefa in tarefas:
+                    if tarefa[0] == "limpar":
+                        _, base, nome = tarefa
+                        pool.executemany(
+                            "DELETE FROM cache_calculos WHERE funcao LIKE ? AND funcao <> ?",
+                            [(base + "@%", nome)], label="cache_calculos_limpar",
+                        )
+                gravacoes = [tarefa[1:] for tarefa in tarefas if tarefa[0] == "gravar"]
+                if gravacoes:
+                    pool.executemany(
+                        "INSERT OR REPLACE INTO cache_calculos (funcao, chave, valor) VALUES (?, ?, ?)",
+                        gravacoes, label="cache_calculos_gravar",
+                    )
+            except sqlite3.Error as e:
+                logger.error("Erro ao gravar o cache de cálculos: %s", e)
+            finally:
+                for _ in tarefas:
+                    self._fila.task_done()
+
+    def flush(self):
+        """Aguarda o escritor gravar todos os resultados pendentes."""
+        self._fila.join()
+
+    def _criar_tabela(self):
+        if not self._tabela_criada:
+            conexao = self._pool().connection()
+            with conexao:
+                conexao.execute(CREATE_TABLE)
+            self._tabela_criada = True
+
+    def call(self, func, *args, **kwargs):
+        """
+        Retorna o resultado de func(*args, **kwargs), usando o cache quando possível.
+        :param func: Função de cálculo pura (o resultado depende apenas dos argumentos).
+        :return: Resultado da função.
+        """
+        funcao = self._nome(func)
+        chave = self._chave(args, kwargs)
+        with self._lock:
+            if (funcao, chave) in self._memoria:
+                self._memoria.move_to_end((funcao, chave))
+                self.hits += 1
+                return self._memoria[(funcao, chave)]
+        persistente = bool(self.db_path) and func in self._persistentes
+        if persistente:
+            encontrado, resultado = self._ler_disco(funcao, chave)
+            if encontrado:
+                with self._lock:
+                    self.disk_hits += 1
+                self._guardar(funcao, chave, resultado)
+                return resultado
+        with self._lock:
+            self.misses += 1
+        resultado = func(*args, **kwargs)
+        self._guardar(funcao, chave, resultado)
+        if persistente:
+            self._gravar_disco(funcao, chave, resultado)
+        return resultado
+
+    def _guardar(self, funcao, chave, resultado):
+        """Guarda o resultado em memória, descartando o menos usado quando o limite é atingido."""
+        with self._lock:
+            self._memoria[(funcao, chave)] = resultado
+            self._memoria.move_to_end((funcao, chave))
+            while len(self._memoria) > self.maxsize:
+                self._memoria.popitem(last=False)
+
+    def memoizar(self, func):
+        """
+        Decorador que passa todas as chamadas de func pelo cache.
+        :param func: Função de cálculo pura.
+        :return: Função decorada.
+        """
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        return wrapper
+
+    def stats(self):
+        """
+        Retorna as estatísticas de uso do cache.
+        :return: Dicionário com hits, disk_hits, misses, size, maxsize e hit_rate.
+        """
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self._memoria),
+                "maxsize": self.maxsize,
+                "hit_rate": (self.hits + self.disk_hits) / total if total else 0.0,
+            }
+
+    def clear(self):
+        """Limpa o cache em memória e zera as estatísticas (o nível em disco é mantido)."""
+        with self._lock:
+            self._memoria.clear()
+            self.hits = self.misses = self.disk_hits = 0
@@ -1,4 +1,5 @@
 import math
+from utils.packing import empacotar_circulos, resolver_guilhotina
 
 def calcular_area_retangulo(comprimento, altura):
     """
@@ -28,7 +29,7 @@ def calcular_sucata(area_retangulo, area_total_circulos):
 
 
 
-def calcular_multiplo_ideal(area_retangulo, largura_retangulo, altura_retangulo, largura_objeto, altura_objeto, formato="retangular"):
+def calcular_multiplo_ideal(area_retangulo, largura_retangulo, altura_retangulo, largura_objeto, altura_objeto, formato="retangular", kerf=0.0, margem=0.0):
     """
     Calcula o número máximo de objetos que cabem no retângulo considerando sua forma geométrica.
     :param area_retangulo: Área total do retângulo.
@@ -37,20 +38,20 @@ def calcular_multiplo_ideal(area_retangulo, largura_retangulo, altura_retangulo,
     :param largura_objeto: Largura do objeto.
     :param altura_objeto: Altura do objeto.
     :param formato: Forma geométrica do objeto ("retangular", "circular", "hexagonal").
+    :param kerf: Largura do corte entre peças, em milímetros.
+    :param margem: Distância mínima entre peças circulares e as bordas da chapa, em milímetros.
     :return: Número inteiro de objetos que cabem no retângulo.
     """
     if formato == "retangular":
-        # Disposição simples em grade
-        colunas = largura_retangulo // largura_objeto
-        linhas = altura_retangulo // altura_objeto
-        return int(colunas * linhas)
+        # Cortes guilhotinados com rotação de 90° e faixas de orientações diferentes
+        total, _ = resolver_guilhotina(largura_retangulo, altura_retangulo, largura_objeto, altura_objeto, kerf)
+        return int(total)
     
     elif formato == "circular":
-        # Empacotamento hexagonal otimizado para círculos
+        # Melhor arranjo entre linhas hexagonais deslocadas, colunas hexagonais e grade quadrada
         diametro = largura_objeto  # Supondo que largura_objeto seja o diâmetro do círculo
-        colunas = largura_retangulo // diametro
-        linhas = altura_retangulo // (diametro * 0.866)  # Fator de empacotamento hexagonal
-        return int(colunas * linhas)
+        total, _ = empacotar_circulos(largura_retangulo, altura_retangulo, diametro / 2, kerf, margem)
+        return int(total)
     
     elif formato == "hexagonal":
         # Empacotamento otimizado para hexágonos
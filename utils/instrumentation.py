@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Configurar logger
+logger = logging.getLogger("app_logger")
+
+# Amostras mais recentes guardadas por operação para calcular os percentis
+JANELA_AMOSTRAS = 2048
+# Eventos mais recentes guardados para exportar o trace (os mais antigos são descartados)
+MAX_EVENTOS = 200_000
+
+
+class SpanRecorder:
+    def __init__(self, janela=JANELA_AMOSTRAS, max_eventos=MAX_EVENTOS):
+        """
+        Inicializa o registro de spans (intervalos de tempo nomeados) das operações da aplicação.
+        Cada span alimenta o histograma da sua operação (contagem, p50, p95, máximo) e a lista de
+        eventos exportável no formato de trace do Chrome (chrome://tracing, Perfetto).
+        :param janela: Amostras mais recentes usadas nos percentis de cada operação.
+        :param max_eventos: Eventos mais recentes mantidos para o trace.
+        """
+        self.janela = janela
+        self.ativo = True
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._eventos = deque(maxlen=max_eventos)
+        self._threads = {}
+        self._origem = time.perf_counter()
+        self.versao = 0  # Incrementada a cada span, para a interface saber se há novidades
+
+    def record(self, nome, categoria, inicio, duracao):
+        """
+        Registra um span já medido.
+        :param nome: Nome da operação (ex.: "Canvas.distribute_circles").
+        :param categoria: Grupo da operação ("toolbar", "canvas", "db"...).
+        :param inicio: Instante de início, em segundos de time.perf_counter().
+        :param duracao: Duração em segundos.
+        """
+        if not self.ativo:
+            return
+        duracao_ms = duracao * 1000
+        thread = threading.current_thread()
+        with self._lock:
+            stats = self._stats.get(nome)
+            if stats is None:
+                stats = self._stats[nome] = {
+                    "categoria": categoria, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "amostras": deque(maxlen=self.janela),
+                }
+            stats["count"] += 1
+            stats["total_ms"] += duracao_ms
+            stats["max_ms"] = max(stats["max_ms"], duracao_ms)
+            stats["amostras"].append(duracao_ms)
+            self._eventos.append((nome, categoria, inicio, duracao, thread.ident))
+            self._threads.setdefault(thread.ident, thread.name)
+            self.versao += 1
+
+    @contextmanager
+    def span(self, nome, categoria="app"):
+        """
+        Mede o bloco como um span.
+        Uso: with recorder.span("calculo", "logic"): ...
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(nome, categoria, inicio, time.perf_counter() - inicio)
+
+    def stats(self):
+        """
+        Retorna o histograma de cada operação.
+        :return: Dicionário {nome: {"categoria", "count", "total_ms", "avg_ms", "p50_ms", "p95_ms", "max_ms"}}.
+        """
+        with self._lock:
+            copia = {nome: (dict(stats), list(stats["amostras"])) for nome, stats in self._stats.items()}
+        resultado = {}
+        for nome, (stats, amostras) in copia.items():
+            amostras.sort()
+            del stats["amostras"]
+            stats["avg_ms"] = stats["total_ms"] / stats["count"]
+            stats["p50_ms"] = _percentil(amostras, 0.50)
+            stats["p95_ms"] = _percentil(amostras, 0.95)
+            resultado[nome] = stats
+        return resultado
+
+    def reset(self):
+        """Descarta os histogramas e os eventos registrados."""
+        with self._lock:
+            self._stats.clear()
+            self._eventos.clear()
+            self.versao += 1
+
+    def export_chrome_trace(self, caminho):
+        """
+        Grava os eventos registrados no formato JSON de trace do Chrome (eventos completos "X").
+        :param caminho: Arquivo de destino.
+        :return: Número de spans exportados.
+        """
+        with self._lock:
+            eventos = list(self._eventos)
+            threads = dict(self._threads)
+        pid = os.getpid()
+        trace = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": nome}}
+            for tid, nome in threads.items()
+        ]
+        for nome, categoria, inicio, duracao, tid in eventos:
+            trace.append({
+                "name": nome, "cat": categoria, "ph": "X", "pid": pid, "tid": tid,
+                "ts": round((inicio - self._origem) * 1e6, 3), "dur": round(duracao * 1e6, 3),
+            })
+        with open(caminho, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+        logger.info("Trace com %d spans exportado para %s.", len(eventos), caminho)
+        return len(eventos)
+
+
+def _percentil(ordenadas, fracao):
+    """Percentil por posição mais próxima de uma lista já ordenada (0.0 se vazia)."""
+    if not ordenadas:
+        return 0.0
+    return ordenadas[min(len(ordenadas) - 1, int(fracao * len(ordenadas)))]
+
+
+# Registro compartilhado pela aplicação
+recorder = SpanRecorder()
+
+
+def instrument(categoria, nome=None):
+    """
+    Decorador que mede cada chamada da função como um span no registro compartilhado.
+    Os argumentos são repassados sem alteração; ao conectar um método decorado a um sinal com
+    argumentos que ele não aceita (ex.: o "checked" de clicked), use uma lambda na conexão.
+    :param categoria: Grupo da operação ("toolbar", "canvas"...).
+    :param nome: Nome do span (padrão: Classe.metodo).
+    """
+    def decorador(funcao):
+        nome_span = nome or funcao.__qualname__
+
+        @wraps(funcao)
+        def wrapper(*args, **kwargs):
+            if not recorder.ativo:
+                return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                recorder.record(nome_span, categoria, inicio, time.perf_counter() - inicio)
+        return wrapper
+    return decorador
@@ -1,17 +1,118 @@
+import atexit
 import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-def setup_logger():
+LOGGER_NAME = "app_logger"
+FORMATO = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+ARQUIVO_LOG = os.path.join("logs", "app.log")
+
+# Escritor em segundo plano ativo (um por processo)
+_listener = None
+# Chave do ponto de chamada -> [instante da última emissão, mensagens suprimidas desde então]
+_amostragem = {}
+
+
+def setup_logger(nivel=None, arquivo=None, max_bytes=5 * 1024 * 1024, backups=3, console=True):
     """
-    Configura o logger para logs da aplicação.
+    Configura o logger da aplicação (QueueHandler/QueueListener). Na thread que chama, o registro só tem
+    a mensagem interpolada (msg % args, em QueueHandler.prepare, para que argumentos alterados depois da
+    chamada não mudem o texto) e é enfileirado; a formatação com data e nível e a escrita no console e no
+    arquivo rotativo ficam com uma thread em segundo plano, fora dos caminhos críticos da interface.
+    Chamadas abaixo do nível ativo não interpolam nada, por isso as mensagens usam o estilo %.
+    Chamar de novo reconfigura o logger, sem duplicar handlers.
+    :param nivel: Nível inicial (nome ou número); padrão: variável APP_LOG_LEVEL ou INFO.
+    :param arquivo: Caminho do arquivo de log rotativo; padrão: variável APP_LOG_FILE (sem arquivo se ausente).
+    :param max_bytes: Tamanho máximo do arquivo antes da rotação.
+    :param backups: Quantidade de arquivos antigos mantidos.
+    :param console: Se True, também escreve no console.
     :return: Instância do logger configurada.
     """
-    logger = logging.getLogger("app_logger")
-    logger.setLevel(logging.INFO)
+    global _listener
+    shutdown_logger()
+    logger = logging.getLogger(LOGGER_NAME)
+    set_log_level(nivel if nivel is not None else os.environ.get("APP_LOG_LEVEL", logging.INFO))
+    arquivo = arquivo if arquivo is not None else os.environ.get("APP_LOG_FILE")
     # Configura o formato do log
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    # Cria um handler para escrever logs no console
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    # Adiciona o handler ao logger
-    logger.addHandler(console_handler)
-    return logger
\ No newline at end of file
+    formatter = logging.Formatter(FORMATO)
+    handlers = []
+    if console:
+        # Cria um handler para escrever logs no console
+        handlers.append(logging.StreamHandler())
+    if arquivo:
+        diretorio = os.path.dirname(arquivo)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        handlers.append(RotatingFileHandler(arquivo, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    fila = queue.SimpleQueue()
+    for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+        logger.removeHandler(handler)
+    # Adiciona ao logger apenas o handler da fila; os demais ficam com o escritor em segundo plano
+    logger.addHandler(QueueHandler(fila))
+    _listener = QueueListener(fila, *handlers, respect_handler_level=True)
+    _listener.start()
+    return logger
+
+
+def shutdown_logger():
+    """
+    Para o escritor em segundo plano, gravando os registros ainda na fila e fechando os arquivos.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+atexit.register(shutdown_logger)
+
+
+def set_log_level(nivel):
+    """
+    Altera o nível do logger da aplicação em tempo de execução.
+    :param nivel: Nome ("DEBUG", "INFO", ...) ou número do nível; "OFF" desliga o log.
+    :return: Nível numérico aplicado.
+    """
+    if isinstance(nivel, str):
+        nome = nivel.strip().upper()
+        nivel = logging.CRITICAL + 1 if nome == "OFF" else logging.getLevelName(nome)
+        if not isinstance(nivel, int):
+            raise ValueError(f"Nível de log desconhecido: {nome}")
+    logging.getLogger(LOGGER_NAME).setLevel(nivel)
+    return nivel
+
+
+def log_sampled(logger, level, chave, intervalo, msg, *args):
+    """
+    Emite no máximo um registro por intervalo para o mesmo ponto de chamada; os registros
+    suprimidos são contados e informados na próxima emissão.
+    :param logger: Logger de destino.
+    :param level: Nível do registro.
+    :param chave: Identificador do ponto de chamada.
+    :param intervalo: Intervalo mínimo entre emissões, em segundos.
+    :param msg: Mensagem no estilo %, formatada só se for emitida.
+    :param args: Argumentos da mensagem.
+    :return: True se o registro foi emitido.
+    """
+    if not logger.isEnabledFor(level):
+        return False
+    agora = time.monotonic()
+    estado = _amostragem.get(chave)
+    if estado is not None and agora - estado[0] < intervalo:
+        estado[1] += 1
+        return False
+    suprimidas = estado[1] if estado is not None else 0
+    _amostragem[chave] = [agora, 0]
+    if suprimidas:
+        msg += " (+%d suprimidas)"
+        args += (suprimidas,)
+    logger.log(level, msg, *args)
+    return True
+
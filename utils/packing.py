@@ -0,0 +1,328 @@
+import math
+from functools import lru_cache
+import numpy as np
+
+# Tolerância para erros de arredondamento em medidas em ponto flutuante (mm)
+EPS = 1e-9
+
+
+def _cabem(comprimento, passo, kerf):
+    """
+    Calcula quantos itens de tamanho `passo` cabem em `comprimento`, com um kerf entre itens vizinhos.
+    :return: Número inteiro de itens.
+    """
+    if passo <= 0 or comprimento + EPS < passo:
+        return 0
+    return int(math.floor((comprimento + kerf + EPS) / (passo + kerf)))
+
+
+def _melhor_faixa(comprimento, altura_faixa, orientacoes, kerf, memo):
+    """
+    Resolve o preenchimento de uma faixa com colunas de peças, misturando as duas orientações.
+    Cada coluna tem a largura da peça e empilha quantas peças couberem na altura da faixa.
+    :param comprimento: Comprimento da faixa.
+    :param altura_faixa: Altura da faixa.
+    :param orientacoes: Lista de tuplas (largura, altura) das orientações permitidas da peça.
+    :param kerf: Largura do corte entre peças.
+    :param memo: Dicionário de memoização por (comprimento, altura_faixa).
+    :return: Tupla (total de peças, [(largura, altura, peças por coluna, número de colunas), ...]).
+    """
+    chave = (comprimento, altura_faixa)
+    if chave in memo:
+        return memo[chave]
+    colunas = []
+    for largura, altura in orientacoes:
+        por_coluna = _cabem(altura_faixa, altura, kerf)
+        if por_coluna:
+            colunas.append((largura, altura, por_coluna))
+    melhor = (0, [])
+    if len(colunas) == 1:
+        largura, altura, por_coluna = colunas[0]
+        n = _cabem(comprimento, largura, kerf)
+        melhor = (n * por_coluna, [(largura, altura, por_coluna, n)])
+    elif len(colunas) == 2:
+        (l1, a1, k1), (l2, a2, k2) = colunas
+        # Mochila 1-D com dois tipos de coluna: enumera o primeiro, completa com o segundo
+        for n1 in range(_cabem(comprimento, l1, kerf) + 1):
+            usado = n1 * (l1 + kerf)
+            n2 = _cabem(comprimento - usado, l2, kerf)
+            total = n1 * k1 + n2 * k2
+            if total > melhor[0]:
+                melhor = (total, [(l1, a1, k1, n1), (l2, a2, k2, n2)])
+    memo[chave] = melhor
+    return melhor
+
+
+def _melhor_empilhamento(comprimento, altura, orientacoes, kerf, memo):
+    """
+    Primeiro estágio: divide a chapa em faixas horizontais com a altura de uma das orientações.
+    :return: Tupla (total de peças, [(altura da faixa, número de faixas, solução da faixa), ...]).
+    """
+    alturas = sorted({a for _, a in orientacoes})
+    melhor = (0, [])
+    if len(alturas) == 1:
+        h = alturas[0]
+        faixa = _melhor_faixa(comprimento, h, orientacoes, kerf, memo)
+        n = _cabem(altura, h, kerf)
+        return (n * faixa[0], [(h, n, faixa)])
+    h1, h2 = alturas
+    faixa1 = _melhor_faixa(comprimento, h1, orientacoes, kerf, memo)
+    faixa2 = _melhor_faixa(comprimento, h2, orientacoes, kerf, memo)
+    for n1 in range(_cabem(altura, h1, kerf) + 1):
+        usado = n1 * (h1 + kerf)
+        n2 = _cabem(altura - usado, h2, kerf)
+        total = n1 * faixa1[0] + n2 * faixa2[0]
+        if total > melhor[0]:
+            melhor = (total, [(h1, n1, faixa1), (h2, n2, faixa2)])
+    return melhor
+
+
+def _posicoes(plano, kerf, transpor):
+    """
+    Converte o plano de faixas e colunas em um array de posicionamentos.
+    :return: Array (N, 4) com (x, y, largura, altura) de cada peça.
+    """
+    blocos = []
+    y = 0.0
+    for altura_faixa, n_faixas, (_, colunas) in plano:
+        for _ in range(n_faixas):
+            x = 0.0
+            for largura, altura, por_coluna, n_colunas in colunas:
+                if not n_colunas:
+                    continue
+                xs = x + np.arange(n_colunas) * (largura + kerf)
+                ys = y + np.arange(por_coluna) * (altura + kerf)
+                grade_x, grade_y = np.meshgrid(xs, ys, indexing="ij")
+                bloco = np.empty((grade_x.size, 4))
+                bloco[:, 0] = grade_x.ravel()
+                bloco[:, 1] = grade_y.ravel()
+                bloco[:, 2] = largura
+                bloco[:, 3] = altura
+                blocos.append(bloco)
+                x += n_colunas * (largura + kerf)
+            y += altura_faixa + kerf
+    if not blocos:
+        return np.empty((0, 4))
+    posicoes = np.concatenate(blocos)
+    if transpor:
+        posicoes = posicoes[:, [1, 0, 3, 2]]
+    return posicoes
+
+
+@lru_cache(maxsize=256)
+def resolver_guilhotina(largura_chapa, altura_chapa, largura_peca, altura_peca, kerf=0.0, rotacao=True):
+    """
+    Calcula o máximo de peças retangulares iguais em uma chapa com cortes guilhotinados em dois estágios.
+    O primeiro estágio corta a chapa em faixas (horizontais ou verticais) com a altura de uma das
+    orientações da peça; o segundo preenche cada faixa com colunas, misturando peças giradas 90° e não giradas.
+    O resultado é ótimo dentro dessa família de cortes e nunca é pior que a grade de orientação fixa.
+    Os resultados ficam em cache LRU por (chapa, peça, kerf, rotação).
+    :param largura_chapa: Largura da chapa em milímetros.
+    :param altura_chapa: Altura da chapa em milímetros.
+    :param largura_peca: Largura da peça em milímetros.
+    :param altura_peca: Altura da peça em milímetros.
+    :param kerf: Largura do corte entre peças em milímetros.
+    :param rotacao: Se True, permite girar a peça em 90°.
+    :return: Tupla (número de peças, array somente leitura (N, 4) com (x, y, largura, altura) de cada peça).
+    """
+    if min(largura_chapa, altura_chapa, largura_peca, altura_peca) <= 0 or kerf < 0:
+        raise ValueError("Dimensões devem ser positivas e o kerf não pode ser negativo.")
+    orientacoes = [(largura_peca, altura_peca)]
+    if rotacao and largura_peca != altura_peca:
+        orientacoes.append((altura_peca, largura_peca))
+    # Faixas horizontais na chapa original e faixas verticais (chapa transposta)
+    horizontal = _melhor_empilhamento(largura_chapa, altura_chapa, orientacoes, kerf, {})
+    orientacoes_transpostas = [(a, l) for l, a in orientacoes]
+    vertical = _melhor_empilhamento(altura_chapa, largura_chapa, orientacoes_transpostas, kerf, {})
+    if vertical[0] > horizontal[0]:
+        total, plano, transpor = vertical[0], vertical[1], True
+    else:
+        total, plano, transpor = horizontal[0], horizontal[1], False
+    posicoes = _posicoes(plano, kerf, transpor)
+    posicoes.setflags(write=False)
+    return total, posicoes
+
+
+@lru_cache(maxsize=256)
+def empacotar_circulos(largura_chapa, altura_chapa, raio, kerf=0.0, margem=0.0):
+    """
+    Calcula o melhor arranjo de círculos iguais em uma chapa, com kerf entre peças e margem nas bordas.
+    Avalia em um único lote vetorizado as famílias de arranjo (linhas hexagonais, colunas hexagonais
+    e grade quadrada) e as duas paridades das linhas deslocadas; vence a configuração com mais peças.
+    As linhas e colunas começam encostadas na margem: em um retângulo, deslocar a origem só reduz
+    o espaço livre e nunca aumenta a contagem, por isso não há varredura de origens.
+    :param largura_chapa: Largura da chapa em milímetros.
+    :param altura_chapa: Altura da chapa em milímetros.
+    :param raio: Raio das peças em milímetros.
+    :param kerf: Distância mínima entre peças vizinhas (largura do corte) em milímetros.
+    :param margem: Distância mínima entre as peças e as bordas da chapa em milímetros.
+    :return: Tupla (número de peças, array somente leitura (N, 2) com os centros, relativos ao canto da chapa).
+    """
+    if min(largura_chapa, altura_chapa, raio) <= 0 or kerf < 0 or margem < 0:
+        raise ValueError("Dimensões devem ser positivas e kerf e margem não podem ser negativos.")
+    passo = 2 * raio + kerf  # Distância entre centros vizinhos
+    # Faixa disponível para os centros
+    vao_x = largura_chapa - 2 * (margem + raio)
+    vao_y = altura_chapa - 2 * (margem + raio)
+    vazio = np.empty((0, 2))
+    vazio.setflags(write=False)
+    if vao_x < -EPS or vao_y < -EPS:
+        return 0, vazio
+
+    # Configurações: (transposta, passo entre linhas, deslocamento das linhas alternadas, paridade)
+    passo_hex = passo * math.sqrt(3) / 2
+    familias = [(False, passo_hex, passo / 2), (True, passo_hex, passo / 2), (False, passo, 0.0)]
+    configuracoes = []
+    for transposta, passo_linhas, deslocamento in familias:
+        for paridade in ((0, 1) if deslocamento else (0,)):
+            configuracoes.append((transposta, passo_linhas, deslocamento, paridade))
+    config = np.array(configuracoes, dtype=np.float64)
+    transposta, passo_linhas, deslocamento, paridade = config.T
+    # Eixo das linhas e eixo ao longo da linha (trocados nas configurações transpostas)
+    vao_linha = np.where(transposta == 1, vao_y, vao_x)
+    vao_coluna = np.where(transposta == 1, vao_x, vao_y)
+
+    n_linhas = np.floor((vao_coluna + EPS) / passo_linhas).astype(int) + 1
+    n_linhas[vao_coluna < -EPS] = 0
+    max_linhas = max(int(n_linhas.max()), 1)
+    linhas = np.arange(max_linhas)
+    # Deslocamento de cada linha: as linhas de paridade oposta à da configuração são deslocadas
+    desloc_linha = np.where((linhas[None, :] + paridade[:, None]) % 2 == 1, deslocamento[:, None], 0.0)
+    livre = vao_linha[:, None] - desloc_linha
+    por_linha = np.where(livre >= -EPS, np.floor((livre + EPS) / passo).astype(int) + 1, 0)
+    por_linha[linhas[None, :] >= n_linhas[:, None]] = 0
+    totais = por_linha.sum(axis=1)
+    melhor = int(np.argmax(totais))
+    total = int(totais[melhor])
+    if total == 0:
+        return 0, vazio
+
+    # Materializa os centros da melhor configuração
+    blocos = []
+    for i in range(n_linhas[melhor]):
+        n = por_linha[melhor, i]
+        if not n:
+            continue
+        ao_longo = margem + raio + desloc_linha[melhor, i] + np.arange(n) * passo
+        atraves = np.full(n, margem + raio + i * passo_linhas[melhor])
+        blocos.append(np.column_stack((atraves, ao_longo) if transposta[melhor] else (ao_longo, atraves)))
+    centros = np.concatenate(blocos)
+    centros.setflags(write=False)
+    return total, centros
+
+
+class Skyline:
+    def __init__(self, largura, altura):
+        """
+        Contorno superior (skyline) das peças já posicionadas em uma chapa, para o encaixe bottom-left.
+        O contorno é uma lista de segmentos horizontais [x, y, largura] ordenados por x; cada
+        posicionamento só altera os segmentos sob a nova peça, e segmentos vizinhos de mesma
+        altura são fundidos, de modo que o número de segmentos acompanha a largura da chapa e
+        não o número de peças.
+        :param largura: Largura da chapa.
+        :param altura: Altura da chapa.
+        """
+        self.largura = largura
+        self.altura = altura
+        self.segmentos = [[0.0, 0.0, float(largura)]]
+
+    def _altura_em(self, i, largura, altura):
+        """
+        Calcula a altura em que uma peça assentaria a partir do segmento i.
+        :return: Coordenada y da base da peça, ou None se ela não couber.
+        """
+        x = self.segmentos[i][0]
+        if x + largura > self.largura + EPS:
+            return None
+        y = 0.0
+        restante = largura
+        j = i
+        while restante > EPS:
+            if j >= len(self.segmentos):
+                return None
+            y = max(y, self.segmentos[j][1])
+            if y + altura > self.altura + EPS:
+                return None
+            restante -= self.segmentos[j][2]
+            j += 1
+        return y
+
+    def encontrar(self, largura, altura):
+        """
+        Procura a posição mais baixa (e, no empate, mais à esquerda) para uma peça.
+        :return: Tupla (x, y), ou None se a peça não couber.
+        """
+        melhor = None
+        for i, (x, _, _) in enumerate(self.segmentos):
+            y = self._altura_em(i, largura, altura)
+            if y is not None and (melhor is None or (y, x) < (melhor[1], melhor[0])):
+                melhor = (x, y)
+        return melhor
+
+    def inserir(self, x, y, largura, altura):
+        """
+        Registra uma peça na posição (x, y), elevando o contorno sob ela.
+        """
+        fim = x + largura
+        novos = []
+        for sx, sy, sl in self.segmentos:
+            sfim = sx + sl
+            if sfim <= x + EPS or sx >= fim - EPS:
+                novos.append([sx, sy, sl])
+                continue
+            if sx < x - EPS:
+                novos.append([sx, sy, x - sx])
+            if sfim > fim + EPS:
+                novos.append([fim, sy, sfim - fim])
+        novos.append([x, y + altura, largura])
+        novos.sort(key=lambda segmento: segmento[0])
+        # Funde segmentos vizinhos de mesma altura
+        self.segmentos = [novos[0]]
+        for segmento in novos[1:]:
+            ultimo = self.segmentos[-1]
+            if abs(ultimo[1] - segmento[1]) <= EPS:
+                ultimo[2] += segmento[2]
+            else:
+                self.segmentos.append(segmento)
+
+
+def empacotar_misto(largura_chapa, altura_chapa, pecas, kerf=0.0, rotacao=True):
+    """
+    Encaixa peças retangulares de vários códigos em uma mesma chapa, com a heurística bottom-left
+    sobre um contorno skyline. As peças são posicionadas da maior para a menor dimensão; cada uma
+    vai para o ponto mais baixo e mais à esquerda do contorno em que couber, na melhor orientação.
+    Quando uma peça de um código não cabe, as demais unidades iguais são descartadas sem nova busca.
+    :param largura_chapa: Largura da chapa em milímetros.
+    :param altura_chapa: Altura da chapa em milímetros.
+    :param pecas: Lista de tuplas (código, largura, altura, quantidade), medidas em milímetros.
+    :param kerf: Largura do corte entre peças em milímetros.
+    :param rotacao: Se True, permite girar as peças em 90°.
+    :return: Tupla (posicionamentos [(código, x, y, largura, altura), ...], {código: quantidade não posicionada}).
+    """
+    if min(largura_chapa, altura_chapa) <= 0 or kerf < 0:
+        raise ValueError("Dimensões da chapa devem ser positivas e o kerf não pode ser negativo.")
+    for codigo, largura, altura, quantidade in pecas:
+        if min(largura, altura) <= 0 or quantidade < 0:
+            raise ValueError(f"Medidas ou quantidade inválidas para a peça {codigo}.")
+    # O kerf é somado à direita e acima de cada peça; a chapa ganha o mesmo acréscimo
+    skyline = Skyline(largura_chapa + kerf, altura_chapa + kerf)
+    ordem = sorted(pecas, key=lambda peca: (max(peca[1], peca[2]), peca[1] * peca[2]), reverse=True)
+    posicionamentos = []
+    nao_posicionadas = {}
+    for codigo, largura, altura, quantidade in ordem:
+        orientacoes = [(largura, altura)]
+        if rotacao and largura != altura:
+            orientacoes.append((altura, largura))
+        for colocadas in range(quantidade):
+            melhor = None
+            for w, h in orientacoes:
+                posicao = skyline.encontrar(w + kerf, h + kerf)
+                if posicao is not None and (melhor is None or (posicao[1] + h, posicao[0]) < (melhor[1] + melhor[3], melhor[0])):
+                    melhor = (posicao[0], posicao[1], w, h)
+            if melhor is None:
+                nao_posicionadas[codigo] = nao_posicionadas.get(codigo, 0) + quantidade - colocadas
+                break
+            x, y, w, h = melhor
+            skyline.inserir(x, y, w + kerf, h + kerf)
+            posicionamentos.append((codigo, x, y, w, h))
+    return posicionamentos, nao_posicionadas
@@ -0,0 +1,86 @@
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from utils.instrumentation import recorder
+
+
+class _LoaderCronometrado:
+    def __init__(self, loader, nome, span_recorder):
+        """Envolve o loader de um módulo, medindo a execução do módulo como um span "import"."""
+        self.loader = loader
+        self.nome = nome
+        self.recorder = span_recorder
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        inicio = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.recorder.record(f"import {self.nome}", "import", inicio, time.perf_counter() - inicio)
+
+    def __getattr__(self, nome):
+        return getattr(self.loader, nome)
+
+
+class ImportTimer(MetaPathFinder):
+    def __init__(self, span_recorder=None):
+        """
+        Mede o tempo de importação de cada módulo, como o "python -X importtime": cada módulo
+        importado depois de install() vira um span "import <módulo>", com o tempo dos submódulos incluído.
+        :param span_recorder: Registro de spans (padrão: o registro compartilhado).
+        """
+        self.recorder = span_recorder or recorder
+        self._buscando = set()
+
+    def install(self):
+        """Passa a medir as importações seguintes."""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """Para de medir as importações."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname in self._buscando:
+            return None
+        self._buscando.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _LoaderCronometrado(spec.loader, fullname, self.recorder)
+                    return spec
+            return None
+        finally:
+            self._buscando.discard(fullname)
+
+
+def startup_report(span_recorder=None, limite=20):
+    """
+    Monta o relatório de inicialização: as importações mais demoradas (tempo acumulado, com submódulos)
+    e as etapas de inicialização registradas na categoria "startup".
+    :param span_recorder: Registro de spans (padrão: o registro compartilhado).
+    :param limite: Quantidade máxima de importações listadas.
+    :return: Texto do relatório.
+    """
+    stats = (span_recorder or recorder).stats()
+    importacoes = sorted(
+        ((nome, s) for nome, s in stats.items() if s["categoria"] == "import"),
+        key=lambda item: item[1]["total_ms"], reverse=True,
+    )
+    etapas = [(nome, s) for nome, s in stats.items() if s["categoria"] == "startup"]
+    linhas = [f"Importações mais demoradas ({len(importacoes)} módulos medidos):"]
+    for nome, s in importacoes[:limite]:
+        linhas.append(f"  {s['total_ms']:9.1f} ms  {nome[len('import '):]}")
+    linhas.append("Etapas de inicialização:")
+    for nome, s in etapas:
+        linhas.append(f"  {s['total_ms']:9.1f} ms  {nome}")
+    return "\n".join(linhas)